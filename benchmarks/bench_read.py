@@ -0,0 +1,76 @@
+"""Benchmark ranged reads on large files — indexed read_tool vs. full split.
+
+Usage:
+    python -m benchmarks.bench_read --size-mb 1024
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from pathlib import Path
+
+LINE = b"2026-01-01T00:00:00Z INFO request served path=/api/v1/items status=200\n"
+
+
+def _make_file(path: Path, size_mb: int) -> None:
+    chunk = LINE * ((1 << 20) // len(LINE))
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(chunk)
+
+
+def _naive(path: Path, offset: int, limit: int) -> int:
+    """The previous implementation: decode and split the whole file."""
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    return len(lines[offset - 1 : offset - 1 + limit])
+
+
+async def _bench(path: Path, naive: bool) -> dict[str, float]:
+    from src.tools.read import read_tool
+
+    offsets = [1, 1_000_000, 5_000_000, 10_000_000]
+    results: dict[str, float] = {}
+
+    t0 = time.perf_counter()
+    await read_tool.on_invoke_tool(
+        None, json.dumps({"file_path": str(path), "offset": 1, "limit": 50})
+    )
+    results["first_read_with_index_build_s"] = time.perf_counter() - t0
+
+    for off in offsets:
+        t0 = time.perf_counter()
+        await read_tool.on_invoke_tool(
+            None, json.dumps({"file_path": str(path), "offset": off, "limit": 50})
+        )
+        results[f"indexed_read@{off}_ms"] = (time.perf_counter() - t0) * 1000
+
+    if naive:
+        t0 = time.perf_counter()
+        _naive(path, offsets[-1], 50)
+        results[f"naive_read@{offsets[-1]}_s"] = time.perf_counter() - t0
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument(
+        "--naive", action="store_true", help="also time the whole-file split"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.log"
+        _make_file(path, args.size_mb)
+        results = asyncio.run(_bench(path, args.naive))
+
+    print(f"file size: {args.size_mb} MB")
+    for name, value in results.items():
+        print(f"  {name:<40} {value:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
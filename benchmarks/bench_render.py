@@ -0,0 +1,54 @@
+"""Benchmark streamed text rendering — deltas/sec the console can absorb.
+
+Usage:
+    python -m benchmarks.bench_render --deltas 200000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from rich.console import Console
+
+from src.tui import console as console_module
+
+# A typical model delta: a few characters, occasional newline
+DELTAS = ["The ", "quick", " brown", " fox", " jumps", " over", "\n", "`code`", " ok"]
+
+
+def _per_delta_print(n: int) -> float:
+    """The previous implementation: one Rich print per delta."""
+    console = console_module.console
+    started = time.perf_counter()
+    for i in range(n):
+        console.print(DELTAS[i % len(DELTAS)], end="", highlight=False)
+    return n / (time.perf_counter() - started)
+
+
+async def _coalesced(n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        console_module.print_text_delta(DELTAS[i % len(DELTAS)])
+    console_module.flush_text()
+    return n / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--deltas", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull:
+        console_module.console = Console(file=devnull, force_terminal=True)
+        results = {
+            "rich print per delta": _per_delta_print(args.deltas),
+            "coalesced raw writes": asyncio.run(_coalesced(args.deltas)),
+        }
+
+    for name, rate in results.items():
+        print(f"  {name:<24} {rate:14,.0f} deltas/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Mock model server — a local OpenAI-compatible provider playing a script.
+
+Usage:
+    python -m benchmarks.mock_server --port 8765 [--script script.json]
+
+then point they at it::
+
+    PROVIDER=openai BASE_URL=http://127.0.0.1:8765/v1 API_KEY=x MODEL=mock
+
+The script is a JSON object::
+
+    {
+      "ttft_ms": 300, "tokens_per_sec": 60,
+      "responses": [
+        {"tool_calls": [{"name": "bash_tool", "arguments": {"command": "ls"}}]},
+        {"error": {"status": 429, "message": "rate limited"}},
+        {"text": "Done.", "ttft_ms": 50}
+      ]
+    }
+
+Responses are chosen by conversation step — the number of assistant
+messages already in the request — so concurrent conversations each play
+the script from the start and the server keeps no state.  Steps past the
+end repeat the last response.  ``ttft_ms`` and ``tokens_per_sec`` can be
+set per response; one token is one streamed delta of ``DELTA_CHARS``.
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from .scripted import ANSWER_LINE, DELTA_CHARS
+
+DEFAULT_SCRIPT: dict[str, Any] = {
+    "ttft_ms": 300,
+    "tokens_per_sec": 60,
+    "responses": [
+        {
+            "tool_calls": [
+                {"name": "bash_tool", "arguments": {"command": "echo mock"}},
+                {"name": "bash_tool", "arguments": {"command": "pwd"}},
+            ]
+        },
+        {"text": ANSWER_LINE * 10},
+    ],
+}
+
+
+class MockServer:
+    """Threaded HTTP server serving ``/v1/chat/completions`` from a script."""
+
+    def __init__(
+        self,
+        script: dict[str, Any] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        handler = type("Handler", (_Handler,), {"script": script or DEFAULT_SCRIPT})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.httpd.connections = 0  # type: ignore[attr-defined]
+        self.httpd.aborted = 0  # type: ignore[attr-defined]
+        self._thread: threading.Thread | None = None
+
+    @property
+    def connections(self) -> int:
+        """TCP connections accepted so far."""
+        return self.httpd.connections  # type: ignore[attr-defined]
+
+    @property
+    def aborted(self) -> int:
+        """Streams the client hung up on before they ended."""
+        return self.httpd.aborted  # type: ignore[attr-defined]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    script: dict[str, Any]
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.connections += 1  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/models"):
+            self._json(200, {"object": "list", "data": [{"id": "mock"}]})
+        else:
+            self._json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": "not found"}})
+            return
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        messages = body.get("messages", [])
+        step = sum(m.get("role") == "assistant" for m in messages)
+        responses = self.script["responses"]
+        response = responses[min(step, len(responses) - 1)]
+        timing = {**self.script, **response}
+
+        time.sleep(timing.get("ttft_ms", 0) / 1000)
+        if error := response.get("error"):
+            self._json(
+                error.get("status", 500),
+                {"error": {"message": error.get("message", ""), "type": "mock"}},
+            )
+            return
+
+        usage = {
+            "prompt_tokens": len(json.dumps(messages)) // DELTA_CHARS,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+        }
+        deltas = _deltas(response, step)
+        usage["completion_tokens"] = len(deltas)
+        usage["total_tokens"] = usage["prompt_tokens"] + len(deltas)
+        finish = "tool_calls" if response.get("tool_calls") else "stop"
+        model = body.get("model", "mock")
+
+        if not body.get("stream"):
+            self._json(200, _completion(model, deltas, finish, usage))
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        interval = 1 / rate if (rate := timing.get("tokens_per_sec")) else 0
+        try:
+            for n, delta in enumerate(deltas):
+                if n and interval:
+                    time.sleep(interval)
+                self._event(_chunk(model, delta))
+            self._event(_chunk(model, {}, finish))
+            self._event({**_chunk(model, {}), "choices": [], "usage": usage})
+            self._send_chunk(b"data: [DONE]\n\n")
+            self._send_chunk(b"")
+        except BrokenPipeError, ConnectionResetError:
+            # The client hung up mid-stream, as on an interrupted turn
+            self.server.aborted += 1  # type: ignore[attr-defined]
+            self.close_connection = True
+
+    def _json(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _event(self, payload: dict) -> None:
+        self._send_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+def _deltas(response: dict, step: int) -> list[dict]:
+    """Split a scripted response into streamed ``delta`` objects."""
+    if calls := response.get("tool_calls"):
+        return [
+            {
+                "role": "assistant",
+                "tool_calls": [
+                    {
+                        "index": i,
+                        "id": f"call_{step}_{i}",
+                        "type": "function",
+                        "function": {
+                            "name": call["name"],
+                            "arguments": json.dumps(call.get("arguments", {})),
+                        },
+                    }
+                ],
+            }
+            for i, call in enumerate(calls)
+        ]
+    text = response.get("text", "")
+    return [
+        {"role": "assistant", "content": text[i : i + DELTA_CHARS]}
+        for i in range(0, len(text), DELTA_CHARS)
+    ]
+
+
+def _chunk(model: str, delta: dict, finish: str | None = None) -> dict:
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+
+
+def _completion(model: str, deltas: list[dict], finish: str, usage: dict) -> dict:
+    message: dict[str, Any] = {"role": "assistant", "content": None}
+    if finish == "tool_calls":
+        message["tool_calls"] = [
+            {k: v for k, v in d["tool_calls"][0].items() if k != "index"}
+            for d in deltas
+        ]
+    else:
+        message["content"] = "".join(d["content"] for d in deltas)
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish}],
+        "usage": usage,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON script (default: built-in)")
+    args = parser.parse_args()
+
+    script = json.loads(Path(args.script).read_text()) if args.script else None
+    server = MockServer(script, args.host, args.port)
+    print(f"Mock model server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Scripted model — a deterministic, offline stand-in for the LLM.
+
+Chat-completion chunks are generated locally and fed through the Agents
+SDK's own stream handler, so the runner, tools and TUI see exactly the
+event sequence a real LiteLLM-backed model would produce.
+"""
+
+import json
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from agents import Model, ModelResponse, ModelSettings, ModelTracing, Usage
+from agents.models.chatcmpl_stream_handler import ChatCmplStreamHandler
+from agents.models.fake_id import FAKE_RESPONSES_ID
+from openai.types.chat import ChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import (
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+from openai.types.completion_usage import CompletionUsage
+from openai.types.responses import Response, ResponseCompletedEvent
+
+# Characters per streamed text delta, roughly one token
+DELTA_CHARS = 4
+
+ANSWER_LINE = "Here is a line of the scripted answer with `code` and *emphasis*.\n"
+
+
+class ScriptedModel(Model):
+    """Answers every request the same way, optionally after tool calls.
+
+    If the input does not end with tool output, the model calls each of
+    ``tool_calls`` (``(name, arguments)`` pairs) at once; otherwise it
+    streams an ``answer_chars`` long text answer in small deltas.
+    """
+
+    def __init__(
+        self,
+        answer_chars: int = 2000,
+        tool_calls: list[tuple[str, dict]] | None = None,
+    ):
+        self.answer_chars = answer_chars
+        self.tool_calls = tool_calls or []
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        async for event in self.stream_response(*args, **kwargs):
+            if isinstance(event, ResponseCompletedEvent):
+                usage = event.response.usage
+                return ModelResponse(
+                    output=event.response.output,
+                    usage=Usage(
+                        requests=1,
+                        input_tokens=usage.input_tokens if usage else 0,
+                        output_tokens=usage.output_tokens if usage else 0,
+                        total_tokens=usage.total_tokens if usage else 0,
+                    ),
+                    response_id=None,
+                )
+        msg = "scripted stream ended without a completed event"
+        raise RuntimeError(msg)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list,
+        model_settings: ModelSettings,
+        tools: list,
+        output_schema: Any,
+        handoffs: list,
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator:
+        response = Response(
+            id=FAKE_RESPONSES_ID,
+            created_at=time.time(),
+            model="scripted",
+            object="response",
+            output=[],
+            tool_choice="auto",
+            tools=[],
+            parallel_tool_calls=True,
+        )
+        chunks = self._chunks(_after_tool_output(input))
+        async for event in ChatCmplStreamHandler.handle_stream(response, chunks):
+            yield event
+
+    async def _chunks(self, answer: bool) -> AsyncIterator[ChatCompletionChunk]:
+        if answer or not self.tool_calls:
+            text = (ANSWER_LINE * (self.answer_chars // len(ANSWER_LINE) + 1))[
+                : self.answer_chars
+            ]
+            for start in range(0, len(text), DELTA_CHARS):
+                yield _chunk(ChoiceDelta(content=text[start : start + DELTA_CHARS]))
+        else:
+            for index, (name, arguments) in enumerate(self.tool_calls):
+                call = ChoiceDeltaToolCall(
+                    index=index,
+                    id=f"call_{index}",
+                    type="function",
+                    function=ChoiceDeltaToolCallFunction(
+                        name=name, arguments=json.dumps(arguments)
+                    ),
+                )
+                yield _chunk(ChoiceDelta(tool_calls=[call]))
+        yield _chunk(
+            ChoiceDelta(),
+            usage=CompletionUsage(
+                prompt_tokens=100, completion_tokens=100, total_tokens=200
+            ),
+        )
+
+
+def _chunk(delta: ChoiceDelta, usage: CompletionUsage | None = None):
+    return ChatCompletionChunk(
+        id="scripted",
+        created=0,
+        model="scripted",
+        object="chat.completion.chunk",
+        choices=[Choice(index=0, delta=delta)],
+        usage=usage,
+    )
+
+
+def _after_tool_output(input: str | list) -> bool:
+    if isinstance(input, str) or not input:
+        return False
+    last = input[-1]
+    return isinstance(last, dict) and last.get("type") == "function_call_output"
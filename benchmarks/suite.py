@@ -0,0 +1,437 @@
+"""Benchmark suite — offline timings for tools and the conversation loop.
+
+Usage:
+    python -m benchmarks.suite run [--quick] [--only file,bash] -o results.json
+    python -m benchmarks.suite compare baseline.json [results.json]
+
+``run`` writes every metric to a JSON file that serves as a baseline.
+``compare`` checks a second result file (or a fresh run) against a
+baseline. It exits non-zero if any metric got worse by more than
+``--threshold``. Metric names end in their unit; ``_per_s`` metrics are
+better when higher, all others (``_ms``, ``_mb``) when lower.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+# File sizes for the file tool benchmarks; --quick stops at 1 MB
+FILE_SIZES = {"1KB": 1 << 10, "1MB": 1 << 20, "64MB": 64 << 20, "1GB": 1 << 30}
+QUICK_MAX_SIZE = 1 << 20
+
+# edit/write hold the whole file in memory several times over; larger
+# files are only read
+MUTATE_MAX_SIZE = 64 << 20
+
+# Output of the huge bash commands (full run / --quick)
+BASH_OUTPUT_BYTES = (256 << 20, 16 << 20)
+
+# Source files in the synthetic search tree (full run / --quick), plus as
+# many again under node_modules
+SEARCH_FILES = (4000, 400)
+
+# Concurrent runs against the local mock provider
+PROVIDER_CONCURRENCY = 10
+
+# Relative change beyond which compare reports a regression
+DEFAULT_THRESHOLD = 0.25
+
+# Timing changes smaller than this are noise, whatever their relative size
+NOISE_FLOOR_MS = 1.0
+
+LINE = b"2026-01-01T00:00:00Z INFO request served path=/api/v1/items status=200\n"
+
+Metrics = dict[str, float]
+
+
+async def _timed(fn: Callable[[], Awaitable[object]], repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def _call(tool, **kwargs) -> str:
+    return await tool.on_invoke_tool(None, json.dumps(kwargs))
+
+
+# -- benchmarks -----------------------------------------------------------
+
+
+async def bench_file(tmp: Path, quick: bool) -> Metrics:
+    from src.tools import edit_tool, read_tool, write_tool
+    from src.tools.cache import file_cache
+    from src.tools.lineindex import _load_index
+
+    metrics: Metrics = {}
+    for label, size in FILE_SIZES.items():
+        if quick and size > QUICK_MAX_SIZE:
+            break
+        path = tmp / f"file-{label}.log"
+        body = LINE * max(1, (size - 16) // len(LINE))
+        path.write_bytes(body + b"MARKER-0\n")
+        lines = body.count(b"\n") + 1
+        repeat = 5 if size <= MUTATE_MAX_SIZE else 2
+
+        async def cold_head():
+            file_cache.clear()
+            _load_index.cache_clear()
+            await _call(read_tool, file_path=str(path), offset=1, limit=50)
+
+        metrics[f"file.read_cold_head.{label}_ms"] = await _timed(cold_head, repeat)
+        metrics[f"file.read_warm_tail.{label}_ms"] = await _timed(
+            lambda: _call(read_tool, file_path=str(path), offset=lines - 49, limit=50),
+            repeat,
+        )
+        if size > MUTATE_MAX_SIZE:
+            continue
+
+        marker = iter(range(1_000_000))
+
+        async def edit():
+            n = next(marker)
+            await _call(
+                edit_tool,
+                file_path=str(path),
+                old_text=f"MARKER-{n}\n",
+                new_text=f"MARKER-{n + 1}\n",
+            )
+
+        metrics[f"file.edit.{label}_ms"] = await _timed(edit, repeat)
+        content = body.decode()
+        metrics[f"file.write.{label}_ms"] = await _timed(
+            lambda: _call(write_tool, file_path=str(tmp / "out.log"), content=content),
+            repeat,
+        )
+    return metrics
+
+
+async def bench_bash(tmp: Path, quick: bool) -> Metrics:
+    from src.tools import bash_tool
+
+    size = BASH_OUTPUT_BYTES[quick]
+    commands = {
+        "text": f"yes 'a line of text output' | head -c {size}",
+        "binary": f"head -c {size} /dev/urandom",
+    }
+    metrics: Metrics = {
+        "bash.spawn_ms": await _timed(lambda: _call(bash_tool, command="true"), 10)
+    }
+    for name, command in commands.items():
+        metrics[f"bash.huge_{name}_ms"] = await _timed(
+            lambda: _call(bash_tool, command=command), 3
+        )
+        tracemalloc.start()
+        await _call(bash_tool, command=command)
+        metrics[f"bash.huge_{name}_peak_mb"] = (
+            tracemalloc.get_traced_memory()[1] / 2**20
+        )
+        tracemalloc.stop()
+    return metrics
+
+
+async def bench_guard(tmp: Path, quick: bool) -> Metrics:
+    from src.tools.guard import check_path
+
+    paths = [
+        str(tmp / "src" / "module.py"),
+        str(tmp / ".env"),
+        str(tmp / "config" / ".env.example"),
+        str(tmp / ".ssh" / "id_rsa.pub"),
+        "relative/path/to/file.txt",
+    ]
+    n = 20_000 if quick else 200_000
+    started = time.perf_counter()
+    for i in range(n):
+        check_path(paths[i % len(paths)])
+    return {"guard.check_path_per_s": n / (time.perf_counter() - started)}
+
+
+async def bench_search(tmp: Path, quick: bool) -> Metrics:
+    import asyncio.subprocess as sp
+
+    from src.tools import glob_tool, grep_tool
+
+    root = tmp / "search"
+    count = SEARCH_FILES[quick]
+    body = "".join(f"def handler_{i}(request):\n    return {i}\n" for i in range(40))
+    for i in range(count):
+        for base in (
+            root / "src" / f"pkg{i % 40}",
+            root / "node_modules" / f"m{i % 40}",
+        ):
+            base.mkdir(parents=True, exist_ok=True)
+            (base / f"mod{i}.py").write_text(
+                body + ("NEEDLE = 1\n" if i % 50 == 0 else "")
+            )
+    (root / ".gitignore").write_text("*.log\n")
+
+    async def grep_rn():
+        proc = await asyncio.create_subprocess_exec(
+            "grep", "-rn", "NEEDLE", str(root), stdout=sp.DEVNULL
+        )
+        await proc.wait()
+
+    return {
+        "search.grep_tool_ms": await _timed(
+            lambda: _call(grep_tool, pattern="NEEDLE", path=str(root)), 5
+        ),
+        "search.grep_tool_miss_ms": await _timed(
+            lambda: _call(grep_tool, pattern="NO_SUCH_TEXT", path=str(root)), 5
+        ),
+        "search.grep_rn_ms": await _timed(grep_rn, 5),
+        **await _bench_glob(root, glob_tool),
+    }
+
+
+async def _bench_glob(root: Path, glob_tool) -> Metrics:
+    import asyncio.subprocess as sp
+
+    from src.tools.index import workspace_index
+
+    async def find():
+        proc = await asyncio.create_subprocess_exec(
+            "find", str(root), "-name", "*.py", stdout=sp.DEVNULL
+        )
+        await proc.wait()
+
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        started = time.perf_counter()
+        workspace_index().files()
+        cold = (time.perf_counter() - started) * 1000
+        warm = await _timed(lambda: _call(glob_tool, pattern="src/*/mod1*.py"), 5)
+    finally:
+        os.chdir(cwd)
+    return {
+        "search.index_build_ms": cold,
+        "search.glob_tool_ms": warm,
+        "search.find_ms": await _timed(find, 5),
+    }
+
+
+async def bench_loop(tmp: Path, quick: bool) -> Metrics:
+    from rich.console import Console
+
+    from benchmarks.scripted import ScriptedModel
+    from src.agent import create_agent
+    from src.config import Config
+    from src.stats import session_stats
+    from src.tui import console as console_module
+    from src.tui import turn
+
+    (tmp / "notes.txt").write_text("some notes\n" * 100)
+    cfg = Config(provider="scripted", api_key="-", model="scripted", markdown=False)
+    agent = create_agent(cfg).clone(
+        model=ScriptedModel(
+            answer_chars=4_000 if quick else 40_000,
+            tool_calls=[
+                ("read_tool", {"file_path": str(tmp / "notes.txt"), "limit": 20}),
+                ("bash_tool", {"command": "echo hello"}),
+            ],
+        )
+    )
+
+    metrics: Metrics = {}
+    saved = console_module.console, turn.console, turn._EscMonitor
+    with open(os.devnull, "w") as devnull:
+        # No terminal here: render to /dev/null and skip the Esc watcher
+        console_module.console = turn.console = Console(
+            file=devnull, force_terminal=True, width=100
+        )
+        turn._EscMonitor = _NoEscMonitor
+        try:
+            for markdown in (False, True):
+                console_module.use_markdown(markdown)
+                mode = "markdown" if markdown else "raw"
+                metrics[f"loop.turn_{mode}_ms"] = await _timed(
+                    lambda: turn.run_turn(
+                        agent, [{"role": "user", "content": "go"}], cfg
+                    ),
+                    3,
+                )
+                metrics[f"loop.render_{mode}_ms"] = (
+                    statistics.median(t.render_time for t in session_stats.turns[-3:])
+                    * 1000
+                )
+        finally:
+            console_module.use_markdown(False)
+            console_module.console, turn.console, turn._EscMonitor = saved
+    return metrics
+
+
+async def bench_provider(tmp: Path, quick: bool) -> Metrics:
+    import io
+
+    from benchmarks.mock_server import MockServer
+    from src.agent import create_agent
+    from src.config import Config
+    from src.headless import run_batch
+
+    # No artificial latency: what remains is LiteLLM, the SDK and the tools
+    script = {
+        "responses": [
+            {"tool_calls": [{"name": "bash_tool", "arguments": {"command": "true"}}]},
+            {"text": "x" * 2000},
+        ]
+    }
+    tasks = 20 if quick else 200
+    with MockServer(script) as server:
+        agent = create_agent(
+            Config(
+                provider="openai",
+                api_key="mock",
+                model="mock",
+                base_url=server.base_url,
+            )
+        )
+        out = io.StringIO()
+        started = time.perf_counter()
+        await run_batch(agent, ['"go"'] * tasks, out, concurrency=PROVIDER_CONCURRENCY)
+        elapsed = time.perf_counter() - started
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    if errors := [r["error"] for r in results if r["error"]]:
+        msg = f"mock provider runs failed: {errors[0]}"
+        raise RuntimeError(msg)
+    return {
+        "provider.task_ms": statistics.median(r["duration"] for r in results) * 1000,
+        "provider.tasks_per_s": tasks / elapsed,
+    }
+
+
+class _NoEscMonitor:
+    interrupted = False
+
+    def __init__(self, on_interrupt=None):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+
+BENCHMARKS: dict[str, Callable[[Path, bool], Awaitable[Metrics]]] = {
+    "file": bench_file,
+    "bash": bench_bash,
+    "guard": bench_guard,
+    "search": bench_search,
+    "loop": bench_loop,
+    "provider": bench_provider,
+}
+
+
+# -- run / compare --------------------------------------------------------
+
+
+async def run(names: list[str], quick: bool) -> dict:
+    """Run the named benchmarks and return the result document."""
+    metrics: Metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in names:
+            print(f"running {name}…", file=sys.stderr)
+            metrics.update(await BENCHMARKS[name](Path(tmp), quick))
+    return {
+        "meta": {
+            "time": time.time(),
+            "quick": quick,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(
+    baseline: Metrics, current: Metrics, threshold: float = DEFAULT_THRESHOLD
+) -> list[tuple[str, float, float, float, bool]]:
+    """Return ``(name, baseline, current, change, regressed)`` per metric.
+
+    ``change`` is the relative change in the metric's "worse" direction,
+    so positive means slower (or lower throughput).
+    """
+    rows = []
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        if old <= 0:
+            continue
+        change = (old - new) / old if name.endswith("_per_s") else (new - old) / old
+        noise = name.endswith("_ms") and abs(new - old) < NOISE_FLOOR_MS
+        rows.append((name, old, new, change, change > threshold and not noise))
+    return rows
+
+
+def _print_comparison(rows: list) -> None:
+    print(f"{'metric':<40} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, old, new, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<40} {old:12.3f} {new:12.3f} {change:+8.1%}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = sub.add_parser("run", help="run the suite")
+    run_parser.add_argument("--quick", action="store_true", help="small inputs only")
+    run_parser.add_argument(
+        "--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}"
+    )
+    run_parser.add_argument("-o", "--output", help="write results JSON here")
+
+    cmp_parser = sub.add_parser("compare", help="compare results to a baseline")
+    cmp_parser.add_argument("baseline")
+    cmp_parser.add_argument("current", nargs="?", help="default: run the suite now")
+    cmp_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args()
+
+    import main as entry
+
+    entry._configure()
+
+    if args.command == "run":
+        names = args.only.split(",") if args.only else list(BENCHMARKS)
+        if unknown := set(names) - BENCHMARKS.keys():
+            parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+        results = asyncio.run(run(names, args.quick))
+        text = json.dumps(results, indent=2)
+        if args.output:
+            Path(args.output).write_text(text + "\n")
+        for name, value in results["metrics"].items():
+            print(f"  {name:<40} {value:12.3f}")
+        return
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    if args.current:
+        current = json.loads(Path(args.current).read_text())
+    else:
+        names = [
+            n
+            for n in BENCHMARKS
+            if any(m.startswith(f"{n}.") for m in baseline["metrics"])
+        ]
+        current = asyncio.run(run(names, baseline["meta"]["quick"]))
+    rows = compare(baseline["metrics"], current["metrics"], args.threshold)
+    _print_comparison(rows)
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
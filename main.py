@@ -1,7 +1,16 @@
 """they — AI Native Agent entry point."""
 
+import argparse
 import asyncio
 import os
+import subprocess
+import sys
+
+# Rows shown by --import-profile
+IMPORT_PROFILE_TOP = 25
+
+# Batch tasks run at once unless --concurrency says otherwise
+DEFAULT_BATCH_CONCURRENCY = 4
 
 
 def _configure() -> None:
@@ -18,20 +27,184 @@ def _configure() -> None:
     set_tracing_disabled(True)
 
 
-async def main() -> None:
+def _build_agent(config):
+    """Import the heavy SDK stack and build the agent.
+
+    Runs in a worker thread while the user types the first prompt.
+    """
     _configure()
 
     from src.agent import create_agent
+    from src.tools.index import warm_workspace_index
+    from src.tui import turn  # noqa: F401 — warm the streaming stack
+
+    warm_workspace_index()
+    return create_agent(config)
+
+
+async def main(resume: str | None = None) -> None:
+    """Run the interactive agent; ``resume`` is a session id ("" for latest)."""
+    from src.config import get_config
+    from src.session import SessionLog, open_session, sessions_dir
     from src.tui import run_loop
+    from src.tui.console import print_error
+
+    # Config is cheap and fails fast; everything heavy loads in the background
+    config = get_config()
+    if resume is not None:
+        try:
+            session = open_session(sessions_dir(config), resume or None)
+        except ValueError as e:
+            print_error(e)
+            return
+    elif config.save_sessions:
+        session = SessionLog(sessions_dir(config))
+    else:
+        session = None
+    warm: list[asyncio.Task] = []
+
+    async def start():
+        built = await asyncio.to_thread(_build_agent, config)
+        from src.connections import keep_warm
+
+        # Connect to the provider while the user is still typing
+        warm.append(asyncio.create_task(keep_warm(config)))
+        return built
+
+    try:
+        await run_loop(asyncio.create_task(start()), config, session)
+    finally:
+        if warm:
+            from src.connections import close
+
+            warm[0].cancel()
+            await close()
+
+
+async def headless(args: argparse.Namespace) -> int:
+    """Run ``-p``/``--batch`` without the TUI; returns the exit status."""
+    from dataclasses import replace
+
+    from src.config import get_config
 
-    agent = create_agent()
-    await run_loop(agent)
+    config = get_config()
+    if args.batch is not None:
+        # Concurrent runs must not share one persistent shell
+        config = replace(config, persistent_shell=False)
+    agent = await asyncio.to_thread(_build_agent, config)
+
+    from src.connections import close
+
+    try:
+        return await _run_headless(agent, args)
+    finally:
+        await close()
+
+
+async def _run_headless(agent, args: argparse.Namespace) -> int:
+    from src.headless import run_batch, run_prompt
+
+    if args.batch is None:
+        prompt = sys.stdin.read() if args.prompt == "-" else args.prompt
+        try:
+            print(await run_prompt(agent, prompt))
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.batch == "-":
+        failed = await run_batch(
+            agent, sys.stdin, sys.stdout, concurrency=args.concurrency
+        )
+    else:
+        with open(args.batch, encoding="utf-8") as tasks:
+            failed = await run_batch(
+                agent, tasks, sys.stdout, concurrency=args.concurrency
+            )
+    return 1 if failed else 0
+
+
+def _import_profile() -> None:
+    """Print the slowest imports of the startup path (``python -X importtime``)."""
+    code = (
+        "import time; t = time.perf_counter(); "
+        "import main; main._configure(); import src.agent, src.tui.turn; "
+        "print(time.perf_counter() - t)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr.strip())
+        return
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = fields
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+
+    print(f"Deferred startup imports: {float(proc.stdout):.2f}s")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[:IMPORT_PROFILE_TOP]:
+        print(f"{cumulative / 1e3:10.1f}ms {self_us / 1e3:8.1f}ms  {name}")
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="they", description="They — AI agent.")
+    parser.add_argument(
+        "--import-profile",
+        action="store_true",
+        help="report the slowest imports on the startup path and exit",
+    )
+    parser.add_argument(
+        "-p",
+        "--prompt",
+        metavar="PROMPT",
+        help="run one prompt without the TUI and print the answer ('-' reads stdin)",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="run one task per JSONL line concurrently, printing JSONL results",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        metavar="N",
+        help=f"batch tasks run at once (default {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="",
+        metavar="ID",
+        help="resume a saved session (the most recent if ID is omitted)",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
 
 
 def main_sync() -> None:
     """Synchronous CLI entry point."""
+    args = _parse_args()
+    if args.import_profile:
+        _import_profile()
+        return
+    if args.prompt is not None or args.batch is not None:
+        sys.exit(asyncio.run(headless(args)))
+
     try:
-        asyncio.run(main())
+        asyncio.run(main(args.resume))
     except KeyboardInterrupt, EOFError:
         pass
 
@@ -4,25 +4,63 @@ from agents import Agent, ModelSettings
 from agents.extensions.models.litellm_model import LitellmModel
 
 from .config import Config, get_config
-from .tools import ALL_TOOLS
+from .connections import shared_session, use_shared_pool
+from .llm_cache import cache_model
+from .resilient import resilient_model
+from .tools import ALL_TOOLS, bash_tool
+from .tools.bash import BashLimits, set_bash_limits
+from .tools.concurrency import set_tool_concurrency
+from .tools.shell import persistent_bash_tool
+from .tools.subagents import set_subagent_concurrency
 
 SYSTEM_PROMPT = """\
 You are **they**, a direct and capable AI assistant operating in a terminal.
 
-You have 4 tools:
+You have 9 tools:
 - **read_tool**: Read file contents (supports line ranges)
 - **write_tool**: Write content to files (auto-creates directories)
 - **edit_tool**: Find-and-replace in files (first match only)
+- **multi_edit_tool**: Apply many find-and-replace edits across files in one atomic batch
+- **grep_tool**: Search file contents by regex (skips ignored, binary and dependency files)
+- **glob_tool**: Find files by name pattern, most recently modified first
 - **bash_tool**: Execute shell commands
+- **more_tool**: Fetch the next page of a truncated tool result by its handle
+- **subagents_tool**: Run independent tasks in parallel sub-agents; only their reports come back
 
 Guidelines:
 - Read before editing — always verify current content first.
 - Be precise — use exact strings for edit_tool replacements.
+- Search with grep_tool and list files with glob_tool — not grep, find or ls
+  through bash_tool.
+- Batch related edits — prefer one multi_edit_tool call over many edit_tool calls.
+- Fan out — hand many independent tasks (one per file, service, ...) to a single
+  subagents_tool call instead of working through them one by one.
 - Be concise — give short, direct answers unless asked for detail.
 - Show your work — when modifying files, explain what you changed and why.
 """
 
 
+# Providers that only cache prompts at explicit ``cache_control`` breakpoints.
+# OpenAI, DeepSeek, Gemini etc. cache shared prefixes automatically.
+_CACHE_CONTROL_MARKERS = ("anthropic", "claude")
+
+# Cache the system prompt (which follows the tool schemas, so they are
+# covered too) and the last message, so each turn reuses the whole prior
+# history as a cached prefix.
+_CACHE_CONTROL_INJECTION_POINTS = [
+    {"location": "message", "role": "system"},
+    {"location": "message", "index": -1},
+]
+
+
+def prompt_cache_args(cfg: Config) -> dict | None:
+    """Return LiteLLM kwargs that mark the stable prefix for caching."""
+    model = cfg.litellm_model.lower()
+    if not cfg.prompt_cache or not any(m in model for m in _CACHE_CONTROL_MARKERS):
+        return None
+    return {"cache_control_injection_points": _CACHE_CONTROL_INJECTION_POINTS}
+
+
 def create_agent(config: Config | None = None) -> Agent:
     """Create and return the configured Agent."""
     cfg = config or get_config()
@@ -33,12 +71,31 @@ def create_agent(config: Config | None = None) -> Agent:
     settings = ModelSettings(
         temperature=cfg.temperature,
         max_tokens=cfg.max_tokens,
+        # Every request goes through one pooled, pre-warmed HTTP session
+        extra_args={"shared_session": shared_session, **(prompt_cache_args(cfg) or {})},
+    )
+
+    set_tool_concurrency(cfg.tool_concurrency)
+    use_shared_pool()
+    set_bash_limits(
+        BashLimits(
+            cpu_seconds=cfg.bash_cpu_seconds,
+            memory_mb=cfg.bash_memory_mb,
+            max_processes=cfg.bash_max_processes,
+            max_output_mb=cfg.bash_max_output_mb,
+        )
     )
+    set_subagent_concurrency(cfg.subagent_concurrency)
+
+    tools = list(ALL_TOOLS)
+    if cfg.persistent_shell:
+        # Each agent gets its own long-lived shell
+        tools[tools.index(bash_tool)] = persistent_bash_tool()
 
     return Agent(
         name="they",
         instructions=SYSTEM_PROMPT,
-        model=model,
+        model=cache_model(resilient_model(model, cfg, LitellmModel), cfg),
         model_settings=settings,
-        tools=ALL_TOOLS,
+        tools=tools,
     )
@@ -0,0 +1,182 @@
+"""Conversation compaction — keep the history within a token budget."""
+
+from dataclasses import dataclass
+
+from agents import Agent, Runner
+
+from .tokens import CHARS_PER_TOKEN, estimate_items_tokens, estimate_tokens
+
+# Tool outputs shorter than this are kept even in old turns
+ELIDE_MIN_CHARS = 200
+
+# Cap on the transcript sent to the summarizer, in estimated tokens
+SUMMARY_INPUT_TOKENS = 50_000
+
+# Room left for the summary when the kept recent turns alone overflow the
+# budget (at most a quarter of the budget)
+SUMMARY_RESERVE_TOKENS = 2_000
+
+SUMMARY_PREFIX = "[Summary of the earlier conversation]"
+
+SUMMARY_PROMPT = """\
+You compress the earlier part of a conversation between a user and a coding
+assistant that uses tools in a terminal. Write a concise summary that keeps:
+- the user's goals, requests and stated preferences;
+- files read or changed, and what was changed;
+- commands run and their important results or errors;
+- decisions made and any open questions or unfinished work.
+Omit pleasantries and raw tool output. Use short bullet points.
+"""
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    """History after compaction, with before/after token estimates."""
+
+    items: list
+    before: int
+    after: int
+    summarized: bool = False
+
+    @property
+    def changed(self) -> bool:
+        return self.after < self.before
+
+
+def split_turns(items: list) -> list[list]:
+    """Group items into turns, each starting at a user message."""
+    turns: list[list] = []
+    for item in items:
+        if not turns or _is_user_message(item):
+            turns.append([])
+        turns[-1].append(item)
+    return turns
+
+
+def elide_tool_outputs(turns: list[list]) -> list[list]:
+    """Replace long tool outputs in ``turns`` with short stubs."""
+    compacted = []
+    for turn in turns:
+        new_turn = []
+        for item in turn:
+            output = item.get("output") if isinstance(item, dict) else None
+            if item_type(item) == "function_call_output" and output is not None:
+                text = output if isinstance(output, str) else str(output)
+                if len(text) > ELIDE_MIN_CHARS:
+                    item = {
+                        **item,
+                        "output": f"[elided: {len(text)} chars of tool output]",
+                    }
+            new_turn.append(item)
+        compacted.append(new_turn)
+    return compacted
+
+
+async def compact(
+    agent: Agent,
+    items: list,
+    *,
+    budget: int,
+    keep_turns: int,
+    force: bool = False,
+) -> CompactionResult:
+    """Shrink ``items`` to fit ``budget`` estimated tokens.
+
+    The most recent ``keep_turns`` turns (at least the newest one, which holds
+    the prompt being answered) are kept verbatim.  Older turns
+    first lose their long tool outputs; if that is not enough (or ``force``
+    is set) they are replaced by a model-written summary.  When the recent
+    turns alone leave no room for a summary, they lose their long tool
+    outputs too, all but the newest turn, and then the oldest of them are
+    summarized with the rest; otherwise the history would never fit and
+    every turn would pay for a fresh summary.
+    """
+    before = estimate_items_tokens(items)
+    if before <= budget and not force:
+        return CompactionResult(items, before, before)
+
+    turns = split_turns(items)
+    split = max(0, len(turns) - max(1, keep_turns))
+    old, recent = turns[:split], turns[split:]
+    room = budget - min(SUMMARY_RESERVE_TOKENS, budget // 4)
+    if estimate_items_tokens(_flatten(recent)) > room:
+        recent = elide_tool_outputs(recent[:-1]) + recent[-1:]
+        while len(recent) > 1 and estimate_items_tokens(_flatten(recent)) > room:
+            old.append(recent.pop(0))
+
+    old = elide_tool_outputs(old)
+    compacted = _flatten(old) + _flatten(recent)
+    after = estimate_items_tokens(compacted)
+    # A lone earlier summary is not summarized again
+    if (after <= budget and not force) or all(map(_is_summary, old)):
+        return CompactionResult(compacted, before, after)
+
+    summary = await summarize(agent, _flatten(old))
+    compacted = [
+        {"role": "user", "content": f"{SUMMARY_PREFIX}\n{summary}"},
+        *_flatten(recent),
+    ]
+    return CompactionResult(
+        compacted, before, estimate_items_tokens(compacted), summarized=True
+    )
+
+
+async def summarize(agent: Agent, items: list) -> str:
+    """Ask the agent's model to summarize ``items``."""
+    summarizer = Agent(
+        name="they-compactor",
+        instructions=SUMMARY_PROMPT,
+        model=agent.model,
+        model_settings=agent.model_settings,
+    )
+    result = await Runner.run(summarizer, input=render_transcript(items), max_turns=1)
+    return str(result.final_output).strip()
+
+
+def render_transcript(items: list) -> str:
+    """Render items as plain text for the summarizer, newest parts kept."""
+    lines = []
+    for item in items:
+        kind = item_type(item)
+        if kind == "message":
+            lines.append(f"{item.get('role', '?')}: {_message_text(item)}")
+        elif kind == "function_call":
+            lines.append(f"tool call {item.get('name')}: {item.get('arguments')}")
+        elif kind == "function_call_output":
+            lines.append(f"tool result: {item.get('output')}")
+
+    text = "\n".join(lines)
+    if estimate_tokens(text) > SUMMARY_INPUT_TOKENS:
+        limit = SUMMARY_INPUT_TOKENS * CHARS_PER_TOKEN
+        text = "[...earlier history truncated...]\n" + text[-limit:]
+    return text
+
+
+def item_type(item: object) -> str:
+    """Return the item's type; bare ``{"role": ...}`` dicts are messages."""
+    if not isinstance(item, dict):
+        return ""
+    return item.get("type") or ("message" if "role" in item else "")
+
+
+def _is_user_message(item: object) -> bool:
+    return item_type(item) == "message" and item.get("role") == "user"
+
+
+def _is_summary(turn: list) -> bool:
+    return len(turn) == 1 and _message_text(turn[0]).startswith(SUMMARY_PREFIX)
+
+
+def _message_text(item: dict) -> str:
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part.get("text", "") for part in content if isinstance(part, dict)
+        )
+    return ""
+
+
+def _flatten(turns: list[list]) -> list:
+    return [item for turn in turns for item in turn]
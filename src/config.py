@@ -6,6 +6,35 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+# Tool calls from one model response that may run at once
+DEFAULT_TOOL_CONCURRENCY = 8
+
+# History size (estimated tokens) above which older turns are compacted
+DEFAULT_CONTEXT_BUDGET = 100_000
+
+# Most recent turns that compaction keeps verbatim while they fit the budget
+DEFAULT_KEEP_RECENT_TURNS = 4
+
+# LLM response cache modes: "passthrough" disables the cache, "record"
+# serves hits and stores misses, "replay" serves hits and fails on misses
+LLM_CACHE_MODES = ("passthrough", "record", "replay")
+
+# Size bound of the LLM response cache directory
+DEFAULT_LLM_CACHE_MAX_MB = 512
+
+# Child agents that subagents_tool runs at once
+DEFAULT_SUBAGENT_CONCURRENCY = 4
+
+# Output (stdout plus stderr) after which a bash_tool command is killed
+DEFAULT_BASH_MAX_OUTPUT_MB = 1024
+
+# Retries of a model request after a transient provider error
+DEFAULT_MODEL_RETRIES = 2
+
+# A streamed request with no first token after this long is also sent to
+# the fallback model, if one is configured
+DEFAULT_HEDGE_AFTER_MS = 4000
+
 
 @dataclass(frozen=True)
 class Config:
@@ -17,18 +46,49 @@ class Config:
     base_url: str | None = None
     temperature: float | None = None
     max_tokens: int | None = None
+    persistent_shell: bool = False
+    bash_cpu_seconds: int = 0
+    bash_memory_mb: int = 0
+    bash_max_processes: int = 0
+    bash_max_output_mb: int = DEFAULT_BASH_MAX_OUTPUT_MB
+    tool_concurrency: int = DEFAULT_TOOL_CONCURRENCY
+    subagent_concurrency: int = DEFAULT_SUBAGENT_CONCURRENCY
+    context_budget: int = DEFAULT_CONTEXT_BUDGET
+    keep_recent_turns: int = DEFAULT_KEEP_RECENT_TURNS
+    prompt_cache: bool = True
+    stats_file: str | None = None
+    markdown: bool = True
+    save_sessions: bool = True
+    sessions_dir: str | None = None
+    llm_cache: str = "passthrough"
+    llm_cache_dir: str | None = None
+    llm_cache_max_mb: int = DEFAULT_LLM_CACHE_MAX_MB
+    model_retries: int = DEFAULT_MODEL_RETRIES
+    fallback_provider: str | None = None
+    fallback_model: str | None = None
+    fallback_api_key: str | None = None
+    fallback_base_url: str | None = None
+    hedge_after_ms: int = DEFAULT_HEDGE_AFTER_MS
 
     @property
     def litellm_model(self) -> str:
         """Return the LiteLLM model string: ``{provider}/{model}``."""
         return f"{self.provider}/{self.model}"
 
+    @property
+    def fallback_litellm_model(self) -> str | None:
+        """LiteLLM string of the fallback model; its provider defaults to ours."""
+        if not self.fallback_model:
+            return None
+        return f"{self.fallback_provider or self.provider}/{self.fallback_model}"
+
     @classmethod
     def from_env(cls, env_file: str | Path | None = None) -> "Config":
         """Load configuration from environment / .env file.
 
         Raises:
-            ValueError: If PROVIDER, API_KEY, or MODEL is not set.
+            ValueError: If PROVIDER, API_KEY, or MODEL is not set, or
+                LLM_CACHE is not a known mode.
         """
         if env_file:
             load_dotenv(env_file)
@@ -42,6 +102,11 @@ class Config:
             msg = f"{', '.join(missing)} required. Set in .env or as environment variables."
             raise ValueError(msg)
 
+        llm_cache = os.getenv("LLM_CACHE", "passthrough").strip().lower()
+        if llm_cache not in LLM_CACHE_MODES:
+            msg = f"LLM_CACHE must be one of: {', '.join(LLM_CACHE_MODES)}."
+            raise ValueError(msg)
+
         return cls(
             provider=os.environ["PROVIDER"],
             api_key=os.environ["API_KEY"],
@@ -49,9 +114,49 @@ class Config:
             base_url=os.getenv("BASE_URL"),
             temperature=float(t) if (t := os.getenv("TEMPERATURE")) else None,
             max_tokens=int(m) if (m := os.getenv("MAX_TOKENS")) else None,
+            persistent_shell=_env_flag("PERSISTENT_SHELL"),
+            bash_cpu_seconds=_env_int("BASH_CPU_SECONDS", 0),
+            bash_memory_mb=_env_int("BASH_MEMORY_MB", 0),
+            bash_max_processes=_env_int("BASH_MAX_PROCESSES", 0),
+            bash_max_output_mb=_env_int(
+                "BASH_MAX_OUTPUT_MB", DEFAULT_BASH_MAX_OUTPUT_MB
+            ),
+            tool_concurrency=_env_int("TOOL_CONCURRENCY", DEFAULT_TOOL_CONCURRENCY),
+            subagent_concurrency=_env_int(
+                "SUBAGENT_CONCURRENCY", DEFAULT_SUBAGENT_CONCURRENCY
+            ),
+            context_budget=_env_int("CONTEXT_BUDGET", DEFAULT_CONTEXT_BUDGET),
+            keep_recent_turns=_env_int("KEEP_RECENT_TURNS", DEFAULT_KEEP_RECENT_TURNS),
+            prompt_cache=_env_flag("PROMPT_CACHE", default=True),
+            stats_file=os.getenv("STATS_FILE"),
+            markdown=_env_flag("MARKDOWN", default=True),
+            save_sessions=_env_flag("SAVE_SESSIONS", default=True),
+            sessions_dir=os.getenv("SESSIONS_DIR"),
+            llm_cache=llm_cache,
+            llm_cache_dir=os.getenv("LLM_CACHE_DIR"),
+            llm_cache_max_mb=_env_int("LLM_CACHE_MAX_MB", DEFAULT_LLM_CACHE_MAX_MB),
+            model_retries=_env_int("MODEL_RETRIES", DEFAULT_MODEL_RETRIES),
+            fallback_provider=os.getenv("FALLBACK_PROVIDER"),
+            fallback_model=os.getenv("FALLBACK_MODEL"),
+            fallback_api_key=os.getenv("FALLBACK_API_KEY"),
+            fallback_base_url=os.getenv("FALLBACK_BASE_URL"),
+            hedge_after_ms=_env_int("HEDGE_AFTER_MS", DEFAULT_HEDGE_AFTER_MS),
         )
 
 
+def _env_flag(name: str, default: bool = False) -> bool:
+    """Return True if the environment variable is set to a truthy value."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_int(name: str, default: int) -> int:
+    """Return the environment variable as an int, or ``default`` if unset."""
+    return int(v) if (v := os.getenv(name)) else default
+
+
 # Global singleton
 _config: Config | None = None
 
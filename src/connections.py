@@ -0,0 +1,215 @@
+"""Shared HTTP connections — one warm connection pool for model requests.
+
+Left alone, LiteLLM opens a client per provider handler on first use, so
+the first turn pays DNS, TCP and TLS setup, and connections idle between
+prompts get dropped.  :data:`shared_session` goes into every LiteLLM call
+(its ``shared_session`` argument) and hands LiteLLM one pooled aiohttp
+session per event loop; :func:`use_shared_pool` does the same for the
+OpenAI-compatible providers, whose streaming path ignores that argument.
+:func:`keep_warm` opens connections to the model endpoints in that pool
+before the first request and refreshes them while the user is typing.
+:func:`abort_streams` hangs up on responses still being streamed when the
+user interrupts a turn.
+"""
+
+import asyncio
+import time
+import weakref
+from collections.abc import Mapping
+from contextlib import suppress
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .config import Config
+
+# API origins of providers that need no BASE_URL
+PROVIDER_ORIGINS = {
+    "anthropic": "https://api.anthropic.com",
+    "deepseek": "https://api.deepseek.com",
+    "gemini": "https://generativelanguage.googleapis.com",
+    "groq": "https://api.groq.com",
+    "mistral": "https://api.mistral.ai",
+    "openai": "https://api.openai.com",
+    "openrouter": "https://openrouter.ai",
+    "xai": "https://api.x.ai",
+}
+
+# Pool size, and how long an idle connection is kept on our side
+POOL_CONNECTIONS = 100
+KEEPALIVE_SECONDS = 300
+
+# Warm connections are refreshed this often, inside the idle timeout of
+# common provider front ends
+KEEP_WARM_INTERVAL = 45
+
+# Refreshing stops after this long without a model request
+KEEP_WARM_IDLE_LIMIT = 30 * 60
+
+# A pre-connect gives up after this many seconds
+PREWARM_TIMEOUT = 10
+
+_PING = {"they_ping": True}
+
+# One session per event loop; aiohttp sessions must not cross loops
+_sessions: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, aiohttp.ClientSession
+] = weakref.WeakKeyDictionary()
+
+_last_request = time.monotonic()
+
+# Responses whose headers have arrived; those still holding a connection
+# are being read
+_responses: weakref.WeakSet[aiohttp.ClientResponse] = weakref.WeakSet()
+
+
+class _SharedSession:
+    """What LiteLLM receives as ``shared_session``.
+
+    LiteLLM's aiohttp transport calls a non-session value to get one, so the
+    real session is created lazily inside the running loop.  It copies and
+    prints as itself, so it can travel in ``ModelSettings.extra_args``
+    (which is deep-copied for tracing and hashed for the response cache).
+    """
+
+    closed = False
+
+    def __call__(self) -> aiohttp.ClientSession:
+        return session()
+
+    def __deepcopy__(self, memo: dict) -> "_SharedSession":
+        return self
+
+    def __repr__(self) -> str:
+        return "<shared HTTP session>"
+
+
+shared_session = _SharedSession()
+
+
+def session() -> aiohttp.ClientSession:
+    """The pooled session of the running event loop, created on first use."""
+    loop = asyncio.get_running_loop()
+    current = _sessions.get(loop)
+    if current is None or current.closed:
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(_on_request_start)
+        trace.on_request_end.append(_on_request_end)
+        current = _sessions[loop] = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=POOL_CONNECTIONS,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ttl_dns_cache=KEEPALIVE_SECONDS,
+            ),
+            trace_configs=[trace],
+        )
+    return current
+
+
+def use_shared_pool() -> None:
+    """Send LiteLLM's OpenAI-compatible clients through the shared pool too.
+
+    LiteLLM's OpenAI streaming path drops ``shared_session`` and caches the
+    client it built instead, so those providers get the pool through
+    ``litellm.aclient_session``.  A session set by the user is kept.
+    """
+    import httpx
+    import litellm
+    from litellm.llms.custom_httpx.aiohttp_transport import LiteLLMAiohttpTransport
+
+    if litellm.aclient_session is None:
+        litellm.aclient_session = httpx.AsyncClient(
+            transport=LiteLLMAiohttpTransport(client=shared_session),
+            follow_redirects=True,
+        )
+
+
+def endpoints(cfg: Config) -> list[str]:
+    """Origins (``scheme://host[:port]``) of the primary and fallback models."""
+    models = [(cfg.provider, cfg.base_url)]
+    if cfg.fallback_model:
+        models.append((cfg.fallback_provider or cfg.provider, cfg.fallback_base_url))
+    origins = []
+    for provider, base_url in models:
+        if base_url:
+            parts = urlsplit(base_url)
+            origin = f"{parts.scheme}://{parts.netloc}" if parts.netloc else None
+        else:
+            origin = PROVIDER_ORIGINS.get(provider)
+        if origin and origin not in origins:
+            origins.append(origin)
+    return origins
+
+
+async def prewarm(origins: list[str]) -> None:
+    """Open (or refresh) a pooled connection to each origin.
+
+    A ``HEAD /`` is enough to resolve the host and finish the TCP and TLS
+    handshakes; its status does not matter.
+    """
+    timeout = aiohttp.ClientTimeout(total=PREWARM_TIMEOUT)
+
+    async def ping(origin: str) -> None:
+        with suppress(aiohttp.ClientError, TimeoutError, ValueError):
+            async with session().head(
+                origin, allow_redirects=False, timeout=timeout, trace_request_ctx=_PING
+            ) as response:
+                await response.read()
+
+    await asyncio.gather(*(ping(origin) for origin in origins))
+
+
+async def keep_warm(cfg: Config) -> None:
+    """Pre-connect to the model endpoints, then keep them warm until cancelled."""
+    global _last_request
+    origins = endpoints(cfg)
+    if not origins:
+        return
+    _last_request = time.monotonic()
+    while True:
+        if time.monotonic() - _last_request < KEEP_WARM_IDLE_LIMIT:
+            await prewarm(origins)
+        await asyncio.sleep(KEEP_WARM_INTERVAL)
+
+
+def abort_streams() -> int:
+    """Close every response still being read and return how many there were.
+
+    A cancelled request leaves its response open, with the provider still
+    generating and billing, until the response is garbage collected.
+    Closing it drops the connection, so the server stops at once.
+    """
+    aborted = 0
+    for response in list(_responses):
+        if response.connection is not None:
+            response.close()
+            aborted += 1
+    _responses.clear()
+    return aborted
+
+
+async def close() -> None:
+    """Close the running loop's session, if it has one."""
+    current = _sessions.pop(asyncio.get_running_loop(), None)
+    if current is not None:
+        await current.close()
+
+
+async def _on_request_start(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestStartParams,
+) -> None:
+    global _last_request
+    ctx = context.trace_request_ctx
+    if not (isinstance(ctx, Mapping) and ctx.get("they_ping")):
+        _last_request = time.monotonic()
+
+
+async def _on_request_end(
+    session: aiohttp.ClientSession,
+    context: SimpleNamespace,
+    params: aiohttp.TraceRequestEndParams,
+) -> None:
+    _responses.add(params.response)
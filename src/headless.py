@@ -0,0 +1,125 @@
+"""Headless mode — one-shot prompts and concurrent batch runs without the TUI."""
+
+import asyncio
+import json
+import time
+import warnings
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, TextIO
+
+from agents import Agent, Runner
+
+# Agent loop iterations allowed per run (same as the interactive loop)
+MAX_TURNS = 100
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one batch task, written as one JSON line."""
+
+    id: Any
+    output: str | None = None
+    error: str | None = None
+    queued: float = 0.0
+    duration: float = 0.0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+
+async def run_prompt(agent: Agent, prompt: str) -> str:
+    """Run ``prompt`` to completion and return the final answer."""
+    with _quiet_usage_warning():
+        result = await Runner.run(agent, input=prompt, max_turns=MAX_TURNS)
+    return str(result.final_output)
+
+
+async def run_batch(
+    agent: Agent,
+    lines: Iterable[str],
+    out: TextIO,
+    *,
+    concurrency: int,
+) -> int:
+    """Run one task per JSONL line, at most ``concurrency`` at a time.
+
+    Each line is ``{"prompt": ..., "id": ...}`` (``id`` defaults to the
+    line number) or a bare JSON string.  Results are written to ``out`` as
+    JSON lines in completion order.  All tasks share ``agent`` and hence
+    its model client.  Returns the number of failed tasks.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def run_one(number: int, line: str, read_at: float) -> None:
+        nonlocal failed
+        try:
+            result = await _run_task(agent, number, line, read_at)
+        finally:
+            slots.release()
+        failed += result.error is not None
+        out.write(result.to_json() + "\n")
+        out.flush()
+
+    it = iter(lines)
+    number = 0
+    with _quiet_usage_warning():
+        async with asyncio.TaskGroup() as tg:
+            # Read in a thread: with stdin the next line may be a while
+            # coming, and running tasks must not stall meanwhile
+            while (line := await asyncio.to_thread(next, it, None)) is not None:
+                number += 1
+                if not line.strip():
+                    continue
+                # Acquire before spawning so a huge task file is read lazily
+                read_at = time.perf_counter()
+                await slots.acquire()
+                tg.create_task(run_one(number, line, read_at))
+    return failed
+
+
+async def _run_task(agent: Agent, number: int, line: str, read_at: float) -> TaskResult:
+    started = time.perf_counter()
+    task_id: Any = number
+    try:
+        task = json.loads(line)
+        if isinstance(task, dict):
+            task_id = task.get("id", number)
+            prompt = task["prompt"]
+        else:
+            prompt = task
+        if not isinstance(prompt, str):
+            msg = "prompt must be a string"
+            raise TypeError(msg)
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        return TaskResult(id=task_id, error=f"invalid task: {e}")
+
+    result = TaskResult(id=task_id, queued=started - read_at)
+    try:
+        run = await Runner.run(agent, input=prompt, max_turns=MAX_TURNS)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    else:
+        usage = run.context_wrapper.usage
+        result.output = str(run.final_output)
+        result.requests = usage.requests
+        result.input_tokens = usage.input_tokens
+        result.output_tokens = usage.output_tokens
+    result.duration = time.perf_counter() - started
+    return result
+
+
+@contextmanager
+def _quiet_usage_warning() -> Iterator[None]:
+    # Same harmless litellm usage-serialisation warning as the interactive
+    # loop; entered once around all runs since the filter state is global
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore", category=UserWarning, module=r"pydantic\.main"
+        )
+        yield
@@ -0,0 +1,271 @@
+"""LLM response cache — record model responses to disk and replay them.
+
+:class:`CachingModel` wraps the agent's model.  Each request is keyed by a
+hash of everything that determines the answer (model, settings, system
+prompt, input items, tool schemas); the complete response — every stream
+event for streamed calls — is stored as one JSON file.  Replays re-emit the
+same events, so the TUI renders a cached turn exactly as it did live.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from agents import FunctionTool, Model, ModelResponse, ModelSettings, ModelTracing
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import TResponseInputItem, TResponseOutputItem, TResponseStreamEvent
+from agents.tool import Tool
+from agents.usage import deserialize_usage, serialize_usage
+from pydantic import TypeAdapter
+
+from .config import LLM_CACHE_MODES, Config
+
+_EVENT = TypeAdapter(TResponseStreamEvent)
+_OUTPUT_ITEM = TypeAdapter(TResponseOutputItem)
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+class ResponseCache:
+    """Directory of JSON responses with size-bounded LRU eviction.
+
+    Recency is the file's mtime, refreshed on every hit, so the LRU order
+    survives restarts and is shared by processes using the same directory.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Any | None:
+        path = self.directory / f"{key}.json"
+        try:
+            data = json.loads(path.read_bytes())
+            os.utime(path)
+        except FileNotFoundError, json.JSONDecodeError:
+            return None
+        return data
+
+    def put(self, key: str, value: Any) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(value).encode())
+            os.replace(tmp, self.directory / f"{key}.json")
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class CachingModel(Model):
+    """Model wrapper that records and replays responses via a ResponseCache."""
+
+    def __init__(self, model: Model, cache: ResponseCache, *, mode: str, name: str):
+        if mode not in LLM_CACHE_MODES:
+            msg = f"LLM cache mode must be one of {', '.join(LLM_CACHE_MODES)}"
+            raise ValueError(msg)
+        self.model = model
+        self.cache = cache
+        self.mode = mode
+        self.name = name
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        conversation_id: str | None,
+        prompt: Any | None,
+    ) -> ModelResponse:
+        key = self._key(
+            "response",
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            (previous_response_id, conversation_id, prompt),
+        )
+        if (cached := self._lookup(key)) is not None:
+            return ModelResponse(
+                output=[_OUTPUT_ITEM.validate_python(o) for o in cached["output"]],
+                usage=deserialize_usage(cached["usage"]),
+                response_id=cached["response_id"],
+            )
+
+        response = await self.model.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        )
+        if self.mode == "record":
+            self.cache.put(
+                key,
+                {
+                    "output": [
+                        o.model_dump(mode="json", warnings=False)
+                        for o in response.output
+                    ],
+                    "usage": serialize_usage(response.usage),
+                    "response_id": response.response_id,
+                },
+            )
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        conversation_id: str | None,
+        prompt: Any | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = self._key(
+            "stream",
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            (previous_response_id, conversation_id, prompt),
+        )
+        if (cached := self._lookup(key)) is not None:
+            for event in cached["events"]:
+                yield _EVENT.validate_python(event)
+            return
+
+        events = []
+        async for event in self.model.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            conversation_id=conversation_id,
+            prompt=prompt,
+        ):
+            events.append(event.model_dump(mode="json", warnings=False))
+            yield event
+        # Only complete streams are stored; an interrupted one never gets here
+        if self.mode == "record":
+            self.cache.put(key, {"events": events})
+
+    def _lookup(self, key: str) -> Any | None:
+        if self.mode == "passthrough":
+            return None
+        cached = self.cache.get(key)
+        if cached is None and self.mode == "replay":
+            msg = f"No recorded response for this request (key {key[:12]})"
+            raise CacheMissError(msg)
+        return cached
+
+    def _key(
+        self,
+        kind: str,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        conversation: tuple,
+    ) -> str:
+        request = {
+            "kind": kind,
+            "model": self.name,
+            "system": system_instructions,
+            "input": input,
+            "settings": model_settings.to_json_dict(),
+            "tools": [_tool_schema(tool) for tool in tools],
+            "output_schema": (
+                output_schema.json_schema()
+                if output_schema and not output_schema.is_plain_text()
+                else None
+            ),
+            "handoffs": [handoff.tool_name for handoff in handoffs],
+            "conversation": conversation,
+        }
+        data = json.dumps(request, sort_keys=True, default=_jsonable)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+
+def cache_model(model: Model, cfg: Config) -> Model:
+    """Wrap ``model`` in a CachingModel unless the cache is off."""
+    if cfg.llm_cache == "passthrough":
+        return model
+    directory = (
+        Path(cfg.llm_cache_dir).expanduser()
+        if cfg.llm_cache_dir
+        else Path.home() / ".they" / "llm-cache"
+    )
+    return CachingModel(
+        model,
+        ResponseCache(directory, cfg.llm_cache_max_mb * 1024 * 1024),
+        mode=cfg.llm_cache,
+        name=cfg.litellm_model,
+    )
+
+
+def _tool_schema(tool: Tool) -> dict:
+    if isinstance(tool, FunctionTool):
+        return {
+            "name": tool.name,
+            "description": tool.description,
+            "parameters": tool.params_json_schema,
+            "strict": tool.strict_json_schema,
+        }
+    return {"name": getattr(tool, "name", type(tool).__name__)}
+
+
+def _jsonable(value: object) -> object:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", warnings=False)
+    return str(value)
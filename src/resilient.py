@@ -0,0 +1,243 @@
+"""Resilient model — retries with jittered backoff and a hedged fallback.
+
+:class:`ResilientModel` wraps the agent's model.  A request that fails
+with a retryable error (rate limit, timeout, 5xx, dropped connection)
+before producing any output is retried after a randomized, exponentially
+growing delay.  With a fallback model configured, a streamed request that
+has not produced its first event within the hedge deadline — or whose
+primary fails first — is also sent to the fallback; whichever streams
+first is used and the other is cancelled.
+"""
+
+import asyncio
+import random
+from collections.abc import AsyncIterator, Callable
+from contextlib import aclosing
+from typing import Any
+
+import openai
+from agents import Model, ModelResponse, ModelSettings, ModelTracing
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.tool import Tool
+
+from .config import Config
+from .stats import session_stats
+
+# HTTP statuses worth another attempt: timeout, conflict, rate limit, 5xx
+RETRYABLE_STATUS = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+# Backoff before retry n is uniform in [0, min(MAX, BASE * 2**n)] seconds
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 8.0
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for transient provider errors."""
+    if isinstance(error, openai.APIConnectionError | ConnectionError | TimeoutError):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS
+
+
+class ResilientModel(Model):
+    """Model wrapper adding retries and, optionally, a hedged fallback."""
+
+    def __init__(
+        self,
+        model: Model,
+        fallback: Model | None = None,
+        *,
+        retries: int = 2,
+        hedge_after: float | None = None,
+    ):
+        self.model = model
+        self.fallback = fallback
+        self.retries = max(0, retries)
+        self.hedge_after = hedge_after if fallback is not None else None
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        conversation_id: str | None,
+        prompt: Any | None,
+    ) -> ModelResponse:
+        async def once(model: Model) -> AsyncIterator[ModelResponse]:
+            yield await model.get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+                conversation_id=conversation_id,
+                prompt=prompt,
+            )
+
+        # A whole response takes far longer than a first token: no latency
+        # hedge here, only failover when the primary errors
+        async with aclosing(self._with_retries(once, hedge_after=None)) as responses:
+            async for response in responses:
+                return response
+        msg = "model returned no response"
+        raise RuntimeError(msg)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        conversation_id: str | None,
+        prompt: Any | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        def stream(model: Model) -> AsyncIterator[TResponseStreamEvent]:
+            return model.stream_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                previous_response_id=previous_response_id,
+                conversation_id=conversation_id,
+                prompt=prompt,
+            )
+
+        async for event in self._with_retries(stream, hedge_after=self.hedge_after):
+            yield event
+
+    async def _with_retries(
+        self, start: Callable[[Model], AsyncIterator], hedge_after: float | None
+    ) -> AsyncIterator:
+        for attempt in range(self.retries + 1):
+            started = False
+            try:
+                async for item in self._race(start, hedge_after):
+                    started = True
+                    yield item
+                return
+            except Exception as e:
+                # Output already shown cannot be taken back
+                if started or attempt == self.retries or not is_retryable(e):
+                    raise
+            session_stats.model_retried()
+            await asyncio.sleep(
+                random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+            )
+
+    async def _race(
+        self, start: Callable[[Model], AsyncIterator], hedge_after: float | None
+    ) -> AsyncIterator:
+        """Stream from the primary, hedging to the fallback if it is late.
+
+        Both streams feed one queue tagged by source; the first source to
+        deliver an event wins and the other is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[tuple[str, str, Any]] = asyncio.Queue()
+        tasks: dict[str, asyncio.Task] = {}
+        failed: set[str] = set()
+
+        def launch(source: str, model: Model) -> None:
+            tasks[source] = asyncio.create_task(_pump(source, start(model), queue))
+
+        launch("primary", self.model)
+        deadline = None if hedge_after is None else loop.time() + hedge_after
+        winner = None
+        try:
+            while True:
+                if winner is None and deadline is not None and "fallback" not in tasks:
+                    try:
+                        source, kind, value = await asyncio.wait_for(
+                            queue.get(), max(0.0, deadline - loop.time())
+                        )
+                    except TimeoutError:
+                        launch("fallback", self.fallback)
+                        continue
+                else:
+                    source, kind, value = await queue.get()
+
+                if winner is None:
+                    if kind == "error":
+                        failed.add(source)
+                        if (
+                            source == "primary"
+                            and self.fallback is not None
+                            and "fallback" not in tasks
+                            and is_retryable(value)
+                        ):
+                            launch("fallback", self.fallback)
+                        if set(tasks) - failed:
+                            continue
+                        raise value
+                    winner = source
+                    for other, task in tasks.items():
+                        if other != winner:
+                            task.cancel()
+                    if "fallback" in tasks:
+                        session_stats.model_hedged(won=winner == "fallback")
+
+                if source != winner:
+                    continue
+                if kind == "event":
+                    yield value
+                elif kind == "done":
+                    return
+                else:
+                    raise value
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+
+async def _pump(source: str, stream: AsyncIterator, queue: asyncio.Queue) -> None:
+    """Copy ``stream`` into ``queue`` as ``(source, kind, value)`` tuples."""
+    try:
+        async with aclosing(stream):
+            async for event in stream:
+                queue.put_nowait((source, "event", event))
+    except Exception as e:
+        queue.put_nowait((source, "error", e))
+    else:
+        queue.put_nowait((source, "done", None))
+
+
+def resilient_model(
+    model: Model, cfg: Config, make_model: Callable[..., Model]
+) -> Model:
+    """Wrap ``model`` with retries and the configured fallback, if any.
+
+    ``make_model(model=..., api_key=..., base_url=...)`` builds the fallback.
+    """
+    fallback = None
+    if cfg.fallback_model:
+        fallback = make_model(
+            model=cfg.fallback_litellm_model,
+            api_key=cfg.fallback_api_key or cfg.api_key,
+            base_url=cfg.fallback_base_url,
+        )
+    if fallback is None and not cfg.model_retries:
+        return model
+    return ResilientModel(
+        model,
+        fallback,
+        retries=cfg.model_retries,
+        hedge_after=cfg.hedge_after_ms / 1000 if cfg.hedge_after_ms else None,
+    )
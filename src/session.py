@@ -0,0 +1,229 @@
+"""Session persistence — append-only conversation logs that can be resumed.
+
+Each session lives in its own directory::
+
+    <sessions dir>/<id>/meta.json   small index: title, counts, resume offset
+    <sessions dir>/<id>/log.jsonl   one history item per line, append-only
+    <sessions dir>/<id>/blobs/      large tool outputs, one file per payload
+
+When the history is rewritten rather than extended (compaction), a reset
+marker is appended and ``meta.json`` records its byte offset, so resuming
+reads only the index and the log tail after the latest reset.  Large tool
+outputs are kept out of the log and read only for the items being resumed.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import Config
+
+# Tool outputs longer than this are stored as separate blob files
+BLOB_MIN_CHARS = 4096
+
+# Characters of the first user message kept as the session title
+TITLE_CHARS = 60
+
+_RESET = {"$reset": True}
+
+
+@dataclass(frozen=True)
+class SessionInfo:
+    """Index entry of a saved session, read from its ``meta.json``."""
+
+    id: str
+    created: float
+    updated: float
+    items: int
+    title: str
+    cwd: str
+
+
+def sessions_dir(cfg: Config) -> Path:
+    """Return the directory sessions are saved in (``~/.they/sessions``)."""
+    if cfg.sessions_dir:
+        return Path(cfg.sessions_dir).expanduser()
+    return Path.home() / ".they" / "sessions"
+
+
+class SessionLog:
+    """Append-only log of one conversation's history items."""
+
+    def __init__(self, root: str | Path, session_id: str | None = None):
+        self.id = session_id or _new_id()
+        self.path = Path(root) / self.id
+        self._log = self.path / "log.jsonl"
+        self._blobs = self.path / "blobs"
+        self._meta = self._read_meta()
+        # Number of items persisted since the last reset, and the last one
+        # as written, to tell an extended history from a rewritten one
+        self._count = 0
+        self._last: str | None = None
+
+    # -- writing ----------------------------------------------------------
+
+    def sync(self, items: list) -> None:
+        """Persist ``items``, appending only what was added since last call."""
+        reset = not self._is_extension(items)
+        new = items if reset else items[self._count :]
+        if not new and not reset:
+            return
+
+        lines = [json.dumps(_RESET)] if reset else []
+        lines += [json.dumps(self._store_blobs(item)) for item in new]
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self._log.open("ab") as f:
+            offset = f.tell()
+            f.write(("\n".join(lines) + "\n").encode())
+
+        if reset:
+            self._meta["offset"] = offset
+        self._count = len(items)
+        self._last = json.dumps(items[-1]) if items else None
+        self._write_meta(items)
+
+    def _is_extension(self, items: list) -> bool:
+        if not self._count:
+            return not self._meta.get("items")
+        return (
+            len(items) >= self._count
+            and json.dumps(items[self._count - 1]) == self._last
+        )
+
+    def _store_blobs(self, item: object) -> object:
+        output = item.get("output") if isinstance(item, dict) else None
+        if not isinstance(output, str) or len(output) < BLOB_MIN_CHARS:
+            return item
+        data = output.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._blobs / digest
+        if not blob.exists():
+            self._blobs.mkdir(parents=True, exist_ok=True)
+            _atomic_write(blob, data)
+        return {**item, "output": {"$blob": digest, "chars": len(output)}}
+
+    def _write_meta(self, items: list) -> None:
+        now = time.time()
+        self._meta.setdefault("id", self.id)
+        self._meta.setdefault("created", now)
+        self._meta.setdefault("cwd", os.getcwd())
+        self._meta.setdefault("offset", 0)
+        if not self._meta.get("title"):
+            self._meta["title"] = _title(items)
+        self._meta["updated"] = now
+        self._meta["items"] = len(items)
+        _atomic_write(self.path / "meta.json", json.dumps(self._meta).encode())
+
+    # -- reading ----------------------------------------------------------
+
+    def load(self) -> list:
+        """Return the history as last saved, resolving blobs on the way."""
+        items = []
+        try:
+            with self._log.open("rb") as f:
+                f.seek(self._meta.get("offset", 0))
+                for line in f:
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        break  # torn final write
+                    if item == _RESET:
+                        items = []
+                    else:
+                        items.append(item)
+        except FileNotFoundError:
+            return []
+
+        items = [self._load_blobs(item) for item in items]
+        self._count = len(items)
+        self._last = json.dumps(items[-1]) if items else None
+        return items
+
+    def _load_blobs(self, item: object) -> object:
+        output = item.get("output") if isinstance(item, dict) else None
+        if not isinstance(output, dict) or "$blob" not in output:
+            return item
+        try:
+            text = (self._blobs / output["$blob"]).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            text = f"[missing: {output.get('chars', 0)} chars of tool output]"
+        return {**item, "output": text}
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads((self.path / "meta.json").read_text(encoding="utf-8"))
+        except FileNotFoundError, json.JSONDecodeError:
+            return {}
+
+
+def list_sessions(root: str | Path) -> list[SessionInfo]:
+    """Return saved sessions, most recently updated first."""
+    sessions = []
+    for meta_path in Path(root).glob("*/meta.json"):
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except OSError, json.JSONDecodeError:
+            continue
+        sessions.append(
+            SessionInfo(
+                id=meta_path.parent.name,
+                created=meta.get("created", 0.0),
+                updated=meta.get("updated", 0.0),
+                items=meta.get("items", 0),
+                title=meta.get("title", ""),
+                cwd=meta.get("cwd", ""),
+            )
+        )
+    return sorted(sessions, key=lambda s: s.updated, reverse=True)
+
+
+def open_session(root: str | Path, session_id: str | None = None) -> SessionLog:
+    """Open a saved session by id or unique id prefix; the latest if omitted.
+
+    Raises:
+        ValueError: If no session (or more than one) matches.
+    """
+    sessions = list_sessions(root)
+    if session_id:
+        exact = [s for s in sessions if s.id == session_id]
+        sessions = exact or [s for s in sessions if s.id.startswith(session_id)]
+        if not sessions:
+            msg = f"No saved session matching {session_id!r}"
+            raise ValueError(msg)
+        if len(sessions) > 1:
+            msg = f"Session id {session_id!r} is ambiguous"
+            raise ValueError(msg)
+    elif not sessions:
+        msg = "No saved sessions to resume"
+        raise ValueError(msg)
+    return SessionLog(root, sessions[0].id)
+
+
+def _new_id() -> str:
+    # Sortable by creation time, unique across concurrent sessions
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(2)}"
+
+
+def _title(items: list) -> str:
+    for item in items:
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str) and content.strip():
+                return " ".join(content.split())[:TITLE_CHARS]
+    return ""
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,244 @@
+"""Session statistics — per-turn latency and throughput instrumentation."""
+
+import json
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from agents import Agent, ModelResponse, RunContextWrapper, RunHooks, Tool
+from agents.stream_events import RawResponsesStreamEvent
+from openai.types.responses import (
+    ResponseFunctionCallArgumentsDeltaEvent,
+    ResponseTextDeltaEvent,
+)
+
+
+@dataclass
+class ModelCall:
+    """One request to the model within a turn."""
+
+    started: float
+    duration: float = 0.0
+    ttft: float | None = None
+    text_chars: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+    first_token_at: float | None = None
+
+    @property
+    def tokens_per_sec(self) -> float | None:
+        """Output tokens per second after the first token arrived."""
+        if self.first_token_at is None or not self.output_tokens:
+            return None
+        streaming = self.started + self.duration - self.first_token_at
+        return self.output_tokens / streaming if streaming > 0 else None
+
+
+@dataclass
+class ToolCall:
+    """One tool execution within a turn."""
+
+    name: str
+    started: float
+    duration: float = 0.0
+    output_chars: int = 0
+
+
+@dataclass
+class TurnStats:
+    """Timings for one user prompt, from submit to final output."""
+
+    started: float = field(default_factory=time.perf_counter)
+    wall_time: float = field(default_factory=time.time)
+    duration: float = 0.0
+    render_time: float = 0.0
+    interrupted: bool = False
+    model_calls: list[ModelCall] = field(default_factory=list)
+    tool_calls: list[ToolCall] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "time": self.wall_time,
+            "duration": self.duration,
+            "render_time": self.render_time,
+            "interrupted": self.interrupted,
+            "model_calls": [
+                {**asdict(c), "tokens_per_sec": c.tokens_per_sec}
+                for c in self.model_calls
+            ],
+            "tool_calls": [asdict(c) for c in self.tool_calls],
+        }
+
+
+class SessionStats:
+    """Collects turn statistics; optionally appends each turn to a JSONL file."""
+
+    def __init__(self, sink: str | Path | None = None):
+        self.turns: list[TurnStats] = []
+        self.sink = Path(sink) if sink else None
+        self._current: TurnStats | None = None
+        self._open_tools: dict[str, ToolCall] = {}
+        # Sub-agent requests are retried and hedged too but belong to no
+        # turn's model calls, so these count the whole session
+        self.retries = 0
+        self.hedges_won = 0
+        self.hedges_lost = 0
+
+    # -- recording --------------------------------------------------------
+
+    def start_turn(self) -> TurnStats:
+        self._current = TurnStats()
+        self._open_tools.clear()
+        return self._current
+
+    def end_turn(self, interrupted: bool = False) -> None:
+        turn, self._current = self._current, None
+        if turn is None:
+            return
+        turn.duration = time.perf_counter() - turn.started
+        turn.interrupted = interrupted
+        self.turns.append(turn)
+        if self.sink:
+            with self.sink.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(turn.to_dict()) + "\n")
+
+    def on_stream_event(self, event: object) -> None:
+        """Record first-token time and text size from a raw stream event."""
+        call = self._current_model_call()
+        if call is None or not isinstance(event, RawResponsesStreamEvent):
+            return
+        data = event.data
+        if isinstance(data, ResponseTextDeltaEvent):
+            call.text_chars += len(data.delta)
+        elif not isinstance(data, ResponseFunctionCallArgumentsDeltaEvent):
+            return
+        if call.first_token_at is None:
+            call.first_token_at = time.perf_counter()
+            call.ttft = call.first_token_at - call.started
+
+    def model_started(self) -> None:
+        if self._current is not None:
+            self._current.model_calls.append(ModelCall(started=time.perf_counter()))
+
+    def model_ended(self, response: ModelResponse) -> None:
+        call = self._current_model_call()
+        if call is None:
+            return
+        call.duration = time.perf_counter() - call.started
+        usage = response.usage
+        call.input_tokens = usage.input_tokens
+        call.output_tokens = usage.output_tokens
+        call.cached_tokens = usage.input_tokens_details.cached_tokens or 0
+
+    def model_retried(self) -> None:
+        self.retries += 1
+
+    def model_hedged(self, won: bool) -> None:
+        if won:
+            self.hedges_won += 1
+        else:
+            self.hedges_lost += 1
+
+    def tool_started(self, key: str, name: str) -> None:
+        if self._current is None:
+            return
+        call = ToolCall(name=name, started=time.perf_counter())
+        self._open_tools[key] = call
+        self._current.tool_calls.append(call)
+
+    def tool_ended(self, key: str, result: str) -> None:
+        call = self._open_tools.pop(key, None)
+        if call is not None:
+            call.duration = time.perf_counter() - call.started
+            call.output_chars = len(result)
+
+    def _current_model_call(self) -> ModelCall | None:
+        if self._current is None or not self._current.model_calls:
+            return None
+        return self._current.model_calls[-1]
+
+    # -- reporting --------------------------------------------------------
+
+    def resilience(self) -> dict[str, int]:
+        """Model retries and fallback hedges won/lost over the session.
+
+        Unlike the per-turn samples these include sub-agent requests.
+        """
+        return {
+            "retries": self.retries,
+            "hedges won": self.hedges_won,
+            "hedges lost": self.hedges_lost,
+        }
+
+    def summary(self) -> dict[str, list[float]]:
+        """Return the raw samples for every metric, keyed by metric name."""
+        calls = [c for t in self.turns for c in t.model_calls]
+        samples: dict[str, list[float]] = {
+            "turn duration (s)": [t.duration for t in self.turns],
+            "terminal render (s)": [t.render_time for t in self.turns],
+            "time to first token (s)": [c.ttft for c in calls if c.ttft is not None],
+            "model call (s)": [c.duration for c in calls],
+            "output tokens/s": [
+                tps for c in calls if (tps := c.tokens_per_sec) is not None
+            ],
+            "input tokens": [c.input_tokens for c in calls],
+            "cached tokens": [c.cached_tokens for c in calls],
+            "output tokens": [c.output_tokens for c in calls],
+        }
+        for turn in self.turns:
+            for tool in turn.tool_calls:
+                samples.setdefault(f"{tool.name} (s)", []).append(tool.duration)
+                samples.setdefault(f"{tool.name} output chars", []).append(
+                    tool.output_chars
+                )
+        return samples
+
+
+class StatsHooks(RunHooks):
+    """Run hooks that feed model and tool timings into a :class:`SessionStats`."""
+
+    def __init__(self, stats: SessionStats):
+        self.stats = stats
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper,
+        agent: Agent,
+        system_prompt: str | None,
+        input_items: list,
+    ) -> None:
+        self.stats.model_started()
+
+    async def on_llm_end(
+        self, context: RunContextWrapper, agent: Agent, response: ModelResponse
+    ) -> None:
+        self.stats.model_ended(response)
+
+    async def on_tool_start(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool
+    ) -> None:
+        self.stats.tool_started(_tool_key(context, tool), tool.name)
+
+    async def on_tool_end(
+        self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str
+    ) -> None:
+        self.stats.tool_ended(_tool_key(context, tool), str(result))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 < pct <= 100)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _tool_key(context: RunContextWrapper, tool: Tool) -> str:
+    # Parallel calls of the same tool are told apart by their call id
+    return getattr(context, "tool_call_id", None) or tool.name
+
+
+# Global singleton for the interactive session
+session_stats = SessionStats()
@@ -0,0 +1,16 @@
+"""Token estimates — cheap local approximation, no tokenizer download."""
+
+import json
+
+# Average characters per token for English prose and code
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of ``text``."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_items_tokens(items: list) -> int:
+    """Estimate the token count of a list of conversation input items."""
+    return estimate_tokens(json.dumps(items, ensure_ascii=False, default=str))
@@ -1,10 +1,35 @@
-"""Agent tools — the 4 default capabilities."""
+"""Agent tools — the default capabilities."""
 
 from .bash import bash_tool
-from .edit import edit_tool
+from .edit import edit_tool, multi_edit_tool
+from .glob import glob_tool
+from .grep import grep_tool
+from .pages import more_tool
 from .read import read_tool
+from .subagents import subagents_tool
 from .write import write_tool
 
-ALL_TOOLS = [read_tool, write_tool, edit_tool, bash_tool]
+ALL_TOOLS = [
+    read_tool,
+    write_tool,
+    edit_tool,
+    multi_edit_tool,
+    grep_tool,
+    glob_tool,
+    bash_tool,
+    more_tool,
+    subagents_tool,
+]
 
-__all__ = ["ALL_TOOLS", "read_tool", "write_tool", "edit_tool", "bash_tool"]
+__all__ = [
+    "ALL_TOOLS",
+    "read_tool",
+    "write_tool",
+    "edit_tool",
+    "multi_edit_tool",
+    "grep_tool",
+    "glob_tool",
+    "bash_tool",
+    "more_tool",
+    "subagents_tool",
+]
@@ -1,43 +1,353 @@
-"""Bash tool — execute shell commands asynchronously."""
+"""Bash tool — execute shell commands asynchronously, under resource limits.
+
+Each command runs in its own process group, killed as a whole on timeout,
+interruption or runaway output, with the CPU, memory and process rlimits
+set by :func:`set_bash_limits`.  The shell applies them itself with
+``ulimit`` before running the command: no ``preexec_fn``, which is unsafe
+in a process with threads.  The tool reaps the shell with ``wait4`` to
+report the command's wall time and CPU time.  Peak memory is not
+reported: the shell's ``ru_maxrss`` keeps the high-water mark of the
+agent process it was forked from, so it says little about the command.
+"""
 
 import asyncio
+import os
+import resource
+import signal
+import subprocess
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from dataclasses import dataclass
+from functools import cache
+from typing import IO
 
 from agents import function_tool
 
-MAX_OUTPUT = 30000
+from ..config import DEFAULT_BASH_MAX_OUTPUT_MB
+from .concurrency import tool_slot
+from .pages import elide_middle
+
+# Output kept per stream (head and tail); the model sees BASH_TOKEN_BUDGET
+# of it at once and pages through the rest
+CAPTURE_BYTES = 1 << 20
+
+# Tokens of command output returned per call
+BASH_TOKEN_BUDGET = 8000
+
+# Bytes read from a pipe per chunk
+READ_CHUNK = 65536
+
+# Commands running at least this long (wall or CPU seconds) report their
+# resource usage
+USAGE_REPORT_SECONDS = 1.0
+
+# Signals sent by the kernel when a limit is hit, as described in results
+_LIMIT_SIGNALS = {signal.SIGXCPU: "CPU time limit reached"}
+
+# ``ulimit`` flag and unit of each rlimit; the process count's flag depends
+# on the shell
+_ULIMIT_FLAGS = {resource.RLIMIT_CPU: ("-t", 1), resource.RLIMIT_AS: ("-v", 1024)}
+
+# The shell subprocess runs commands with
+_SHELL = "/bin/sh"
+
+Rlimits = list[tuple[int, tuple[int, int]]]
+
+
+@dataclass(frozen=True)
+class BashLimits:
+    """Resource limits of bash_tool commands; 0 means unlimited.
+
+    The rlimits apply to each process of a command separately: CPU seconds
+    and address space per process, and the process count per user.
+    """
+
+    cpu_seconds: int = 0
+    memory_mb: int = 0
+    max_processes: int = 0
+    max_output_mb: int = DEFAULT_BASH_MAX_OUTPUT_MB
+
+    @property
+    def max_output_bytes(self) -> int:
+        return self.max_output_mb << 20
+
+    def rlimits(self) -> Rlimits:
+        """``(resource, (soft, hard))`` pairs, capped at the current hard limits."""
+        wanted = [
+            # SIGXCPU at the soft limit, SIGKILL a second later
+            (resource.RLIMIT_CPU, self.cpu_seconds, self.cpu_seconds + 1),
+            (resource.RLIMIT_AS, self.memory_mb << 20, self.memory_mb << 20),
+            (resource.RLIMIT_NPROC, self.max_processes, self.max_processes),
+        ]
+        rlimits = []
+        for res, soft, hard in wanted:
+            if not soft:
+                continue
+            current = resource.getrlimit(res)[1]
+            if current != resource.RLIM_INFINITY:
+                soft, hard = min(soft, current), min(hard, current)
+            rlimits.append((res, (soft, hard)))
+        return rlimits
+
+
+_limits = BashLimits()
+_rlimits: Rlimits = []
+
+
+def set_bash_limits(limits: BashLimits) -> None:
+    """Set the resource limits of subsequent commands."""
+    global _limits, _rlimits
+    _limits, _rlimits = limits, limits.rlimits()
+
+
+def current_limits() -> BashLimits:
+    """The limits set by :func:`set_bash_limits`."""
+    return _limits
+
+
+def ulimit_commands(shell: str, cpu: bool = True) -> str:
+    """``ulimit`` commands that make ``shell`` apply the current rlimits.
+
+    Empty if there are none; ``cpu=False`` leaves out the CPU time limit.
+    """
+    commands = []
+    for res, (soft, hard) in _rlimits:
+        if res == resource.RLIMIT_CPU and not cpu:
+            continue
+        if res == resource.RLIMIT_NPROC:
+            flag, unit = _nproc_flag(shell), 1
+        else:
+            flag, unit = _ULIMIT_FLAGS[res]
+        # Both limits first, as a hard limit below the soft one is refused
+        commands.append(f"ulimit {flag} {hard // unit}")
+        if soft != hard:
+            commands.append(f"ulimit -S {flag} {soft // unit}")
+    return "; ".join(commands)
+
+
+@cache
+def _nproc_flag(shell: str) -> str:
+    # bash and zsh spell it -u; dash and busybox sh, -p
+    probe = subprocess.run([shell, "-c", "ulimit -u"], capture_output=True)
+    return "-u" if probe.returncode == 0 else "-p"
+
+
+class _BoundedCapture:
+    """Keep the first and last bytes of a stream, counting what is dropped.
+
+    Memory stays O(limit) however much the command prints: the head fills up
+    to ``limit // 2`` bytes, after which only a sliding tail of the same size
+    is retained.
+    """
+
+    def __init__(self, limit: int = CAPTURE_BYTES):
+        self._head_limit = limit // 2
+        self._tail_limit = limit - self._head_limit
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total_bytes = 0
+        self.total_lines = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.total_bytes += len(chunk)
+        self.total_lines += chunk.count(b"\n")
+
+        room = self._head_limit - len(self.head)
+        if room > 0:
+            self.head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self.tail += chunk
+            # bytearray trims from the front without copying the rest
+            if len(self.tail) > self._tail_limit:
+                del self.tail[: len(self.tail) - self._tail_limit]
+
+    @property
+    def elided(self) -> int:
+        return self.total_bytes - len(self.head) - len(self.tail)
+
+    def render(self) -> str:
+        head = self.head.decode(errors="replace")
+        if not self.elided:
+            return head + self.tail.decode(errors="replace")
+        return (
+            f"{head}\n"
+            f"... ({self.elided} bytes elided; "
+            f"{self.total_bytes} bytes, {self.total_lines} lines total) ...\n"
+            f"{self.tail.decode(errors='replace')}"
+        )
+
+
+async def _drain(
+    pipe: IO[bytes], capture: _BoundedCapture, on_data: Callable[[], None]
+) -> None:
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), pipe
+    )
+    try:
+        while chunk := await reader.read(READ_CHUNK):
+            capture.feed(chunk)
+            on_data()
+    finally:
+        transport.close()
 
 
 @function_tool
 async def bash_tool(command: str, timeout: int = 120) -> str:
     """Execute a shell command and return its output.
 
+    Commands that run for a second or more also report their wall time
+    and CPU time.
+
     Args:
         command: The shell command to execute.
         timeout: Maximum execution time in seconds (default 120).
     """
+    async with tool_slot():
+        return await _run(command, timeout)
+
+
+def kill_process_group(pid: int) -> None:
+    """Kill the process group led by ``pid``, i.e. everything a command started."""
+    # Background children may outlive the shell, so signal the group even
+    # if the leader has exited
+    with suppress(ProcessLookupError, PermissionError):
+        os.killpg(pid, signal.SIGKILL)
+
+
+async def _run(command: str, timeout: int) -> str:
+    limits = _limits
+    stdout, stderr = _BoundedCapture(), _BoundedCapture()
+    started = time.perf_counter()
+    if ulimit := ulimit_commands(_SHELL):
+        # On a line of its own, so the command's own lines parse unchanged
+        command = f"{ulimit}\n{command}"
+    proc = subprocess.Popen(
+        [_SHELL, "-c", command],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        # Own process group, killed as a whole on timeout or interruption
+        start_new_session=True,
+    )
+    # Shielded: however the wait below ends, the shell is reaped exactly once
+    reaped = asyncio.ensure_future(_reap(proc))
+    overflowed = False
+
+    def check_output() -> None:
+        nonlocal overflowed
+        if not overflowed and output_exceeded(stdout, stderr, limits):
+            overflowed = True
+            kill_process_group(proc.pid)
+
     try:
-        proc = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await asyncio.wait_for(
+            asyncio.gather(
+                _drain(proc.stdout, stdout, check_output),
+                _drain(proc.stderr, stderr, check_output),
+                asyncio.shield(reaped),
+            ),
+            timeout=timeout,
         )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
     except asyncio.TimeoutError:
-        proc.kill()
+        kill_process_group(proc.pid)
+        await reaped
         return f"Error: command timed out after {timeout}s"
+    except BaseException:
+        kill_process_group(proc.pid)
+        await reaped
+        raise
+
+    usage = reaped.result()
+    out = _format_output(stdout, stderr, proc.returncode)
+    notes = []
+    if overflowed:
+        notes.append(overflow_note(limits))
+    wall = time.perf_counter() - started
+    cpu = usage.ru_utime + usage.ru_stime
+    if overflowed or max(wall, cpu) >= USAGE_REPORT_SECONDS:
+        notes.append(usage_line(wall, cpu))
+    return "\n".join([out, *notes])
+
+
+def output_exceeded(
+    stdout: _BoundedCapture, stderr: _BoundedCapture, limits: BashLimits
+) -> bool:
+    """Whether a command's output has gone over the limit, if there is one."""
+    return 0 < limits.max_output_bytes < stdout.total_bytes + stderr.total_bytes
 
+
+def overflow_note(limits: BashLimits) -> str:
+    return f"[stopped: output exceeded the {limits.max_output_mb} MB limit]"
+
+
+async def _reap(proc: subprocess.Popen) -> resource.struct_rusage:
+    """Wait for ``proc`` to exit and return its resource usage.
+
+    The usage covers the shell and the children it waited for.  Exit is
+    awaited through a pidfd where the platform has one, else in a thread.
+    """
+    try:
+        pidfd = os.pidfd_open(proc.pid)
+    except AttributeError, OSError:
+        _, status, usage = await asyncio.to_thread(os.wait4, proc.pid, 0)
+    else:
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            await exited
+        finally:
+            loop.remove_reader(pidfd)
+            os.close(pidfd)
+        _, status, usage = os.wait4(proc.pid, 0)
+    # Tell Popen the process is gone so it does not try to reap it again
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return usage
+
+
+def usage_line(wall: float, cpu: float) -> str:
+    """The resource usage note appended to slow commands' output."""
+    return f"[{wall:.2f}s wall, {cpu:.2f}s CPU]"
+
+
+def _format_output(
+    stdout: _BoundedCapture, stderr: _BoundedCapture, returncode: int | None
+) -> str:
     parts: list[str] = []
-    if stdout:
-        out = stdout.decode(errors="replace")
-        if len(out) > MAX_OUTPUT:
-            out = out[:MAX_OUTPUT] + "\n... (truncated)"
-        parts.append(out)
-    if stderr:
-        err = stderr.decode(errors="replace")
-        if len(err) > MAX_OUTPUT:
-            err = err[:MAX_OUTPUT] + "\n... (truncated)"
-        parts.append(f"[stderr]\n{err}")
-    if proc.returncode != 0:
-        parts.append(f"[exit code: {proc.returncode}]")
-
-    return "\n".join(parts) if parts else "(no output)"
+    if stdout.total_bytes:
+        parts.append(stdout.render())
+    if stderr.total_bytes:
+        parts.append(f"[stderr]\n{stderr.render()}")
+    if not parts:
+        return "(no output)" if not returncode else _status(returncode)
+
+    out = elide_middle("\n".join(parts), BASH_TOKEN_BUDGET)
+    # Appended after eliding, so neither lands in the paged-out middle
+    notes = [
+        f"[{name}: {c.elided} bytes not kept; "
+        f"{c.total_bytes} bytes, {c.total_lines} lines total]"
+        for name, c in (("stdout", stdout), ("stderr", stderr))
+        if c.elided
+    ]
+    if returncode:
+        notes.append(_status(returncode))
+    return "\n".join([out, *notes])
+
+
+def _status(returncode: int) -> str:
+    if returncode < 0:
+        return f"[killed by {_describe_signal(-returncode)}]"
+    return f"[exit code: {returncode}]"
+
+
+def _describe_signal(signum: int) -> str:
+    try:
+        name = signal.Signals(signum).name
+    except ValueError:
+        return f"signal {signum}"
+    reason = _LIMIT_SIGNALS.get(signum)
+    return f"{name}: {reason}" if reason else name
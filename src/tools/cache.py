@@ -0,0 +1,236 @@
+"""File content cache — process-wide LRU shared by read/edit/write tools."""
+
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+# Total bytes of file content kept in memory
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Files larger than this are never cached (read_tool pages them via the index)
+CACHE_MAX_ENTRY_BYTES = 8 * 1024 * 1024
+
+
+class WriteError(OSError):
+    """A :meth:`FileCache.write_many` batch failed.
+
+    ``committed`` lists the files left with their new content because
+    restoring them failed too; it is empty when the batch was fully undone.
+    """
+
+    def __init__(self, cause: OSError, committed: list[Path]):
+        super().__init__(str(cause))
+        self.committed = committed
+
+
+@dataclass
+class CacheStats:
+    """Counters for tuning the cache budget."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+@dataclass(frozen=True)
+class _Entry:
+    mtime_ns: int
+    size: int
+    ino: int
+    text: str
+    newline: str
+
+
+class FileCache:
+    """LRU of decoded file contents, keyed by resolved path.
+
+    Entries are validated against ``(mtime_ns, size, inode)`` on every lookup,
+    so edits made outside the agent are always picked up.  Writes through
+    :meth:`write_text` refresh the entry in place.
+
+    Text is held with universal newlines, as ``open()`` in text mode reads
+    it: ``\r\n`` and ``\r`` become ``\n``.  The newline a file used is kept
+    alongside so edits can write it back unchanged.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_MAX_BYTES,
+        max_entry_bytes: int = CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def read_text(self, p: Path) -> str:
+        """Return the UTF-8 contents of ``p``, from memory when still valid."""
+        return self.read(p)[0]
+
+    def read(self, p: Path) -> tuple[str, str]:
+        """Return the UTF-8 contents of ``p`` and the newline the file uses."""
+        key = str(p.resolve())
+        st = os.stat(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and _matches(entry, st):
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return entry.text, entry.newline
+            self._stats.misses += 1
+
+        raw = Path(key).read_bytes().decode("utf-8")
+        text, newline = _universal(raw), _newline(raw)
+        self._store(key, st, text, newline)
+        return text, newline
+
+    def write_text(self, p: Path, content: str) -> int:
+        """Write ``content`` to ``p`` and cache it. Returns characters written."""
+        written = p.write_text(content, encoding="utf-8", newline="")
+        key = str(p.resolve())
+        self._store(key, os.stat(key), _universal(content), _newline(content))
+        return written
+
+    def write_many(
+        self, contents: dict[Path, str], newlines: Mapping[Path, str] | None = None
+    ) -> None:
+        """Replace several existing files, all or nothing.
+
+        Every file is first written to a sibling temp file, and its original
+        kept as a hard link (or copy) beside it; only when all of them are on
+        disk are the temp files moved into place with ``os.replace``.  If a
+        step fails, files already replaced are restored from their backups
+        and :class:`WriteError` is raised, its ``committed`` listing any file
+        that could not be restored.  Each ``\n`` in the content is written as
+        the file's entry in ``newlines`` (default ``\n``), as returned by
+        :meth:`read`.
+        """
+        newlines = newlines or {}
+        staged: list[tuple[str, str, Path, str, str]] = []
+        replaced: list[tuple[str, Path]] = []
+        try:
+            for p, content in contents.items():
+                # Resolve so symlinked files are replaced at their target
+                target = p.resolve()
+                fd, tmp = tempfile.mkstemp(
+                    dir=target.parent, prefix=f".{target.name}.", suffix=".tmp"
+                )
+                backup = f"{tmp}.orig"
+                newline = newlines.get(p, "\n")
+                staged.append((tmp, backup, target, content, newline))
+                with os.fdopen(fd, "w", encoding="utf-8", newline=newline) as f:
+                    f.write(content)
+                os.chmod(tmp, target.stat().st_mode & 0o7777)
+                _keep_original(target, backup)
+
+            for tmp, backup, target, _, _ in staged:
+                os.replace(tmp, target)
+                replaced.append((backup, target))
+        except BaseException as e:
+            committed = _restore(replaced)
+            for tmp, backup, *_ in staged:
+                for leftover in (tmp, backup):
+                    with suppress(FileNotFoundError):
+                        os.unlink(leftover)
+            if isinstance(e, OSError):
+                raise WriteError(e, committed) from e
+            raise
+
+        for _, backup, target, content, newline in staged:
+            os.unlink(backup)
+            self._store(str(target), os.stat(target), content, newline)
+
+    def invalidate(self, p: Path) -> None:
+        """Drop any cached entry for ``p``."""
+        with self._lock:
+            entry = self._entries.pop(str(p.resolve()), None)
+            if entry:
+                self._stats.bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = CacheStats()
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._stats.bytes,
+            )
+
+    def _store(self, key: str, st: os.stat_result, text: str, newline: str) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._stats.bytes -= old.size
+            if st.st_size > self.max_entry_bytes:
+                return
+
+            self._entries[key] = _Entry(
+                st.st_mtime_ns, st.st_size, st.st_ino, text, newline
+            )
+            self._stats.bytes += st.st_size
+            while self._stats.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._stats.bytes -= evicted.size
+                self._stats.evictions += 1
+
+
+def _matches(entry: _Entry, st: os.stat_result) -> bool:
+    return (entry.mtime_ns, entry.size, entry.ino) == (
+        st.st_mtime_ns,
+        st.st_size,
+        st.st_ino,
+    )
+
+
+def _keep_original(target: Path, backup: str) -> None:
+    try:
+        os.link(target, backup)
+    except OSError:
+        # Filesystems without hard links
+        shutil.copy2(target, backup)
+
+
+def _restore(replaced: list[tuple[str, Path]]) -> list[Path]:
+    """Move backups back over replaced files; return those that failed."""
+    failed = []
+    for backup, target in reversed(replaced):
+        try:
+            os.replace(backup, target)
+        except OSError:
+            failed.append(target)
+    return failed[::-1]
+
+
+def _universal(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _newline(text: str) -> str:
+    """The newline of ``text``'s first line break, ``\n`` if it has none."""
+    lf = text.find("\n")
+    if lf > 0 and text[lf - 1] == "\r":
+        return "\r\n"
+    cr = text.find("\r")
+    return "\r" if cr != -1 and (lf == -1 or cr < lf) else "\n"
+
+
+# Global singleton shared by all file tools
+file_cache = FileCache()
@@ -0,0 +1,73 @@
+"""Tool concurrency — bounded worker pool, call limit and per-path ordering."""
+
+import asyncio
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
+
+from ..config import DEFAULT_TOOL_CONCURRENCY
+
+_max_concurrency = DEFAULT_TOOL_CONCURRENCY
+_executor = ThreadPoolExecutor(
+    max_workers=_max_concurrency, thread_name_prefix="they-tool"
+)
+
+# One semaphore per event loop; asyncio primitives must not cross loops
+_limits: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+# FIFO lock per resolved path, dropped once no call holds or awaits it
+_path_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def set_tool_concurrency(limit: int) -> None:
+    """Resize the worker pool and the concurrent tool-call limit."""
+    global _executor, _max_concurrency
+    limit = max(1, limit)
+    if limit == _max_concurrency:
+        return
+    old, _executor = (
+        _executor,
+        ThreadPoolExecutor(max_workers=limit, thread_name_prefix="they-tool"),
+    )
+    old.shutdown(wait=False)
+    _max_concurrency = limit
+    _limits.clear()
+
+
+@asynccontextmanager
+async def tool_slot() -> AsyncIterator[None]:
+    """Hold one of the ``limit`` concurrent tool-call slots."""
+    loop = asyncio.get_running_loop()
+    sem = _limits.get(loop)
+    if sem is None:
+        sem = _limits[loop] = asyncio.Semaphore(_max_concurrency)
+    async with sem:
+        yield
+
+
+@asynccontextmanager
+async def path_locks(paths: Iterable[str]) -> AsyncIterator[None]:
+    """Serialize calls touching the same files, in arrival order.
+
+    Locks are taken in sorted order so multi-file calls cannot deadlock.
+    """
+    keys = sorted({str(Path(p).resolve()) for p in paths})
+    async with AsyncExitStack() as stack:
+        for key in keys:
+            lock = _path_locks.get(key)
+            if lock is None:
+                lock = _path_locks[key] = asyncio.Lock()
+            await stack.enter_async_context(lock)
+        yield
+
+
+async def run_file_tool(fn: Callable[..., str], paths: Iterable[str], *args) -> str:
+    """Run blocking ``fn(*args)`` on the worker pool under the path locks."""
+    async with tool_slot(), path_locks(paths):
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
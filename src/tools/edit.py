@@ -1,14 +1,26 @@
-"""Edit file tool — find-and-replace in a file."""
+"""Edit file tool — find-and-replace in a file, singly or in atomic batches."""
 
 from pathlib import Path
 
 from agents import function_tool
+from pydantic import BaseModel
 
+from .cache import WriteError, file_cache
+from .concurrency import run_file_tool
 from .guard import check_path
 
 
+class Edit(BaseModel):
+    """A single replacement within a multi-edit batch."""
+
+    file_path: str
+    old_text: str
+    new_text: str
+    replace_all: bool = False
+
+
 @function_tool
-def edit_tool(file_path: str, old_text: str, new_text: str) -> str:
+async def edit_tool(file_path: str, old_text: str, new_text: str) -> str:
     """Replace the first occurrence of old_text with new_text in a file.
 
     Args:
@@ -16,6 +28,10 @@ def edit_tool(file_path: str, old_text: str, new_text: str) -> str:
         old_text: The exact text to find (first match only).
         new_text: The replacement text.
     """
+    return await run_file_tool(_edit, [file_path], file_path, old_text, new_text)
+
+
+def _edit(file_path: str, old_text: str, new_text: str) -> str:
     if err := check_path(file_path):
         return err
 
@@ -23,7 +39,7 @@ def edit_tool(file_path: str, old_text: str, new_text: str) -> str:
     if not p.exists():
         return f"Error: file not found: {file_path}"
 
-    content = p.read_text(encoding="utf-8")
+    content, newline = file_cache.read(p)
     if old_text not in content:
         return (
             f"Error: old_text not found in {file_path}. "
@@ -31,5 +47,84 @@ def edit_tool(file_path: str, old_text: str, new_text: str) -> str:
         )
 
     new_content = content.replace(old_text, new_text, 1)
-    p.write_text(new_content, encoding="utf-8")
+    try:
+        file_cache.write_many({p: new_content}, {p: newline})
+    except WriteError as e:
+        return _write_failed(e)
     return f"Replaced 1 occurrence in {file_path}"
+
+
+@function_tool
+async def multi_edit_tool(edits: list[Edit]) -> str:
+    """Apply several find-and-replace edits across one or more files atomically.
+
+    Edits to the same file are applied in order, each to the result of the
+    previous one. All edits are validated before anything is written; if any
+    edit fails, no file is changed. If writing fails part way, the files
+    already written are restored, and the result names any that could not be.
+
+    Args:
+        edits: The edits to apply. Each replaces the first occurrence of
+            old_text with new_text in file_path, or every occurrence when
+            replace_all is true.
+    """
+    paths = [edit.file_path for edit in edits]
+    return await run_file_tool(_multi_edit, paths, edits)
+
+
+def _multi_edit(edits: list[Edit]) -> str:
+    if not edits:
+        return "Error: no edits given."
+
+    originals: dict[Path, str] = {}
+    contents: dict[Path, str] = {}
+    newlines: dict[Path, str] = {}
+    replaced = 0
+
+    for n, edit in enumerate(edits, start=1):
+        if err := check_path(edit.file_path):
+            return f"{err} (edit {n}; no files were changed)"
+
+        p = Path(edit.file_path)
+        key = p.resolve()
+        if key not in contents:
+            if not p.is_file():
+                return (
+                    f"Error: edit {n}: file not found: {edit.file_path}. "
+                    "No files were changed."
+                )
+            content, newlines[key] = file_cache.read(p)
+            originals[key] = contents[key] = content
+
+        content = contents[key]
+        count = content.count(edit.old_text) if edit.old_text else 0
+        if count == 0:
+            return (
+                f"Error: edit {n}: old_text not found in {edit.file_path}. "
+                "No files were changed. "
+                "Use read_tool to verify the current file contents."
+            )
+
+        if edit.replace_all:
+            contents[key] = content.replace(edit.old_text, edit.new_text)
+            replaced += count
+        else:
+            contents[key] = content.replace(edit.old_text, edit.new_text, 1)
+            replaced += 1
+
+    changed = {p: c for p, c in contents.items() if c != originals[p]}
+    try:
+        file_cache.write_many(changed, newlines)
+    except WriteError as e:
+        return _write_failed(e)
+    return (
+        f"Applied {len(edits)} edits ({replaced} replacements) "
+        f"across {len(contents)} files"
+    )
+
+
+def _write_failed(e: WriteError) -> str:
+    if not e.committed:
+        return f"Error: writing failed: {e}. No files were changed."
+    changed = ", ".join(str(p) for p in e.committed)
+    return f"Error: writing failed: {e}. Only these files were changed: {changed}"
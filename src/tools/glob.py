@@ -0,0 +1,81 @@
+"""Glob tool — find files by name from the cached workspace index."""
+
+import heapq
+import os
+import re
+
+from agents import function_tool
+
+from .concurrency import run_file_tool
+from .guard import check_path, is_sensitive_name
+from .ignore import glob_regex
+from .index import FileIndex, workspace_index
+
+# Default and hard cap on listed files
+DEFAULT_MAX_RESULTS = 100
+MAX_RESULTS_LIMIT = 1000
+
+
+@function_tool
+async def glob_tool(
+    pattern: str = "**/*", path: str = ".", max_results: int = DEFAULT_MAX_RESULTS
+) -> str:
+    """Find files by name, most recently modified first. Use instead of find/ls.
+
+    Skips files ignored by .gitignore, dependency and cache directories
+    (node_modules, .venv, ...) and sensitive files.
+
+    Args:
+        pattern: Glob matched against paths relative to ``path``: "*" and "?"
+            stay within one directory, "**" spans any number of them
+            (e.g. "**/*.py", "src/*.ts", "*" for the top level).
+        path: Directory to search. Defaults to the current directory.
+        max_results: List at most this many files (at most 1000).
+    """
+    return await run_file_tool(_glob, [], pattern, path, max_results)
+
+
+def _glob(pattern: str, path: str, max_results: int) -> str:
+    if err := check_path(path):
+        return err
+    if not os.path.isdir(path):
+        return f"Error: not a directory: {path}"
+    try:
+        regex = glob_regex(pattern)
+    except re.error as e:
+        return f"Error: invalid pattern: {e}"
+
+    max_results = min(max(1, max_results), MAX_RESULTS_LIMIT)
+    root = os.path.abspath(path)
+    index = workspace_index()
+    listing = index.listing(root)
+    if listing is None:
+        # Outside the workspace (or ignored there): list it afresh
+        index = FileIndex(root)
+        listing = index.listing()
+
+    prefix = len(root.rstrip("/")) + 1
+    matched = [
+        (mtime_ns, f)
+        for f, mtime_ns in listing
+        if regex.match(f, prefix) and not is_sensitive_name(os.path.basename(f))
+    ]
+    if not matched:
+        return "No files found."
+
+    # Sorted on the mtimes recorded by the index: no stat per match
+    newest = heapq.nlargest(max_results, matched)
+    out = [
+        f[prefix:] if path in (".", "./") else os.path.join(path, f[prefix:])
+        for _, f in newest
+    ]
+    if len(matched) > max_results:
+        out.append(
+            f"[showing the {max_results} most recently modified of "
+            f"{len(matched)} files; narrow the pattern or path to see others]"
+        )
+    else:
+        out.append(f"[{len(matched)} files]")
+    if index.truncated:
+        out.append("[the tree is too large to index fully; some files are missing]")
+    return "\n".join(out)
@@ -0,0 +1,224 @@
+"""Grep tool — regex search over a directory tree, honouring .gitignore."""
+
+import fnmatch
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from agents import function_tool
+
+from .concurrency import run_file_tool
+from .guard import SENSITIVE_DIRS, check_path, is_sensitive_name
+from .ignore import ALWAYS_SKIP_DIRS, IgnoreRules, walk_files
+from .pages import page_text
+
+# Default and hard cap on reported matching lines
+DEFAULT_MAX_RESULTS = 100
+MAX_RESULTS_LIMIT = 1000
+
+# Tokens of results returned per call; the rest is paged
+GREP_TOKEN_BUDGET = 6000
+
+# Context lines around a match are capped at this many on each side
+MAX_CONTEXT = 10
+
+# Matched lines longer than this are cut in the output
+MAX_LINE_CHARS = 300
+
+# Files larger than this are assumed to be data, not code, and skipped
+MAX_FILE_BYTES = 16 << 20
+
+# A NUL byte in this many leading bytes marks a file as binary
+BINARY_SNIFF_BYTES = 8192
+
+# Search threads; file reads overlap even where the regex holds the GIL
+GREP_WORKERS = min(8, os.cpu_count() or 1)
+
+# Files searched per worker task, and tasks in flight per worker
+CHUNK_FILES = 64
+PREFETCH_PER_WORKER = 4
+
+_SKIP_DIRS = ALWAYS_SKIP_DIRS | frozenset(SENSITIVE_DIRS)
+
+_pool = ThreadPoolExecutor(max_workers=GREP_WORKERS, thread_name_prefix="they-grep")
+
+
+@function_tool
+async def grep_tool(
+    pattern: str,
+    path: str = ".",
+    glob: str = "",
+    ignore_case: bool = False,
+    context: int = 0,
+    max_results: int = DEFAULT_MAX_RESULTS,
+) -> str:
+    """Search file contents for a regular expression, like ``grep -rn``.
+
+    Skips files ignored by .gitignore, dependency and cache directories
+    (node_modules, .venv, ...), binary files and sensitive files. Prefer
+    this over running grep through bash_tool.
+
+    Args:
+        pattern: Python regular expression to search for, matched per line.
+        path: File or directory to search. Defaults to the current directory.
+        glob: Only search files whose name matches this glob (e.g. "*.py").
+        ignore_case: Match case-insensitively.
+        context: Lines of context to show before and after each match.
+        max_results: Stop after this many matching lines (at most 1000).
+    """
+    return await run_file_tool(
+        _grep, [], pattern, path, glob, ignore_case, context, max_results
+    )
+
+
+def _grep(
+    pattern: str,
+    path: str,
+    glob: str,
+    ignore_case: bool,
+    context: int,
+    max_results: int,
+) -> str:
+    if err := check_path(path):
+        return err
+    if not os.path.exists(path):
+        return f"Error: path not found: {path}"
+    try:
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        regex = re.compile(pattern, flags)
+    except re.error as e:
+        return f"Error: invalid pattern: {e}"
+
+    max_results = min(max(1, max_results), MAX_RESULTS_LIMIT)
+    context = min(max(0, context), MAX_CONTEXT)
+    name_re = re.compile(fnmatch.translate(glob)) if glob else None
+
+    if os.path.isfile(path):
+        files = iter([os.path.abspath(path)])
+    else:
+        files = walk_files(path, IgnoreRules.for_root(path), _SKIP_DIRS)
+    files = (
+        f
+        for f in files
+        if not is_sensitive_name(os.path.basename(f))
+        and (name_re is None or name_re.match(os.path.basename(f)))
+    )
+
+    root = os.path.abspath(path)
+    out: list[str] = []
+    matches = matched_files = 0
+    for file, hits in _search(files, regex, context):
+        if check_path(file):
+            continue
+        shown = _display_path(file, root, path)
+        matched_files += 1
+        previous = None
+        for line_no, text, is_match in hits:
+            # Separate non-adjacent context groups, as grep does
+            if context and out and line_no - 1 != previous:
+                out.append("--")
+            previous = line_no
+            sep = ":" if is_match else "-"
+            out.append(f"{shown}{sep}{line_no}{sep}{text}")
+            matches += is_match
+            if matches >= max_results:
+                return _page(
+                    out,
+                    f"[showing the first {max_results} matches; "
+                    "narrow the pattern, path or glob to see more]",
+                )
+
+    if not out:
+        return "No matches found."
+    return _page(out, f"[{matches} matches in {matched_files} files]")
+
+
+def _page(out: list[str], footer: str) -> str:
+    """First page of the result lines, with the summary footer kept."""
+    body = page_text("\n".join(out), GREP_TOKEN_BUDGET)
+    return f"{body}\n{footer}"
+
+
+def _search(files, regex: re.Pattern, context: int):
+    """Yield ``(file, hits)`` for matching files, in walk order.
+
+    Files are searched in chunks on a thread pool with a bounded number of
+    chunks in flight, so the walk stops soon after the caller stops.
+    """
+    pending: deque[Future] = deque()
+    limit = GREP_WORKERS * PREFETCH_PER_WORKER
+    chunk: list[str] = []
+    try:
+        for file in files:
+            chunk.append(file)
+            if len(chunk) < CHUNK_FILES:
+                continue
+            pending.append(_pool.submit(_search_chunk, chunk, regex, context))
+            chunk = []
+            while len(pending) >= limit:
+                yield from pending.popleft().result()
+        if chunk:
+            pending.append(_pool.submit(_search_chunk, chunk, regex, context))
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _search_chunk(files: list[str], regex: re.Pattern, context: int) -> list:
+    results = []
+    for file in files:
+        if hits := _search_file(file, regex, context):
+            results.append((file, hits))
+    return results
+
+
+def _search_file(
+    file: str, regex: re.Pattern, context: int
+) -> list[tuple[int, str, bool]]:
+    """Return ``(line number, text, is match)`` rows for one file."""
+    try:
+        if os.path.getsize(file) > MAX_FILE_BYTES:
+            return []
+        with open(file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    if b"\0" in data[:BINARY_SNIFF_BYTES]:
+        return []
+    # Matched as str so \w, \b, character classes and ignore_case are
+    # Unicode-aware; one C-level scan of the whole file rejects most files
+    text = data.decode("utf-8", errors="replace")
+    if not regex.search(text):
+        return []
+
+    lines = text.split("\n")
+    if not lines[-1]:
+        lines.pop()
+    matched = [i for i, line in enumerate(lines) if regex.search(line)]
+    if not context:
+        return [(i + 1, _clip(lines[i]), True) for i in matched]
+
+    wanted: dict[int, bool] = {}
+    for i in matched:
+        for j in range(max(0, i - context), min(len(lines), i + context + 1)):
+            wanted.setdefault(j, False)
+        wanted[i] = True
+    return [(i + 1, _clip(lines[i]), wanted[i]) for i in sorted(wanted)]
+
+
+def _clip(line: str) -> str:
+    line = line.rstrip("\r")
+    if len(line) > MAX_LINE_CHARS:
+        line = line[:MAX_LINE_CHARS] + "…"
+    return line
+
+
+def _display_path(file: str, root: str, path: str) -> str:
+    """Show ``file`` relative to the path the caller searched."""
+    if file == root:
+        return path
+    rel = file[len(root.rstrip("/")) + 1 :]
+    return rel if path in (".", "./") else os.path.join(path, rel)
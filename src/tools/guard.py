@@ -1,6 +1,7 @@
 """File access guard — block sensitive file patterns."""
 
 import fnmatch
+import re
 from pathlib import Path
 
 # Safe suffixes that look sensitive but aren't (templates, samples)
@@ -30,6 +31,15 @@ SENSITIVE_FRAGMENTS = [
 ]
 
 
+# All SENSITIVE_NAMES as one regex, for callers checking many names
+_SENSITIVE_NAME_RE = re.compile("|".join(fnmatch.translate(p) for p in SENSITIVE_NAMES))
+
+
+def is_sensitive_name(name: str) -> bool:
+    """Return True if a file with this name must not be accessed."""
+    return not name.endswith(SAFE_SUFFIXES) and bool(_SENSITIVE_NAME_RE.match(name))
+
+
 def check_path(file_path: str) -> str | None:
     """Return an error message if the path is sensitive, otherwise None."""
     p = Path(file_path)
@@ -39,9 +49,8 @@ def check_path(file_path: str) -> str | None:
     if name.endswith(SAFE_SUFFIXES):
         return None
 
-    for pattern in SENSITIVE_NAMES:
-        if fnmatch.fnmatch(name, pattern):
-            return f"Skipped: {name} is a sensitive file and cannot be accessed."
+    if is_sensitive_name(name):
+        return f"Skipped: {name} is a sensitive file and cannot be accessed."
 
     resolved = p.resolve()
     parts = resolved.parts
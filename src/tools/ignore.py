@@ -0,0 +1,232 @@
+"""Ignore rules — .gitignore-aware directory walking for the search tools."""
+
+import os
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+# Never descended into, with or without a .gitignore saying so
+ALWAYS_SKIP_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        ".venv",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+    }
+)
+
+
+@dataclass(frozen=True)
+class _RuleSet:
+    """Compiled rules of one kind; ``keep[i]`` is True for ``!`` rule ``i``."""
+
+    pattern: re.Pattern
+    keep: tuple[bool, ...]
+
+    def ignores(self, rel: str) -> bool | None:
+        """True/False for the last matching rule, None if none matches."""
+        m = self.pattern.match(rel)
+        return None if m is None else not self.keep[m.lastindex - 1]
+
+
+@dataclass(frozen=True)
+class _Level:
+    """The rules of one .gitignore, matched against paths below its directory."""
+
+    prefix: int  # length of the base directory path plus its slash
+    files: _RuleSet | None
+    dirs: _RuleSet | None
+
+
+@dataclass(frozen=True)
+class IgnoreRules:
+    """Stack of .gitignore files from the repository root down.
+
+    Each file's rules compile into one regex per kind (files, directories)
+    whose alternatives are in reverse order, so the first alternative that
+    matches is the file's last matching rule — git's "last match wins" —
+    at the cost of a single regex match per path and .gitignore.  Rules
+    compare equal when built from the same .gitignore contents.
+    """
+
+    levels: tuple[_Level, ...] = ()
+
+    @classmethod
+    def for_root(cls, root: str) -> "IgnoreRules":
+        """Rules for walking ``root``, including .gitignore files above it."""
+        root = os.path.abspath(root)
+        chain = [root]
+        while not os.path.exists(os.path.join(chain[-1], ".git")):
+            parent = os.path.dirname(chain[-1])
+            if parent == chain[-1]:
+                # Not in a repository: only .gitignore files below root apply
+                return cls()
+            chain.append(parent)
+
+        exclude = os.path.join(chain[-1], ".git", "info", "exclude")
+        rules = cls()._with(chain[-1], _read_lines(exclude))
+        # Root's own .gitignore is picked up by the walk itself
+        for directory in reversed(chain[1:]):
+            rules = rules.child(directory)
+        return rules
+
+    def child(self, directory: str) -> "IgnoreRules":
+        """Rules extended with ``directory``'s own .gitignore, if any."""
+        lines = _read_lines(os.path.join(directory, ".gitignore"))
+        return self._with(directory, lines) if lines else self
+
+    def _with(self, base: str, lines: list[str]) -> "IgnoreRules":
+        files, dirs = _compile(lines)
+        if files is None and dirs is None:
+            return self
+        level = _Level(len(base.rstrip("/")) + 1, files, dirs)
+        return IgnoreRules((*self.levels, level))
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        """Return True if the absolute ``path`` is ignored."""
+        result = False
+        for level in self.levels:
+            rules = level.dirs if is_dir else level.files
+            if rules is not None:
+                verdict = rules.ignores(path[level.prefix :])
+                if verdict is not None:
+                    result = verdict
+        return result
+
+
+def walk_files(
+    root: str,
+    rules: IgnoreRules | None = None,
+    skip_dirs: frozenset[str] = ALWAYS_SKIP_DIRS,
+) -> Iterator[str]:
+    """Yield absolute paths of files under ``root`` that are not ignored.
+
+    Directories are visited depth-first in name order; ignored directories
+    and those named in ``skip_dirs`` are never entered.
+    """
+    root = os.path.abspath(root)
+    stack = [(root, rules or IgnoreRules.for_root(root))]
+    while stack:
+        directory, rules = stack.pop()
+        listing = scan_dir(directory, rules, skip_dirs)
+        if listing is None:
+            continue
+        rules, files, subdirs = listing
+        yield from files
+        stack.extend((d, rules) for d in reversed(subdirs))
+
+
+def scan_dir(
+    directory: str,
+    rules: IgnoreRules,
+    skip_dirs: frozenset[str] = ALWAYS_SKIP_DIRS,
+) -> tuple[IgnoreRules, list[str], list[str]] | None:
+    """List one directory: ``(rules, files, subdirs)``, None if unreadable.
+
+    ``rules`` are the parent's; the returned rules add the directory's own
+    .gitignore and apply to its subdirectories. Entries are in name order.
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return None
+    rules = rules.child(directory)
+    files, subdirs = [], []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.name not in skip_dirs and not rules.ignored(entry.path, True):
+                subdirs.append(entry.path)
+        elif entry.is_file() and not rules.ignored(entry.path, False):
+            files.append(entry.path)
+    return rules, files, subdirs
+
+
+def glob_regex(pattern: str) -> re.Pattern:
+    """Compile a glob (``*``, ``?``, ``[...]``, ``**``) for relative paths."""
+    return re.compile(f"{_translate(pattern.lstrip('/'))}\\Z", re.DOTALL)
+
+
+def _compile(lines: list[str]) -> tuple[_RuleSet | None, _RuleSet | None]:
+    """Compile gitignore lines into rule sets for files and directories."""
+    file_rules: list[tuple[str, bool]] = []
+    dir_rules: list[tuple[str, bool]] = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate or line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the base
+        if "/" in line:
+            regex = _translate(line.lstrip("/"))
+        else:
+            regex = f"(?:.*/)?{_translate(line)}"
+        dir_rules.append((regex, negate))
+        if not dir_only:
+            file_rules.append((regex, negate))
+    return _combine(file_rules), _combine(dir_rules)
+
+
+def _combine(rules: list[tuple[str, bool]]) -> _RuleSet | None:
+    if not rules:
+        return None
+    # Last rule first: the first alternative to match is the winning rule
+    rules = rules[::-1]
+    pattern = "|".join(f"({regex})" for regex, _ in rules)
+    return _RuleSet(
+        re.compile(f"(?:{pattern})\\Z", re.DOTALL),
+        tuple(negate for _, negate in rules),
+    )
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matching a relative path."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and (end := pattern.find("]", i + 2)) != -1:
+            body = pattern[i + 1 : end]
+            if body[0] in "!^":
+                body = "^" + body[1:]
+            out.append(f"[{body.replace('\\', '\\\\')}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def _read_lines(path: str) -> list[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.readlines()
+    except OSError:
+        return []
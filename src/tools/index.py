@@ -0,0 +1,142 @@
+"""Workspace index — in-memory file listing, refreshed by directory mtimes."""
+
+import os
+import threading
+from dataclasses import dataclass
+
+from .guard import SENSITIVE_DIRS
+from .ignore import ALWAYS_SKIP_DIRS, IgnoreRules, scan_dir
+
+# Files indexed at most; the rest of a huge tree is left out
+MAX_INDEX_FILES = 200_000
+
+_SKIP_DIRS = ALWAYS_SKIP_DIRS | frozenset(SENSITIVE_DIRS)
+
+
+@dataclass(frozen=True)
+class _Dir:
+    """One listed directory and what its listing depended on."""
+
+    mtime_ns: int
+    ignore_mtime_ns: int  # of its own .gitignore, 0 if there is none
+    parent_rules: IgnoreRules
+    rules: IgnoreRules
+    files: tuple[str, ...]
+    mtimes: tuple[int, ...]  # st_mtime_ns of each file, when listed
+    subdirs: tuple[str, ...]
+
+
+class FileIndex:
+    """Files under ``root`` that are not ignored, listed once and kept fresh.
+
+    Creating, deleting or renaming an entry changes its directory's mtime,
+    so each refresh stats every known directory (and its .gitignore) and
+    lists only the ones that changed — one ``stat`` per directory instead
+    of a full rescan. A directory is also relisted when the rules inherited
+    from its parent change.
+
+    File mtimes are recorded when their directory is listed: a file
+    rewritten in place keeps its listed mtime until the directory changes.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.truncated = False
+        self._base_rules = IgnoreRules.for_root(self.root)
+        self._dirs: dict[str, _Dir] = {}
+        self._lock = threading.Lock()
+
+    def files(self, under: str | None = None) -> list[str] | None:
+        """Return the absolute paths of files below ``under`` (default: root).
+
+        Returns None if ``under`` is not an indexed directory, e.g. because
+        it is ignored or outside the root.
+        """
+        listing = self.listing(under)
+        return None if listing is None else [path for path, _ in listing]
+
+    def listing(self, under: str | None = None) -> list[tuple[str, int]] | None:
+        """Like :meth:`files`, as ``(path, mtime_ns)`` pairs."""
+        under = os.path.abspath(under or self.root)
+        with self._lock:
+            self._refresh()
+            if under not in self._dirs:
+                return None
+            out: list[tuple[str, int]] = []
+            stack = [under]
+            while stack:
+                entry = self._dirs.get(stack.pop())
+                if entry is None:
+                    continue  # beyond MAX_INDEX_FILES
+                out.extend(zip(entry.files, entry.mtimes, strict=True))
+                stack.extend(entry.subdirs)
+            return out
+
+    def _refresh(self) -> None:
+        dirs: dict[str, _Dir] = {}
+        count = 0
+        self.truncated = False
+        stack = [(self.root, self._base_rules)]
+        while stack:
+            directory, parent_rules = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            ignore_mtime_ns = _mtime_ns(os.path.join(directory, ".gitignore"))
+            entry = self._dirs.get(directory)
+            if (
+                entry is None
+                or entry.mtime_ns != mtime_ns
+                or entry.ignore_mtime_ns != ignore_mtime_ns
+                # By value: rules are rebuilt whenever a parent is relisted
+                or entry.parent_rules != parent_rules
+            ):
+                listing = scan_dir(directory, parent_rules, _SKIP_DIRS)
+                if listing is None:
+                    continue
+                rules, files, subdirs = listing
+                entry = _Dir(
+                    mtime_ns,
+                    ignore_mtime_ns,
+                    parent_rules,
+                    rules,
+                    tuple(files),
+                    tuple(_mtime_ns(f) for f in files),
+                    tuple(subdirs),
+                )
+            count += len(entry.files)
+            if count > MAX_INDEX_FILES:
+                self.truncated = True
+                break
+            dirs[directory] = entry
+            stack.extend((d, entry.rules) for d in entry.subdirs)
+        self._dirs = dirs
+
+
+_workspace: FileIndex | None = None
+_workspace_lock = threading.Lock()
+
+
+def workspace_index() -> FileIndex:
+    """The index of the current working directory, created on first use."""
+    global _workspace
+    cwd = os.getcwd()
+    with _workspace_lock:
+        if _workspace is None or _workspace.root != cwd:
+            _workspace = FileIndex(cwd)
+        return _workspace
+
+
+def warm_workspace_index() -> None:
+    """Build the workspace index in a background thread."""
+    threading.Thread(
+        target=lambda: workspace_index().files(), name="they-index", daemon=True
+    ).start()
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
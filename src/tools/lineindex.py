@@ -0,0 +1,121 @@
+"""Line index — sparse newline offsets for seekable ranged reads."""
+
+import mmap
+import os
+import re
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+
+# Bytes per index block; one checkpoint (newlines seen so far) per block
+BLOCK_SIZE = 1 << 16
+
+# Number of (path, size, mtime) indexes kept in memory
+INDEX_CACHE_SIZE = 32
+
+# Line terminators, as universal newlines read them
+_TERMINATOR = re.compile(rb"\r\n?|\n")
+
+
+class LineIndex:
+    r"""Line terminator counts at fixed block boundaries of a file.
+
+    ``counts[i]`` is the number of terminators that start before byte
+    ``i * block_size``.  Locating a line is a binary search plus a scan of at
+    most one block, so a ranged read costs O(lines returned), independent of
+    the file size.  Lines end at ``\n``, ``\r\n`` or a lone ``\r``, as in
+    :func:`split_lines`.
+    """
+
+    def __init__(self, path: str, size: int, block_size: int):
+        self.path = path
+        self.size = size
+        self.block_size = block_size
+        self.counts = array("Q")
+
+        seen = 0
+        last = b""
+        self.has_cr = False
+        remaining = size
+        with open(path, "rb") as f:
+            while remaining > 0:
+                block = f.read(min(block_size, remaining))
+                if not block:
+                    break
+                self.counts.append(seen)
+                seen += block.count(b"\n")
+                if b"\r" in block:
+                    self.has_cr = True
+                    seen += block.count(b"\r") - block.count(b"\r\n")
+                # \r\n split across blocks: its \r was counted already
+                if last == b"\r" and block[:1] == b"\n":
+                    seen -= 1
+                remaining -= len(block)
+                last = block[-1:]
+
+        # A final line without a trailing newline still counts as a line
+        self.total = seen + (1 if last and last not in b"\r\n" else 0)
+
+    def _line_start(self, mm: mmap.mmap, line: int) -> int:
+        """Return the byte offset where ``line`` (0-based) begins."""
+        if line <= 0:
+            return 0
+        if line >= self.total:
+            return self.size
+
+        # Last block with fewer than `line` terminators before it holds the
+        # terminator that ends line `line - 1`.
+        block = bisect_left(self.counts, line) - 1
+        pos = block * self.block_size
+        if not self.has_cr:
+            for _ in range(line - self.counts[block]):
+                pos = mm.find(b"\n", pos) + 1
+            return pos
+        # The \n of a \r\n split across blocks was counted with its \r
+        if pos and mm[pos - 1 : pos + 1] == b"\r\n":
+            pos += 1
+        for _ in range(line - self.counts[block]):
+            pos = _TERMINATOR.search(mm, pos).end()
+        return pos
+
+    def read_lines(self, start: int, end: int) -> list[str]:
+        """Return lines ``[start, end)`` (0-based) without line terminators."""
+        end = min(end, self.total)
+        if start >= end:
+            return []
+
+        with (
+            open(self.path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            begin = self._line_start(mm, start)
+            stop = self._line_start(mm, end)
+            data = mm[begin:stop]
+
+        return split_lines(data.decode("utf-8", errors="replace"))
+
+
+def split_lines(text: str) -> list[str]:
+    r"""Split on newlines; a trailing newline does not start another line.
+
+    ``\r\n`` and a lone ``\r`` end lines too, as in text-mode ``open()``.
+    """
+    if not text:
+        return []
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+    if text.endswith("\n"):
+        lines.pop()
+    return lines
+
+
+@lru_cache(maxsize=INDEX_CACHE_SIZE)
+def _load_index(path: str, size: int, mtime_ns: int) -> LineIndex:
+    return LineIndex(path, size, BLOCK_SIZE)
+
+
+def get_index(p: Path, st: os.stat_result | None = None) -> LineIndex:
+    """Return the cached index for ``p``, rebuilding it if the file changed."""
+    st = st or p.stat()
+    return _load_index(str(p.resolve()), st.st_size, st.st_mtime_ns)
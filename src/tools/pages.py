@@ -0,0 +1,132 @@
+"""Result pages — token budgets for tool output, with continuation handles.
+
+A tool result over its budget is cut, and the rest is registered behind an
+opaque handle; ``more_tool(handle)`` returns the next page without running
+the command or reading the file again from the start.
+"""
+
+import secrets
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from agents import function_tool
+
+from ..tokens import CHARS_PER_TOKEN, estimate_tokens
+from .concurrency import run_file_tool
+
+# Tokens per page for results without a budget of their own
+DEFAULT_PAGE_TOKENS = 8000
+
+# Continuations kept, by count and by characters of held text; the least
+# recently used are dropped first
+MAX_HANDLES = 256
+MAX_HANDLE_CHARS = 64 << 20
+
+
+@dataclass(frozen=True)
+class _Continuation:
+    fn: Callable[..., str]
+    paths: list[str]
+    args: tuple
+    chars: int
+
+
+_handles: OrderedDict[str, _Continuation] = OrderedDict()
+_handle_chars = 0
+_lock = threading.Lock()
+
+
+def continuation(
+    fn: Callable[..., str], paths: list[str], *args: object, chars: int = 0
+) -> str:
+    """Register ``fn(*args)`` as a next page and return its handle.
+
+    ``fn`` runs like a file tool, under the locks of ``paths``; ``chars``
+    is the size of the text the arguments hold, for the memory bound.
+    """
+    global _handle_chars
+    handle = secrets.token_hex(6)
+    with _lock:
+        _handles[handle] = _Continuation(fn, paths, args, chars)
+        _handle_chars += chars
+        while len(_handles) > MAX_HANDLES or (
+            _handle_chars > MAX_HANDLE_CHARS and len(_handles) > 1
+        ):
+            _handle_chars -= _handles.popitem(last=False)[1].chars
+    return handle
+
+
+def more_hint(handle: str) -> str:
+    """The call that fetches the page behind ``handle``, for result footers."""
+    return f'more_tool(handle="{handle}")'
+
+
+def page_text(text: str, budget: int = DEFAULT_PAGE_TOKENS) -> str:
+    """Return ``text``, or its first ``budget`` tokens and a handle to the rest."""
+    if estimate_tokens(text) <= budget:
+        return text
+    cut = _cut(text, budget * CHARS_PER_TOKEN)
+    rest = text[cut:]
+    handle = continuation(page_text, [], rest, budget, chars=len(rest))
+    shown = text[:cut].rstrip("\n")
+    return (
+        f"{shown}\n"
+        f"[truncated: ~{estimate_tokens(rest)} more tokens, "
+        f"{_count_lines(rest)} lines; {more_hint(handle)} returns the next page]"
+    )
+
+
+def elide_middle(text: str, budget: int = DEFAULT_PAGE_TOKENS) -> str:
+    """Keep the head and tail of ``text`` within ``budget`` tokens.
+
+    The elided middle is paged through a handle — for command output, whose
+    end (errors, exit status) matters as much as its start.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    half = budget * CHARS_PER_TOKEN // 2
+    head = _cut(text, half)
+    tail = len(text) - half
+    # Start the tail on a line if one begins in its first half
+    newline = text.find("\n", tail - 1, len(text) - half // 2)
+    if newline != -1:
+        tail = newline + 1
+    middle = text[head:tail]
+    handle = continuation(page_text, [], middle, budget, chars=len(middle))
+    shown = text[:head].rstrip("\n")
+    return (
+        f"{shown}\n"
+        f"... [~{estimate_tokens(middle)} tokens, {_count_lines(middle)} lines "
+        f"elided; {more_hint(handle)} pages through them] ...\n"
+        f"{text[tail:]}"
+    )
+
+
+@function_tool
+async def more_tool(handle: str) -> str:
+    """Return the next page of a truncated tool result.
+
+    Args:
+        handle: The handle given at the end of the truncated result.
+    """
+    with _lock:
+        entry = _handles.get(handle)
+        if entry is not None:
+            _handles.move_to_end(handle)
+    if entry is None:
+        return f"Error: unknown or expired handle: {handle}"
+    return await run_file_tool(entry.fn, entry.paths, *entry.args)
+
+
+def _cut(text: str, limit: int) -> int:
+    """Index to cut ``text`` at, within ``limit`` chars and on a line end if possible."""
+    if len(text) <= limit:
+        return len(text)
+    newline = text.rfind("\n", 0, limit)
+    return newline + 1 if newline >= limit // 2 else limit
+
+
+def _count_lines(text: str) -> int:
+    return text.count("\n") + (not text.endswith("\n"))
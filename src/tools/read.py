@@ -4,18 +4,35 @@ from pathlib import Path
 
 from agents import function_tool
 
+from ..tokens import CHARS_PER_TOKEN
+from .cache import file_cache
+from .concurrency import run_file_tool
 from .guard import check_path
+from .lineindex import get_index, split_lines
+from .pages import continuation, more_hint
+
+# Tokens of file content returned per call; the rest is paged
+READ_TOKEN_BUDGET = 10_000
+
+# Every numbered line costs at least this many characters ("%6d\t" + newline)
+_MIN_LINE_CHARS = 8
 
 
 @function_tool
-def read_tool(file_path: str, offset: int = 0, limit: int = 0) -> str:
+async def read_tool(file_path: str, offset: int = 0, limit: int = 0) -> str:
     """Read a file and return its contents with line numbers.
 
     Args:
         file_path: Absolute or relative path to the file.
         offset: Start reading from this line number (1-based). 0 means from the beginning.
-        limit: Maximum number of lines to read. 0 means read all.
+        limit: Maximum number of lines to read. 0 means read all. Long
+            results are cut into pages; the footer says how to get the next.
     """
+    return await run_file_tool(_read, [file_path], file_path, offset, limit)
+
+
+def _read(file_path: str, offset: int, limit: int, column: int = 0) -> str:
+    # ``column`` skips the part of the first line an earlier page showed
     if err := check_path(file_path):
         return err
 
@@ -25,16 +42,71 @@ def read_tool(file_path: str, offset: int = 0, limit: int = 0) -> str:
     if not p.is_file():
         return f"Error: not a file: {file_path}"
 
-    lines = p.read_text(encoding="utf-8").splitlines(keepends=True)
-    total = len(lines)
-
     start = max(0, offset - 1) if offset > 0 else 0
-    end = start + limit if limit > 0 else total
-    selected = lines[start:end]
+    budget = READ_TOKEN_BUDGET * CHARS_PER_TOKEN
+    # Never load more lines than could fit in the budget
+    wanted = budget // _MIN_LINE_CHARS + 1
+    selected, total = _read_range(p, start, min(limit, wanted) if limit else wanted)
+    if selected and column:
+        selected[0] = selected[0][column:]
+    if selected and len(f"{start + 1:>6}\t{selected[0].rstrip()}") > budget:
+        return _read_long_line(p, file_path, start, limit, total, column, selected[0])
 
     numbered = []
+    used = 0
     for i, line in enumerate(selected, start=start + 1):
-        numbered.append(f"{i:>6}\t{line.rstrip()}")
+        row = f"{i:>6}\t{line.rstrip()}"
+        used += len(row) + 1
+        if used > budget and numbered:
+            break
+        numbered.append(row)
+
+    end = start + len(numbered)
+    header = f"[{p.name}] lines {start + 1}-{end} of {total}"
+    if column:
+        header += f", line {start + 1} from character {column + 1}"
+    text = header + "\n" + "\n".join(numbered)
+    if end < (min(start + limit, total) if limit > 0 else total):
+        rest = limit - len(numbered) if limit > 0 else 0
+        handle = continuation(_read, [file_path], file_path, end + 1, rest)
+        text += (
+            f"\n[truncated at ~{READ_TOKEN_BUDGET} tokens; "
+            f"{more_hint(handle)} or offset={end + 1} reads on]"
+        )
+    return text
+
+
+def _read_long_line(
+    p: Path, file_path: str, start: int, limit: int, total: int, column: int, line: str
+) -> str:
+    """One page of a line longer than the whole budget, e.g. minified code."""
+    prefix = f"{start + 1:>6}\t"
+    line = line.rstrip()
+    shown = line[: READ_TOKEN_BUDGET * CHARS_PER_TOKEN - len(prefix)]
+    done = column + len(shown)
+    handle = continuation(_read, [file_path], file_path, start + 1, limit, done)
+    return (
+        f"[{p.name}] line {start + 1} of {total}, "
+        f"characters {column + 1}-{done} of {column + len(line)}\n"
+        f"{prefix}{shown}\n"
+        f"[line continues; {more_hint(handle)} returns more of it, "
+        f"or offset={start + 2} reads on from the next line]"
+    )
+
+
+def _read_range(p: Path, start: int, limit: int) -> tuple[list[str], int]:
+    """Return the selected lines and the file's total line count."""
+    st = p.stat()
+    if st.st_size <= file_cache.max_entry_bytes:
+        try:
+            lines = split_lines(file_cache.read_text(p))
+        except UnicodeDecodeError:
+            pass
+        else:
+            end = start + limit if limit > 0 else len(lines)
+            return lines[start:end], len(lines)
 
-    header = f"[{p.name}] lines {start + 1}-{start + len(selected)} of {total}"
-    return header + "\n" + "\n".join(numbered)
+    # Large or non-UTF-8 files: seek straight to the range via the line index
+    index = get_index(p, st)
+    end = start + limit if limit > 0 else index.total
+    return index.read_lines(start, end), index.total
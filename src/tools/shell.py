@@ -0,0 +1,234 @@
+"""Persistent shell — one long-lived bash per agent, framed by sentinels."""
+
+import asyncio
+import os
+import re
+import shlex
+import shutil
+import time
+import uuid
+from collections.abc import Callable
+
+from agents import FunctionTool, function_tool
+
+from .bash import (
+    READ_CHUNK,
+    USAGE_REPORT_SECONDS,
+    _BoundedCapture,
+    _format_output,
+    current_limits,
+    kill_process_group,
+    output_exceeded,
+    overflow_note,
+    ulimit_commands,
+    usage_line,
+)
+from .concurrency import tool_slot
+
+
+class ShellSession:
+    """A long-lived shell whose cwd and environment persist between commands.
+
+    Each command is sent as ``eval '<command>'`` followed by sentinel lines on
+    stdout (carrying ``$?`` and the shell's ``times``) and stderr, so output,
+    exit code and CPU time can be framed without closing the pipes.  If the
+    shell dies, or a command times out or prints more than the output limit,
+    the shell is discarded and a fresh one is started on the next call.
+
+    Unlike bash_tool, commands run in the shell's own process and process
+    group, so the CPU time limit is not applied (the shell's CPU time adds
+    up over the session).  The memory and process limits are set on the
+    shell when it starts.
+    """
+
+    def __init__(self, shell: str | None = None):
+        self._shell = shell or shutil.which("bash") or "/bin/sh"
+        self._proc: asyncio.subprocess.Process | None = None
+        self._lock = asyncio.Lock()
+        # CPU seconds of the shell and its children after the last command
+        self._cpu = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def _start(self) -> asyncio.subprocess.Process:
+        args = [self._shell]
+        if os.path.basename(self._shell) == "bash":
+            args += ["--noprofile", "--norc"]
+        proc = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            # Own process group: terminal Ctrl-C must not kill the shell
+            start_new_session=True,
+        )
+        self._cpu = 0.0
+        if ulimit := ulimit_commands(self._shell, cpu=False):
+            proc.stdin.write(f"{ulimit}\n".encode())
+        return proc
+
+    async def run(self, command: str, timeout: int = 120) -> str:
+        """Run ``command`` in the shell and return formatted output."""
+        async with self._lock:
+            if not self.alive:
+                self._proc = await self._start()
+            proc = self._proc
+
+            token = f"__they_{uuid.uuid4().hex}__"
+            script = (
+                f"eval {shlex.quote(command)} < /dev/null\n"
+                f"printf '\\n%s %d\\n' {token} $?\n"
+                f"times; printf '%s\\n' {token}\n"
+                f"printf '\\n%s\\n' {token} >&2\n"
+            )
+
+            limits = current_limits()
+            stdout, stderr = _BoundedCapture(), _BoundedCapture()
+            overflowed = False
+
+            def check_output() -> None:
+                nonlocal overflowed
+                if not overflowed and output_exceeded(stdout, stderr, limits):
+                    overflowed = True
+                    kill_process_group(proc.pid)
+
+            started = time.perf_counter()
+            try:
+                proc.stdin.write(script.encode())
+                await proc.stdin.drain()
+                results = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_framed(proc.stdout, token, stdout, check_output),
+                        _read_framed(proc.stderr, token, stderr, check_output),
+                        return_exceptions=True,
+                    ),
+                    timeout=timeout,
+                )
+            except asyncio.CancelledError:
+                # The interrupted command's output would garble the next one
+                await self.close()
+                raise
+            except asyncio.TimeoutError:
+                await self.close()
+                return (
+                    f"Error: command timed out after {timeout}s "
+                    "(shell restarted; cwd and environment were reset)"
+                )
+            except ConnectionError:
+                results = [EOFError()]
+
+            if overflowed:
+                await self.close()
+                out = _format_output(stdout, stderr, None)
+                return (
+                    f"{out}\n{overflow_note(limits)}\n"
+                    "[shell restarted; cwd and environment were reset]"
+                )
+            if any(isinstance(r, BaseException) for r in results):
+                # The command ended the shell (e.g. `exit`); start over next call
+                status = await proc.wait()
+                self._proc = None
+                out = _format_output(stdout, stderr, None)
+                return (
+                    f"{out}\n[shell exited with code {status}; "
+                    "a fresh shell will be started]"
+                )
+
+            wall = time.perf_counter() - started
+            code, times = results[0]
+            total_cpu = _cpu_seconds(times)
+            cpu, self._cpu = total_cpu - self._cpu, total_cpu
+            out = _format_output(stdout, stderr, code)
+            if max(wall, cpu) >= USAGE_REPORT_SECONDS:
+                out += "\n" + usage_line(wall, cpu)
+            return out
+
+    async def close(self) -> None:
+        """Kill the shell and everything it started."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            kill_process_group(proc.pid)
+            await proc.wait()
+
+
+async def _read_framed(
+    stream: asyncio.StreamReader,
+    token: str,
+    capture: _BoundedCapture,
+    on_data: Callable[[], None],
+) -> tuple[int | None, str]:
+    """Feed ``stream`` into ``capture`` up to the sentinel line.
+
+    Returns the exit code carried after the sentinel and the ``times``
+    output framed between it and the closing token (stdout), or
+    ``(None, "")`` when the sentinel carries neither (stderr).  Raises
+    ``EOFError`` if the stream closes first.
+    """
+    marker = f"\n{token}".encode()
+    carry = b""
+    while True:
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            capture.feed(carry)
+            raise EOFError
+
+        data = carry + chunk
+        idx = data.find(marker)
+        if idx < 0:
+            # Hold back enough bytes to catch a marker split across chunks
+            keep = len(marker) - 1
+            capture.feed(data[:-keep])
+            carry = data[-keep:]
+            on_data()
+            continue
+
+        capture.feed(data[:idx])
+        rest = data[idx + len(marker) :]
+        while b"\n" not in rest:
+            rest += await _read_more(stream)
+        line, rest = rest.split(b"\n", 1)
+        code = line.strip()
+        if not code:
+            return None, ""
+        while f"{token}\n".encode() not in rest:
+            rest += await _read_more(stream)
+        return int(code), rest.decode(errors="replace").split(token)[0]
+
+
+async def _read_more(stream: asyncio.StreamReader) -> bytes:
+    more = await stream.read(READ_CHUNK)
+    if not more:
+        raise EOFError
+    return more
+
+
+def _cpu_seconds(times: str) -> float:
+    """Total of the user and system times printed by the ``times`` builtin."""
+    return sum(
+        int(minutes) * 60 + float(seconds)
+        for minutes, seconds in re.findall(r"(\d+)m([\d.]+)s", times)
+    )
+
+
+def persistent_bash_tool() -> FunctionTool:
+    """Return a ``bash_tool`` bound to its own long-lived shell."""
+    session = ShellSession()
+
+    @function_tool(name_override="bash_tool")
+    async def bash_tool(command: str, timeout: int = 120) -> str:
+        """Execute a command in a persistent shell and return its output.
+
+        The working directory, environment variables and sourced scripts
+        carry over between calls.
+
+        Args:
+            command: The shell command to execute.
+            timeout: Maximum execution time in seconds (default 120).
+        """
+        async with tool_slot():
+            return await session.run(command, timeout)
+
+    bash_tool.session = session  # type: ignore[attr-defined]
+    return bash_tool
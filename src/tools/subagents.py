@@ -0,0 +1,162 @@
+"""Sub-agents tool — fan independent tasks out to concurrent child agents.
+
+Each child is a clone of the calling agent with its own context, holding
+only its task, and a subset of the tools.  Children run at once up to a
+concurrency cap, and only their final answers, each capped in size, come
+back into the parent's context.
+"""
+
+import asyncio
+import time
+import weakref
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from agents import Agent, Runner, Tool, function_tool
+from agents.tool_context import ToolContext
+
+from ..config import DEFAULT_SUBAGENT_CONCURRENCY
+from .pages import elide_middle, page_text
+
+# Tools a child gets when the call names none: the read-only ones
+DEFAULT_SUBAGENT_TOOLS = ("read_tool", "grep_tool", "glob_tool", "more_tool")
+
+# Tasks accepted per call
+MAX_SUBAGENT_TASKS = 50
+
+# Agent loop iterations allowed per child
+SUBAGENT_MAX_TURNS = 30
+
+# Tokens kept of each child's answer, and of the combined result per page
+SUBAGENT_RESULT_TOKENS = 1000
+SUBAGENTS_TOKEN_BUDGET = 8000
+
+# Task text shown in a result heading
+TITLE_CHARS = 80
+
+SUBAGENT_PROMPT = """\
+You are a sub-agent of **they**, a coding assistant in a terminal. You were
+given one task out of a larger job; other sub-agents handle the rest.
+
+- Work only on your task and finish it with the tools you have.
+- Nobody can answer questions: make reasonable assumptions and note them.
+- Your final answer is all that is passed back. Make it a short,
+  self-contained report: the findings, with file paths and line numbers
+  where relevant, and no narration of the steps you took.
+"""
+
+
+@dataclass
+class _ChildResult:
+    """A child's capped answer, or its error message if the run failed."""
+
+    text: str
+    failed: bool = False
+
+
+_max_concurrency = DEFAULT_SUBAGENT_CONCURRENCY
+
+# One semaphore per event loop, shared by all calls on that loop
+_limits: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_subagent_concurrency(limit: int) -> None:
+    """Set how many child agents may run at once."""
+    global _max_concurrency
+    limit = max(1, limit)
+    if limit != _max_concurrency:
+        _max_concurrency = limit
+        _limits.clear()
+
+
+@function_tool
+async def subagents_tool(
+    ctx: ToolContext, tasks: list[str], tools: list[str] | None = None
+) -> str:
+    """Run independent tasks in parallel sub-agents and return their answers.
+
+    Use for fan-out work where each piece stands alone, e.g. summarizing
+    many files or checking several services. Each sub-agent sees only its
+    task text, not this conversation, so write every task as a complete,
+    self-contained instruction. Only each sub-agent's short final report
+    comes back.
+
+    Args:
+        tasks: One self-contained instruction per sub-agent.
+        tools: Tools the sub-agents may use (default: read_tool, grep_tool,
+            glob_tool, more_tool). Add write, edit or bash tools only if
+            the tasks need them.
+    """
+    parent = ctx.agent
+    if not isinstance(parent, Agent):
+        return "Error: sub-agents can only be started by an agent"
+    tasks = [t.strip() for t in tasks if t.strip()]
+    if not tasks:
+        return "Error: no tasks given"
+    if len(tasks) > MAX_SUBAGENT_TASKS:
+        return f"Error: at most {MAX_SUBAGENT_TASKS} tasks per call, got {len(tasks)}"
+
+    available = {t.name: t for t in _child_tools()}
+    names = list(dict.fromkeys(tools or DEFAULT_SUBAGENT_TOOLS))
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        return (
+            f"Error: unknown tools: {', '.join(unknown)}. "
+            f"Available: {', '.join(available)}"
+        )
+    child = parent.clone(
+        name=f"{parent.name}-subagent",
+        instructions=SUBAGENT_PROMPT,
+        tools=[available[n] for n in names],
+    )
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_run_child(ctx, child, task) for task in tasks))
+    failed = sum(r.failed for r in results)
+    header = (
+        f"[{len(tasks)} sub-agents in {time.perf_counter() - started:.1f}s"
+        f"{f', {failed} failed' if failed else ''}]"
+    )
+    sections = [
+        f"## {i}. {_title(task)}\n{result.text}"
+        for i, (task, result) in enumerate(zip(tasks, results, strict=True), 1)
+    ]
+    return page_text("\n\n".join([header, *sections]), SUBAGENTS_TOKEN_BUDGET)
+
+
+async def _run_child(ctx: ToolContext, child: Agent, task: str) -> _ChildResult:
+    async with _slot():
+        try:
+            run = await Runner.run(child, input=task, max_turns=SUBAGENT_MAX_TURNS)
+        except Exception as e:
+            return _ChildResult(f"Error: {type(e).__name__}: {e}", failed=True)
+    # Children's tokens count towards the parent run
+    ctx.usage.add(run.context_wrapper.usage)
+    answer = str(run.final_output or "").strip() or "(no answer)"
+    return _ChildResult(elide_middle(answer, SUBAGENT_RESULT_TOKENS))
+
+
+@asynccontextmanager
+async def _slot() -> AsyncIterator[None]:
+    loop = asyncio.get_running_loop()
+    sem = _limits.get(loop)
+    if sem is None:
+        sem = _limits[loop] = asyncio.Semaphore(_max_concurrency)
+    async with sem:
+        yield
+
+
+def _child_tools() -> list[Tool]:
+    # Children get the stateless default tools: no nested fan-out, and no
+    # persistent shell that concurrent children would share
+    from . import ALL_TOOLS
+
+    return [t for t in ALL_TOOLS if t is not subagents_tool]
+
+
+def _title(task: str) -> str:
+    line = task.splitlines()[0]
+    return line if len(line) <= TITLE_CHARS else line[: TITLE_CHARS - 3] + "..."
@@ -4,13 +4,20 @@ from collections.abc import Callable
 
 from .console import console
 
+# Rows shown by /sessions
+SESSIONS_LISTED = 20
+
 
 def handle_help() -> None:
     console.print(
         "[bold]Commands:[/bold]\n"
         "  /help   — show this message\n"
         "  /model  — show current model\n"
+        "  /cache  — show file cache statistics\n"
+        "  /stats  — show latency and token statistics\n"
+        "  /sessions — list saved sessions (resume with --resume ID)\n"
         "  /clear  — clear conversation history\n"
+        "  /compact — summarize older turns to shrink the context\n"
         "  /quit   — exit\n\n"
         "[bold]Shortcuts:[/bold]\n"
         "  Esc Esc — interrupt current operation"
@@ -28,15 +35,91 @@ def handle_model() -> None:
     )
 
 
+def handle_cache() -> None:
+    from src.tools.cache import file_cache
+
+    stats = file_cache.stats()
+    lookups = stats.hits + stats.misses
+    rate = f"{stats.hits / lookups:.0%}" if lookups else "n/a"
+    console.print(
+        f"[bold]File cache:[/bold] {stats.entries} files, "
+        f"{stats.bytes / 1024:.0f} / {file_cache.max_bytes / 1024:.0f} KiB"
+    )
+    console.print(
+        f"[dim]hits={stats.hits}  misses={stats.misses}  "
+        f"evictions={stats.evictions}  hit rate={rate}[/dim]"
+    )
+
+
+def handle_stats() -> None:
+    from rich.table import Table
+
+    from src.stats import percentile, session_stats
+
+    samples = {k: v for k, v in session_stats.summary().items() if v}
+    if not samples:
+        console.print("[dim]No turns recorded yet.[/dim]")
+        return
+
+    table = Table(title=f"Session stats ({len(session_stats.turns)} turns)")
+    table.add_column("metric")
+    for col in ("n", "p50", "p95", "max"):
+        table.add_column(col, justify="right")
+    for name, values in samples.items():
+        table.add_row(
+            name,
+            str(len(values)),
+            f"{percentile(values, 50):,.2f}",
+            f"{percentile(values, 95):,.2f}",
+            f"{max(values):,.2f}",
+        )
+    console.print(table)
+    counts = session_stats.resilience()
+    if any(counts.values()):
+        console.print(
+            "[dim]Session-wide, sub-agents included: "
+            + "  ".join(f"{k}={v}" for k, v in counts.items())
+            + "[/dim]"
+        )
+
+
+def handle_sessions() -> None:
+    import time
+
+    from rich.table import Table
+
+    from src.config import get_config
+    from src.session import list_sessions, sessions_dir
+
+    sessions = list_sessions(sessions_dir(get_config()))[:SESSIONS_LISTED]
+    if not sessions:
+        console.print("[dim]No saved sessions.[/dim]")
+        return
+
+    table = Table(title="Saved sessions (resume with: they --resume ID)")
+    table.add_column("id")
+    table.add_column("updated")
+    table.add_column("items", justify="right")
+    table.add_column("first prompt")
+    for s in sessions:
+        updated = time.strftime("%Y-%m-%d %H:%M", time.localtime(s.updated))
+        table.add_row(s.id, updated, str(s.items), s.title)
+    console.print(table)
+
+
 # Return value: "quit" to exit, "clear" to reset history, None to continue
 COMMANDS: dict[str, Callable[[], None]] = {
     "/help": handle_help,
     "/model": handle_model,
+    "/cache": handle_cache,
+    "/stats": handle_stats,
+    "/sessions": handle_sessions,
 }
 
 # Commands that need special loop control (not just print-and-continue)
 QUIT_COMMANDS = frozenset({"/quit", "/exit"})
 CLEAR_COMMANDS = frozenset({"/clear"})
+COMPACT_COMMANDS = frozenset({"/compact"})
 
 
 def dispatch(text: str) -> str | None:
@@ -45,6 +128,7 @@ def dispatch(text: str) -> str | None:
     Returns:
         "quit"  — caller should exit the loop
         "clear" — caller should reset conversation history
+        "compact" — caller should compact conversation history
         None    — command handled, continue normally
     """
     cmd = text.lower().split()[0]
@@ -57,6 +141,9 @@ def dispatch(text: str) -> str | None:
         console.print("[dim]Conversation cleared.[/dim]")
         return "clear"
 
+    if cmd in COMPACT_COMMANDS:
+        return "compact"
+
     handler = COMMANDS.get(cmd)
     if handler:
         handler()
@@ -1,12 +1,18 @@
 """Rich Console formatting helpers."""
 
+import asyncio
 import json
 import re
+import time
+from typing import TYPE_CHECKING
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+if TYPE_CHECKING:
+    from agents import Usage
+
 console = Console()
 
 # Regex to strip chained litellm exception prefixes like
@@ -16,6 +22,9 @@ _LITELLM_PREFIX_RE = re.compile(r"^(?:(?:litellm\.\w+Error|APIConnectionError):
 # Noise suffixes to truncate at
 _NOISE_MARKERS = ("Received Chunk=", "Original exception:")
 
+# Max terminal writes per second while streaming text
+STREAM_FPS = 60
+
 
 def print_welcome() -> None:
     console.print(
@@ -51,8 +60,82 @@ def _summarize_args(args: str) -> str:
     return ""
 
 
+class _DeltaBuffer:
+    """Coalesce streamed text deltas into at most ``fps`` raw writes per second.
+
+    Deltas are appended to a buffer and written straight to the console's
+    file, bypassing Rich's render pipeline.  A newline or an elapsed frame
+    flushes immediately; otherwise a timer flushes the tail of a paused
+    stream one frame later.
+    """
+
+    def __init__(self, fps: int = STREAM_FPS):
+        self.interval = 1 / fps
+        self._parts: list[str] = []
+        self._last_flush = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def write(self, delta: str) -> None:
+        self._parts.append(delta)
+        if "\n" in delta or time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+        elif self._timer is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._timer = loop.call_later(self.interval, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._parts:
+            return
+        text = "".join(self._parts)
+        self._parts.clear()
+        console.file.write(text)
+        console.file.flush()
+        self._last_flush = time.monotonic()
+
+
+_deltas = _DeltaBuffer()
+
+
+def use_markdown(enabled: bool) -> None:
+    """Render streamed text as incremental Markdown instead of raw text."""
+    global _deltas
+    _deltas.flush()
+    if enabled:
+        # Deferred: rich.markdown pulls in markdown-it and pygments
+        from .markdown import StreamingMarkdown
+
+        _deltas = StreamingMarkdown(console)
+    else:
+        _deltas = _DeltaBuffer()
+
+
 def print_text_delta(delta: str) -> None:
-    console.print(delta, end="", highlight=False)
+    _deltas.write(delta)
+
+
+def flush_text() -> None:
+    """Write out any buffered text deltas (call before other console output)."""
+    _deltas.flush()
+
+
+def print_usage(usage: Usage) -> None:
+    """Show token usage for the last response, including prompt-cache hits."""
+    cached = usage.input_tokens_details.cached_tokens or 0
+    hit = f", {cached / usage.input_tokens:.0%} hit" if usage.input_tokens else ""
+    console.print(
+        Text(
+            f"  tokens: {usage.input_tokens:,} in ({cached:,} cached{hit}) · "
+            f"{usage.output_tokens:,} out",
+            style="dim",
+        )
+    )
 
 
 def _shorten_msg(msg: str) -> str:
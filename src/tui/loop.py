@@ -1,102 +1,56 @@
-"""Main conversation loop — streamed Agent execution."""
+"""Main conversation loop — prompt, slash commands and streamed turns.
+
+Only light modules are imported here so the prompt appears immediately;
+the agent (and the heavy SDK stack behind :mod:`.turn`) may still be
+loading in the background while the user types.
+"""
 
 import asyncio
-import os
-import sys
-import termios
-import time
-import tty
-import warnings
-
-from agents import Agent, Runner
-from agents.items import ToolCallItem
-from agents.stream_events import RawResponsesStreamEvent, RunItemStreamEvent
-from openai.types.responses import ResponseTextDeltaEvent
+from collections.abc import Awaitable
+from typing import TYPE_CHECKING
+
+from src.config import Config, get_config
+from src.session import SessionLog
 
 from .commands import dispatch
-from .console import (
-    console,
-    print_error,
-    print_text_delta,
-    print_tool_call,
-    print_welcome,
-)
+from .console import console, print_welcome, use_markdown
 from .prompt import prompt_input
 
-DOUBLE_ESC_WINDOW = 0.5  # seconds
+if TYPE_CHECKING:
+    from agents import Agent
 
 
-class _EscMonitor:
-    """Async context manager that detects double-Esc keypresses during streaming.
+async def _ready(agent: Agent | Awaitable[Agent]) -> Agent:
+    """Wait for a background-built agent, showing a spinner if it is late."""
+    if not isinstance(agent, Awaitable):
+        return agent
+    if isinstance(agent, asyncio.Future) and agent.done():
+        return agent.result()
+    with console.status("[dim]Starting up…[/dim]"):
+        return await agent
 
-    Sets the terminal to cbreak mode so individual keypresses arrive immediately,
-    then watches stdin via the event loop's reader.  Two Esc presses within
-    ``DOUBLE_ESC_WINDOW`` seconds set the ``interrupted`` flag.
-    """
 
-    def __init__(self):
-        self._last_esc: float = 0
-        self._triggered = False
-        self._fd = sys.stdin.fileno()
-        self._old_settings: list | None = None
-
-    # -- event-loop callback --------------------------------------------------
-
-    def _on_readable(self):
-        data = os.read(self._fd, 1024)
-        if data == b"\x1b":
-            now = time.monotonic()
-            if now - self._last_esc < DOUBLE_ESC_WINDOW:
-                self._triggered = True
-            self._last_esc = now
-
-    # -- context manager ------------------------------------------------------
-
-    async def __aenter__(self):
-        self._triggered = False
-        self._last_esc = 0
-        self._old_settings = termios.tcgetattr(self._fd)
-        tty.setcbreak(self._fd)
-        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
-        return self
-
-    async def __aexit__(self, *exc):
-        asyncio.get_running_loop().remove_reader(self._fd)
-        if self._old_settings is not None:
-            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._old_settings)
-
-    @property
-    def interrupted(self) -> bool:
-        return self._triggered
-
-
-def _handle_event(event: RawResponsesStreamEvent | RunItemStreamEvent) -> None:
-    """Dispatch a single stream event to the appropriate console printer."""
-    if isinstance(event, RawResponsesStreamEvent):
-        if isinstance(event.data, ResponseTextDeltaEvent):
-            print_text_delta(event.data.delta)
-        return
-
-    if not isinstance(event, RunItemStreamEvent):
-        return
-
-    if event.name != "tool_called":
-        return
-
-    item = event.item
-    if isinstance(item, ToolCallItem) and item.raw_item:
-        name = getattr(item.raw_item, "name", "") or ""
-        args = getattr(item.raw_item, "arguments", "") or ""
-        if name:
-            console.print()
-            print_tool_call(name, args)
-
-
-async def run_loop(agent: Agent) -> None:
-    """Run the interactive conversation loop."""
+async def run_loop(
+    agent: Agent | Awaitable[Agent],
+    config: Config | None = None,
+    session: SessionLog | None = None,
+) -> None:
+    """Run the interactive conversation loop.
+
+    ``agent`` may be an awaitable (e.g. a task building it in the
+    background); it is awaited the first time the agent is needed.
+    History is saved to ``session`` after every turn; if the session
+    already has history, the conversation resumes from it.
+    """
+    cfg = config or get_config()
+    use_markdown(cfg.markdown and console.is_terminal)
     print_welcome()
 
-    input_items: list = []
+    input_items: list = session.load() if session else []
+    if input_items:
+        console.print(
+            f"[dim]Resumed session {session.id} ({len(input_items)} items).[/dim]"
+        )
 
     while True:
         console.print()
@@ -117,31 +71,23 @@ async def run_loop(agent: Agent) -> None:
                 break
             if signal == "clear":
                 input_items = []
+                if session:
+                    # The old session stays on disk and can still be resumed
+                    session = SessionLog(session.path.parent)
+            if signal == "compact":
+                from .turn import compact_history
+
+                agent = await _ready(agent)
+                input_items = await compact_history(agent, input_items, cfg, force=True)
+                if session:
+                    session.sync(input_items)
             continue
 
-        input_items.append({"role": "user", "content": stripped})
+        agent = await _ready(agent)
+        from .turn import compact_history, run_turn
 
-        try:
-            # litellm returns `usage` as a plain dict while the Agents SDK
-            # expects a ResponseAPIUsage Pydantic model, causing a harmless
-            # UserWarning during serialisation.  Suppress it for the entire
-            # streaming + serialisation scope (upstream compatibility issue).
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    "ignore", category=UserWarning, module=r"pydantic\.main"
-                )
-                result = Runner.run_streamed(agent, input=input_items, max_turns=100)
-                async with _EscMonitor() as esc:
-                    async for event in result.stream_events():
-                        if esc.interrupted:
-                            break
-                        _handle_event(event)
-                console.print()
-                if esc.interrupted:
-                    console.print("[dim](interrupted)[/dim]")
-                else:
-                    input_items = result.to_input_list()
-        except KeyboardInterrupt:
-            console.print("\n[dim](interrupted)[/dim]")
-        except Exception as e:
-            print_error(e)
+        input_items.append({"role": "user", "content": stripped})
+        input_items = await compact_history(agent, input_items, cfg)
+        input_items = await run_turn(agent, input_items, cfg)
+        if session:
+            session.sync(input_items)
@@ -0,0 +1,141 @@
+"""Streaming Markdown — render finished blocks once, re-render only the tail."""
+
+import re
+
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
+from rich.markdown import Markdown
+from rich.text import Text
+
+# Live refreshes of the open trailing block per second
+LIVE_FPS = 15
+
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_HEADING_RE = re.compile(r"^ {0,3}#{1,6}(\s|$)")
+_LIST_ITEM_RE = re.compile(r"^ {0,3}([-+*]|\d{1,9}[.)])(\s|$)")
+
+
+class StreamingMarkdown:
+    """Incremental Markdown renderer for a streamed response.
+
+    Text is split into blocks that can no longer change: a paragraph or
+    list is finished by a blank line followed by an unindented line (for a
+    list, one that is not another item, so a loose list stays one block), a
+    heading by its own line end, a code fence by its closing fence.  Each
+    finished block is printed once; only the still-open trailing block is
+    redrawn, in a :class:`rich.live.Live` region refreshed at ``LIVE_FPS``.
+    Per-delta work is appending text and scanning the new lines, so cost
+    stays constant however long the answer grows.
+    """
+
+    def __init__(self, console: Console):
+        self.console = console
+        self._block: list[str] = []  # complete lines of the open block
+        self._partial = ""  # text after the last newline
+        self._fence: str | None = None  # open fence marker, e.g. "```"
+        self._fence_line = ""
+        self._blank_seen = False
+        self._in_list = False  # the open block has a list item
+        self._printed_any = False
+        self._live: Live | None = None
+
+    # -- public API -------------------------------------------------------
+
+    def write(self, delta: str) -> None:
+        text = self._partial + delta
+        *lines, self._partial = text.split("\n")
+        for line in lines:
+            self._feed_line(line)
+        self._ensure_live()
+
+    def flush(self) -> None:
+        """Finish the response: print the open block and stop the live view."""
+        if self._partial:
+            self._block.append(self._partial)
+            self._partial = ""
+        self._commit()
+        self._fence = None
+        self._blank_seen = False
+        self._printed_any = False
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+
+    # -- block splitting --------------------------------------------------
+
+    def _feed_line(self, line: str) -> None:
+        if self._fence is not None:
+            self._block.append(line)
+            if line.strip().startswith(self._fence) and not line.strip().strip(
+                self._fence[0]
+            ):
+                self._fence = None
+                self._commit()
+            return
+
+        if not line.strip():
+            self._blank_seen = True
+            self._block.append(line)
+            return
+
+        # A blank line then an unindented line ends the previous block,
+        # unless it is the next item of a loose list
+        is_item = bool(_LIST_ITEM_RE.match(line))
+        if (
+            self._blank_seen
+            and not line[0].isspace()
+            and not (self._in_list and is_item)
+        ):
+            self._commit()
+        self._blank_seen = False
+
+        if match := _FENCE_RE.match(line):
+            self._commit()
+            self._fence = match.group(1)
+            self._fence_line = line
+            self._block.append(line)
+            return
+
+        self._block.append(line)
+        self._in_list = self._in_list or is_item
+        if _HEADING_RE.match(line):
+            self._commit()
+
+    def _commit(self) -> None:
+        text = "\n".join(self._block).strip("\n")
+        self._block = []
+        self._in_list = False
+        if not text.strip():
+            return
+        # Rich already opens a list with a blank line
+        if self._printed_any and not _LIST_ITEM_RE.match(text):
+            self.console.print()
+        self.console.print(Markdown(text))
+        self._printed_any = True
+
+    # -- live tail --------------------------------------------------------
+
+    def _ensure_live(self) -> None:
+        if self._live is None and (self._block or self._partial):
+            self._live = Live(
+                get_renderable=self._render_tail,
+                console=self.console,
+                refresh_per_second=LIVE_FPS,
+                transient=True,
+            )
+            self._live.start()
+
+    def _render_tail(self) -> RenderableType:
+        lines = [*self._block, self._partial]
+        # Only the bottom of a long open block fits on screen anyway
+        limit = max(1, self.console.height - 2)
+        if len(lines) > limit:
+            lines = lines[-limit:]
+            if self._fence is not None:
+                lines = [self._fence_line, *lines[1:]]
+        text = "\n".join(lines).strip("\n")
+        if not text:
+            return Text("")
+        if self._printed_any and not _LIST_ITEM_RE.match(text):
+            return Group(Text(""), Markdown(text))
+        return Markdown(text)
@@ -0,0 +1,267 @@
+"""Streamed turn execution — run the agent and render its events.
+
+Imported lazily by :mod:`src.tui.loop` (and warmed up in the background at
+startup) because it pulls in the Agents SDK, LiteLLM and OpenAI types.
+"""
+
+import asyncio
+import os
+import sys
+import termios
+import time
+import tty
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+
+from agents import Agent, Runner
+from agents.items import MessageOutputItem, ToolCallItem
+from agents.stream_events import RawResponsesStreamEvent, RunItemStreamEvent
+from openai.types.responses import ResponseTextDeltaEvent
+
+from src.compact import compact
+from src.config import Config
+from src.connections import abort_streams
+from src.stats import StatsHooks, session_stats
+from src.tokens import estimate_items_tokens
+
+from .console import (
+    console,
+    flush_text,
+    print_error,
+    print_text_delta,
+    print_tool_call,
+    print_usage,
+)
+
+DOUBLE_ESC_WINDOW = 0.5  # seconds
+
+# Output recorded for tool calls an interruption cut short
+INTERRUPTED_OUTPUT = "Error: interrupted by the user before the tool finished"
+
+
+class _EscMonitor:
+    """Async context manager that detects double-Esc keypresses during streaming.
+
+    Sets the terminal to cbreak mode so individual keypresses arrive immediately,
+    then watches stdin via the event loop's reader.  Two Esc presses within
+    ``DOUBLE_ESC_WINDOW`` seconds set the ``interrupted`` flag and call
+    ``on_interrupt`` right away, even while no events are arriving.
+    """
+
+    def __init__(self, on_interrupt: Callable[[], None] | None = None):
+        self._on_interrupt = on_interrupt
+        self._last_esc: float = 0
+        self._triggered = False
+        self._fd = sys.stdin.fileno()
+        self._old_settings: list | None = None
+
+    # -- event-loop callback --------------------------------------------------
+
+    def _on_readable(self):
+        data = os.read(self._fd, 1024)
+        if data == b"\x1b":
+            now = time.monotonic()
+            if now - self._last_esc < DOUBLE_ESC_WINDOW and not self._triggered:
+                self._triggered = True
+                if self._on_interrupt is not None:
+                    self._on_interrupt()
+            self._last_esc = now
+
+    # -- context manager ------------------------------------------------------
+
+    async def __aenter__(self):
+        self._triggered = False
+        self._last_esc = 0
+        self._old_settings = termios.tcgetattr(self._fd)
+        tty.setcbreak(self._fd)
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+        return self
+
+    async def __aexit__(self, *exc):
+        asyncio.get_running_loop().remove_reader(self._fd)
+        if self._old_settings is not None:
+            termios.tcsetattr(self._fd, termios.TCSADRAIN, self._old_settings)
+
+    @property
+    def interrupted(self) -> bool:
+        return self._triggered
+
+
+class _Transcript:
+    """The conversation items a streamed run has produced so far.
+
+    The SDK only adds a step's items to the result once all its tools have
+    finished, so an interrupted turn is rebuilt from the stream events: the
+    completed items, the text of the response in flight, and an
+    interruption notice for each tool call left without output.
+    """
+
+    def __init__(self, input_items: list):
+        self.items = list(input_items)
+        self._partial_text = ""
+        self._step_start = len(self.items)
+
+    def on_event(self, event: object) -> None:
+        if isinstance(event, RawResponsesStreamEvent):
+            if isinstance(event.data, ResponseTextDeltaEvent):
+                self._partial_text += event.data.delta
+        elif isinstance(event, RunItemStreamEvent):
+            if isinstance(event.item, MessageOutputItem):
+                self._partial_text = ""
+            self.items.append(event.item.to_input_item())
+            # Tool calls are announced before the rest of their step
+            if event.name != "tool_called":
+                self._step_start = len(self.items)
+
+    def interrupted(self) -> list:
+        """The history to keep after an interruption."""
+        items = list(self.items)
+        if self._partial_text:
+            # The response in flight precedes the tool calls it made
+            items.insert(
+                self._step_start,
+                {"role": "assistant", "content": self._partial_text},
+            )
+        answered = {
+            item.get("call_id")
+            for item in items
+            if isinstance(item, dict) and item.get("type") == "function_call_output"
+        }
+        for item in list(items):
+            if (
+                isinstance(item, dict)
+                and item.get("type") == "function_call"
+                and item.get("call_id") not in answered
+            ):
+                items.append(
+                    {
+                        "type": "function_call_output",
+                        "call_id": item["call_id"],
+                        "output": INTERRUPTED_OUTPUT,
+                    }
+                )
+        return items
+
+
+def _handle_event(event: RawResponsesStreamEvent | RunItemStreamEvent) -> None:
+    """Dispatch a single stream event to the appropriate console printer."""
+    if isinstance(event, RawResponsesStreamEvent):
+        if isinstance(event.data, ResponseTextDeltaEvent):
+            print_text_delta(event.data.delta)
+        return
+
+    if not isinstance(event, RunItemStreamEvent):
+        return
+
+    if event.name != "tool_called":
+        return
+
+    item = event.item
+    if isinstance(item, ToolCallItem) and item.raw_item:
+        name = getattr(item.raw_item, "name", "") or ""
+        args = getattr(item.raw_item, "arguments", "") or ""
+        if name:
+            flush_text()
+            console.print()
+            print_tool_call(name, args)
+
+
+async def compact_history(
+    agent: Agent, items: list, cfg: Config, *, force: bool = False
+) -> list:
+    """Compact ``items`` to the configured budget, reporting what changed."""
+    if not force and estimate_items_tokens(items) <= cfg.context_budget:
+        return items
+
+    try:
+        with console.status("[dim]Compacting conversation…[/dim]"):
+            result = await compact(
+                agent,
+                items,
+                budget=cfg.context_budget,
+                keep_turns=cfg.keep_recent_turns,
+                force=force,
+            )
+    except Exception as e:
+        print_error(e)
+        return items
+
+    if result.changed:
+        how = "summarized" if result.summarized else "elided old tool output"
+        console.print(
+            f"[dim](context compacted: ~{result.before:,} → ~{result.after:,} "
+            f"tokens, {how})[/dim]"
+        )
+    elif force:
+        console.print("[dim]Nothing to compact.[/dim]")
+    return result.items
+
+
+async def run_turn(agent: Agent, input_items: list, cfg: Config) -> list:
+    """Stream one agent run and return the updated conversation history.
+
+    An interruption cancels the model request and running tools at once,
+    and the history keeps what the turn produced so far, so the next turn
+    does not redo it.  On error the history is returned unchanged.
+    """
+    if cfg.stats_file:
+        session_stats.sink = Path(cfg.stats_file)
+
+    turn = session_stats.start_turn()
+    interrupted = False
+    transcript = _Transcript(input_items)
+    result = None
+
+    def stop() -> None:
+        # Cancelling the run cancels its tool tasks; the provider stream
+        # stays open until it is closed explicitly
+        if result is not None:
+            result.cancel()
+        abort_streams()
+
+    try:
+        # litellm returns `usage` as a plain dict while the Agents SDK
+        # expects a ResponseAPIUsage Pydantic model, causing a harmless
+        # UserWarning during serialisation.  Suppress it for the entire
+        # streaming + serialisation scope (upstream compatibility issue).
+        with warnings.catch_warnings():
+            warnings.filterwarnings(
+                "ignore", category=UserWarning, module=r"pydantic\.main"
+            )
+            result = Runner.run_streamed(
+                agent, input=input_items, max_turns=100, hooks=_hooks
+            )
+            async with _EscMonitor(stop) as esc:
+                async for event in result.stream_events():
+                    if esc.interrupted:
+                        break
+                    transcript.on_event(event)
+                    session_stats.on_stream_event(event)
+                    started = time.perf_counter()
+                    _handle_event(event)
+                    turn.render_time += time.perf_counter() - started
+            flush_text()
+            console.print()
+            interrupted = esc.interrupted
+            if esc.interrupted:
+                input_items = transcript.interrupted()
+                console.print("[dim](interrupted)[/dim]")
+            else:
+                input_items = result.to_input_list()
+                print_usage(result.context_wrapper.usage)
+    except KeyboardInterrupt:
+        stop()
+        interrupted = True
+        input_items = transcript.interrupted()
+        flush_text()
+        console.print("\n[dim](interrupted)[/dim]")
+    except Exception as e:
+        flush_text()
+        print_error(e)
+    finally:
+        session_stats.end_turn(interrupted=interrupted)
+    return input_items
+
+
+_hooks = StatsHooks(session_stats)
@@ -18,5 +18,36 @@ def _clean_config(monkeypatch: pytest.MonkeyPatch):
         "BASE_URL",
         "TEMPERATURE",
         "MAX_TOKENS",
+        "PERSISTENT_SHELL",
+        "BASH_CPU_SECONDS",
+        "BASH_MEMORY_MB",
+        "BASH_MAX_PROCESSES",
+        "BASH_MAX_OUTPUT_MB",
+        "TOOL_CONCURRENCY",
+        "SUBAGENT_CONCURRENCY",
+        "CONTEXT_BUDGET",
+        "KEEP_RECENT_TURNS",
+        "PROMPT_CACHE",
+        "STATS_FILE",
+        "MARKDOWN",
+        "SAVE_SESSIONS",
+        "SESSIONS_DIR",
+        "LLM_CACHE",
+        "LLM_CACHE_DIR",
+        "LLM_CACHE_MAX_MB",
+        "MODEL_RETRIES",
+        "FALLBACK_PROVIDER",
+        "FALLBACK_MODEL",
+        "FALLBACK_API_KEY",
+        "FALLBACK_BASE_URL",
+        "HEDGE_AFTER_MS",
     ):
         monkeypatch.delenv(key, raising=False)
+
+
+@pytest.fixture(autouse=True)
+def _clean_file_cache():
+    """Start every test with an empty shared file cache."""
+    from src.tools.cache import file_cache
+
+    file_cache.clear()
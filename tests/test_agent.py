@@ -16,10 +16,20 @@ def agent():
 class TestCreateAgent:
     def test_name_and_tools(self, agent):
         assert agent.name == "they"
-        assert len(agent.tools) == 4
+        assert len(agent.tools) == 9
 
     def test_instructions_reference_all_tools(self, agent):
-        for name in ("read_tool", "write_tool", "edit_tool", "bash_tool"):
+        for name in (
+            "read_tool",
+            "write_tool",
+            "edit_tool",
+            "multi_edit_tool",
+            "grep_tool",
+            "glob_tool",
+            "bash_tool",
+            "more_tool",
+            "subagents_tool",
+        ):
             assert name in agent.instructions
 
     def test_model_settings(self):
@@ -34,3 +44,59 @@ class TestCreateAgent:
         )
         assert agent.model_settings.temperature == 0.3
         assert agent.model_settings.max_tokens == 1024
+
+    def test_persistent_shell_swaps_bash_tool(self):
+        from src.tools import bash_tool
+
+        agent = create_agent(
+            Config(
+                provider="openrouter",
+                api_key="test",
+                model="test-model",
+                persistent_shell=True,
+            )
+        )
+        bash = next(t for t in agent.tools if t.name == "bash_tool")
+        assert bash is not bash_tool
+        assert hasattr(bash, "session")
+
+    def test_prompt_cache_for_anthropic(self):
+        agent = create_agent(
+            Config(
+                provider="openrouter",
+                api_key="test",
+                model="anthropic/claude-sonnet-4",
+            )
+        )
+        points = agent.model_settings.extra_args["cache_control_injection_points"]
+        assert {"location": "message", "role": "system"} in points
+
+    def test_prompt_cache_skipped_for_automatic_providers(self, agent):
+        assert "cache_control_injection_points" not in agent.model_settings.extra_args
+
+    def test_prompt_cache_disabled(self):
+        agent = create_agent(
+            Config(
+                provider="anthropic",
+                api_key="test",
+                model="claude-sonnet-4-20250514",
+                prompt_cache=False,
+            )
+        )
+        assert "cache_control_injection_points" not in agent.model_settings.extra_args
+
+    def test_llm_cache_wraps_model(self, agent, tmp_path):
+        from src.llm_cache import CachingModel
+
+        assert not isinstance(agent.model, CachingModel)
+        cached = create_agent(
+            Config(
+                provider="openrouter",
+                api_key="test",
+                model="test-model",
+                llm_cache="replay",
+                llm_cache_dir=str(tmp_path),
+            )
+        )
+        assert isinstance(cached.model, CachingModel)
+        assert cached.model.cache.directory == tmp_path
@@ -0,0 +1,89 @@
+"""Tests for the benchmark suite, scripted model and mock model server."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from benchmarks.suite import bench_loop, compare
+
+
+class TestCompare:
+    def test_direction_follows_unit(self):
+        rows = compare(
+            {"a.read_ms": 10.0, "b.rate_per_s": 100.0, "c.peak_mb": 5.0},
+            {"a.read_ms": 14.0, "b.rate_per_s": 70.0, "c.peak_mb": 5.5},
+            threshold=0.25,
+        )
+        regressed = {name for name, *_, flag in rows if flag}
+        assert regressed == {"a.read_ms", "b.rate_per_s"}
+
+    def test_sub_millisecond_jitter_ignored(self):
+        rows = compare({"a_ms": 0.2}, {"a_ms": 0.6})
+        assert not rows[0][-1]
+
+    def test_improvements_and_new_metrics_ignored(self):
+        rows = compare({"a_ms": 10.0}, {"a_ms": 2.0, "new_ms": 1.0})
+        assert [(name, flag) for name, *_, flag in rows] == [("a_ms", False)]
+
+
+class TestScriptedLoop:
+    def test_loop_benchmark_runs_offline(self, tmp_path: Path):
+        import main
+
+        main._configure()
+        metrics = asyncio.run(bench_loop(tmp_path, quick=True))
+        assert metrics["loop.turn_raw_ms"] > 0
+        assert metrics["loop.render_markdown_ms"] > 0
+
+
+class TestMockServer:
+    SCRIPT = {
+        "responses": [
+            {"tool_calls": [{"name": "bash_tool", "arguments": {"command": "ls"}}]},
+            {"text": "all done"},
+            {"error": {"status": 400, "message": "scripted failure"}},
+        ]
+    }
+
+    def _client(self, server):
+        from openai import OpenAI
+
+        return OpenAI(base_url=server.base_url, api_key="mock", max_retries=0)
+
+    def test_plays_script_by_conversation_step(self):
+        from benchmarks.mock_server import MockServer
+
+        with MockServer(self.SCRIPT) as server:
+            client = self._client(server)
+            first = client.chat.completions.create(
+                model="mock", messages=[{"role": "user", "content": "hi"}]
+            )
+            call = first.choices[0].message.tool_calls[0]
+            assert call.function.name == "bash_tool"
+
+            stream = client.chat.completions.create(
+                model="mock",
+                stream=True,
+                messages=[
+                    {"role": "user", "content": "hi"},
+                    {"role": "assistant", "content": "", "tool_calls": [call]},
+                    {"role": "tool", "tool_call_id": call.id, "content": "out"},
+                ],
+            )
+            text = "".join(
+                c.choices[0].delta.content or "" for c in stream if c.choices
+            )
+            assert text == "all done"
+
+    def test_scripted_error(self):
+        import openai
+
+        from benchmarks.mock_server import MockServer
+
+        with MockServer(self.SCRIPT) as server:
+            with pytest.raises(openai.BadRequestError, match="scripted failure"):
+                self._client(server).chat.completions.create(
+                    model="mock",
+                    messages=[{"role": "assistant", "content": "x"}] * 2,
+                )
@@ -0,0 +1,112 @@
+"""Tests for conversation compaction."""
+
+import pytest
+
+from src import compact as compact_module
+from src.compact import SUMMARY_PREFIX, compact, split_turns
+
+
+def _turn(n: int, output_chars: int = 1000) -> list:
+    return [
+        {"role": "user", "content": f"question {n}"},
+        {
+            "type": "function_call",
+            "call_id": f"c{n}",
+            "name": "read_tool",
+            "arguments": "{}",
+        },
+        {
+            "type": "function_call_output",
+            "call_id": f"c{n}",
+            "output": "x" * output_chars,
+        },
+        {
+            "type": "message",
+            "role": "assistant",
+            "content": [{"type": "output_text", "text": f"answer {n}"}],
+        },
+    ]
+
+
+def _history(turns: int) -> list:
+    return [item for n in range(turns) for item in _turn(n)]
+
+
+@pytest.fixture
+def fake_summary(monkeypatch: pytest.MonkeyPatch) -> list:
+    calls: list = []
+
+    async def summarize(agent, items):
+        calls.append(items)
+        return "- earlier work"
+
+    monkeypatch.setattr(compact_module, "summarize", summarize)
+    return calls
+
+
+class TestCompact:
+    def test_split_turns(self):
+        turns = split_turns(_history(3))
+        assert len(turns) == 3
+        assert all(t[0]["role"] == "user" for t in turns)
+
+    async def test_under_budget_unchanged(self, fake_summary):
+        items = _history(3)
+        result = await compact(None, items, budget=10_000, keep_turns=2)
+        assert result.items is items
+        assert not result.changed
+        assert not fake_summary
+
+    async def test_elides_old_tool_outputs_first(self, fake_summary):
+        items = _history(6)
+        result = await compact(None, items, budget=1000, keep_turns=2)
+
+        assert result.changed and not result.summarized
+        outputs = [i["output"] for i in result.items if "output" in i]
+        assert all(o.startswith("[elided") for o in outputs[:4])
+        assert outputs[4:] == ["x" * 1000, "x" * 1000]
+        assert not fake_summary
+
+    async def test_summarizes_when_elision_not_enough(self, fake_summary):
+        items = _history(6)
+        result = await compact(None, items, budget=900, keep_turns=2)
+
+        assert result.summarized
+        assert result.items[0]["content"].startswith(SUMMARY_PREFIX)
+        assert result.items[1:] == items[-8:]
+        assert len(fake_summary) == 1
+
+    async def test_oversized_recent_turns_are_trimmed(self, fake_summary):
+        items = _history(6)
+        result = await compact(None, items, budget=500, keep_turns=4)
+
+        assert result.summarized
+        assert result.items[1:] == items[-4:]
+        assert result.after <= 500
+        assert len(fake_summary) == 1
+
+    async def test_newest_turn_kept_with_zero_keep_turns(self, fake_summary):
+        items = _history(3)
+        result = await compact(None, items, budget=10**9, keep_turns=0, force=True)
+
+        assert result.summarized
+        assert result.items[1:] == items[-4:]
+        assert len(fake_summary) == 1
+
+    async def test_lone_summary_not_resummarized(self, fake_summary):
+        items = [
+            {"role": "user", "content": f"{SUMMARY_PREFIX}\n- earlier work"},
+            *_turn(1, output_chars=4000),
+        ]
+        result = await compact(None, items, budget=500, keep_turns=4)
+
+        assert not result.summarized
+        assert result.items == items
+        assert not fake_summary
+
+    async def test_force_summarizes_under_budget(self, fake_summary):
+        items = _history(3)
+        result = await compact(None, items, budget=10**9, keep_turns=1, force=True)
+
+        assert result.summarized
+        assert result.items[1:] == items[-4:]
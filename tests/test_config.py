@@ -35,6 +35,39 @@ class TestConfig:
         assert config.temperature is None
         assert config.max_tokens is None
         assert config.base_url is None
+        assert config.persistent_shell is False
+
+    def test_from_env_persistent_shell(self, tmp_path: Path):
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "PROVIDER=openrouter\nAPI_KEY=sk-test\nMODEL=test/model\n"
+            "PERSISTENT_SHELL=true\n"
+        )
+
+        config = Config.from_env(env_file)
+        assert config.persistent_shell is True
+
+    def test_from_env_bash_limits(self, tmp_path: Path):
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "PROVIDER=openrouter\nAPI_KEY=sk-test\nMODEL=test/model\n"
+            "BASH_CPU_SECONDS=60\nBASH_MEMORY_MB=2048\nBASH_MAX_OUTPUT_MB=64\n"
+        )
+
+        config = Config.from_env(env_file)
+        assert config.bash_cpu_seconds == 60
+        assert config.bash_memory_mb == 2048
+        assert config.bash_max_processes == 0
+        assert config.bash_max_output_mb == 64
+
+    def test_from_env_llm_cache_mode(self, tmp_path: Path):
+        env_file = tmp_path / ".env"
+        env_file.write_text(
+            "PROVIDER=openrouter\nAPI_KEY=sk-test\nMODEL=test/model\nLLM_CACHE=bogus\n"
+        )
+
+        with pytest.raises(ValueError, match="LLM_CACHE"):
+            Config.from_env(env_file)
 
     def test_from_env_with_base_url(self, tmp_path: Path):
         env_file = tmp_path / ".env"
@@ -0,0 +1,103 @@
+"""Tests for the shared, pre-warmed HTTP connection pool."""
+
+import asyncio
+import copy
+
+from src import connections
+from src.config import Config
+
+
+class TestEndpoints:
+    def test_provider_origin(self):
+        cfg = Config(provider="anthropic", api_key="k", model="m")
+        assert connections.endpoints(cfg) == ["https://api.anthropic.com"]
+
+    def test_base_url_wins(self):
+        cfg = Config(
+            provider="openai",
+            api_key="k",
+            model="m",
+            base_url="http://localhost:8080/v1",
+        )
+        assert connections.endpoints(cfg) == ["http://localhost:8080"]
+
+    def test_fallback_added_once(self):
+        cfg = Config(
+            provider="openai",
+            api_key="k",
+            model="m",
+            fallback_provider="anthropic",
+            fallback_model="claude-haiku",
+        )
+        assert connections.endpoints(cfg) == [
+            "https://api.openai.com",
+            "https://api.anthropic.com",
+        ]
+        same = Config(provider="openai", api_key="k", model="m", fallback_model="mini")
+        assert connections.endpoints(same) == ["https://api.openai.com"]
+
+    def test_unknown_provider(self):
+        cfg = Config(provider="custom", api_key="k", model="m")
+        assert connections.endpoints(cfg) == []
+
+
+class TestSharedSession:
+    def test_survives_model_settings_copy(self):
+        from agents import ModelSettings
+
+        shared = connections.shared_session
+        assert copy.deepcopy(shared) is shared
+        settings = ModelSettings(extra_args={"shared_session": shared})
+        assert settings.to_json_dict()["extra_args"]["shared_session"] is shared
+
+    def test_one_session_per_loop(self):
+        async def use():
+            session = connections.shared_session()
+            assert connections.shared_session() is session
+            await connections.close()
+            assert session.closed
+            return session
+
+        assert asyncio.run(use()) is not asyncio.run(use())
+
+
+class TestPrewarm:
+    def test_model_request_reuses_warm_connection(self):
+        from agents import Runner
+
+        from benchmarks.mock_server import MockServer
+        from src.agent import create_agent
+
+        async def run(server: MockServer) -> str:
+            cfg = Config(
+                provider="openai",
+                api_key="k",
+                model="mock",
+                base_url=server.base_url,
+                model_retries=0,
+            )
+            try:
+                await connections.prewarm(connections.endpoints(cfg))
+                assert server.connections == 1
+                agent = create_agent(cfg)
+                streamed = Runner.run_streamed(agent, "hi")
+                async for _ in streamed.stream_events():
+                    pass
+                assert streamed.final_output == "hello"
+                result = await Runner.run(agent, "hi")
+                return result.final_output
+            finally:
+                await connections.close()
+
+        with MockServer({"responses": [{"text": "hello"}]}) as server:
+            assert asyncio.run(run(server)) == "hello"
+            assert server.connections == 1
+
+    def test_unreachable_origin_is_ignored(self):
+        async def run():
+            try:
+                await connections.prewarm(["http://127.0.0.1:9"])
+            finally:
+                await connections.close()
+
+        asyncio.run(run())
@@ -0,0 +1,88 @@
+"""Tests for headless one-shot and batch runs."""
+
+import asyncio
+import io
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+from agents import Runner, Usage
+
+from src.headless import run_batch, run_prompt
+
+
+def _fake_runner(monkeypatch: pytest.MonkeyPatch, delay: float = 0.0) -> dict:
+    state = {"running": 0, "peak": 0}
+
+    async def fake_run(agent, input, max_turns):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(delay)
+            if input == "boom":
+                raise RuntimeError("model down")
+            return SimpleNamespace(
+                final_output=input.upper(),
+                context_wrapper=SimpleNamespace(
+                    usage=Usage(requests=1, input_tokens=10, output_tokens=2)
+                ),
+            )
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(Runner, "run", fake_run)
+    return state
+
+
+class TestHeadless:
+    def test_run_prompt(self, monkeypatch: pytest.MonkeyPatch):
+        _fake_runner(monkeypatch)
+        assert asyncio.run(run_prompt(None, "hi")) == "HI"
+
+    def test_batch_respects_concurrency(self, monkeypatch: pytest.MonkeyPatch):
+        state = _fake_runner(monkeypatch, delay=0.01)
+        lines = [json.dumps({"id": f"t{i}", "prompt": "x"}) for i in range(10)]
+        out = io.StringIO()
+
+        failed = asyncio.run(run_batch(None, lines, out, concurrency=3))
+
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert failed == 0
+        assert state["peak"] == 3
+        assert sorted(r["id"] for r in results) == sorted(f"t{i}" for i in range(10))
+        assert all(r["output"] == "X" and r["input_tokens"] == 10 for r in results)
+        assert all(r["duration"] > 0 for r in results)
+
+    def test_batch_reports_failures(self, monkeypatch: pytest.MonkeyPatch):
+        _fake_runner(monkeypatch)
+        lines = ['"ok"', "", '{"prompt": "boom"}', "not json", '{"id": 7}']
+        out = io.StringIO()
+
+        failed = asyncio.run(run_batch(None, lines, out, concurrency=2))
+
+        results = {r["id"]: r for r in map(json.loads, out.getvalue().splitlines())}
+        assert failed == 3
+        assert results[1]["output"] == "OK"
+        assert results[3]["error"] == "RuntimeError: model down"
+        assert results[4]["error"].startswith("invalid task")
+        assert results[7]["error"].startswith("invalid task")
+
+    def test_batch_runs_while_waiting_for_input(self, monkeypatch: pytest.MonkeyPatch):
+        _fake_runner(monkeypatch)
+        out = io.StringIO()
+
+        def slow_lines():
+            # Like stdin: the next line only comes after the first result
+            yield '"first"'
+            deadline = time.monotonic() + 2
+            while not out.getvalue() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            seen.append(out.getvalue())
+            yield '"second"'
+
+        seen: list[str] = []
+        asyncio.run(run_batch(None, slow_lines(), out, concurrency=2))
+
+        assert json.loads(seen[0])["output"] == "FIRST"
+        assert len(out.getvalue().splitlines()) == 2
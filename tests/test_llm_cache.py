@@ -0,0 +1,96 @@
+"""Tests for the LLM response cache."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+from agents import ModelSettings, ModelTracing
+from agents.extensions.models.litellm_model import LitellmModel
+
+from src.llm_cache import CacheMissError, CachingModel, ResponseCache
+
+
+def _model(tmp_path: Path, mode: str, **kwargs) -> CachingModel:
+    return CachingModel(
+        LitellmModel(model="openai/gpt-4o", api_key="test"),
+        ResponseCache(tmp_path, **{"max_bytes": 1 << 20, **kwargs}),
+        mode=mode,
+        name="openai/gpt-4o",
+    )
+
+
+def _stream(model: CachingModel, answer: str, prompt: str = "hi") -> list:
+    async def collect():
+        settings = ModelSettings(extra_args={"mock_response": answer})
+        return [
+            event
+            async for event in model.stream_response(
+                "system",
+                prompt,
+                settings,
+                [],
+                None,
+                [],
+                ModelTracing.DISABLED,
+                previous_response_id=None,
+                conversation_id=None,
+                prompt=None,
+            )
+        ]
+
+    return asyncio.run(collect())
+
+
+def _text(events: list) -> str:
+    return "".join(e.delta for e in events if e.type == "response.output_text.delta")
+
+
+class TestCachingModel:
+    def test_record_then_replay_same_events(self, tmp_path: Path):
+        recorded = _stream(_model(tmp_path, "record"), "hello there")
+        replayed = _stream(_model(tmp_path, "replay"), "hello there")
+
+        assert _text(replayed) == "hello there"
+        assert [e.model_dump() for e in replayed] == [e.model_dump() for e in recorded]
+
+    def test_replay_miss_raises(self, tmp_path: Path):
+        _stream(_model(tmp_path, "record"), "hello", prompt="one")
+        with pytest.raises(CacheMissError):
+            _stream(_model(tmp_path, "replay"), "hello", prompt="two")
+
+    def test_passthrough_neither_reads_nor_writes(self, tmp_path: Path):
+        _stream(_model(tmp_path, "passthrough"), "hello")
+        assert not list(tmp_path.iterdir())
+
+    def test_get_response_round_trip(self, tmp_path: Path):
+        async def ask(mode: str):
+            return await _model(tmp_path, mode).get_response(
+                "system",
+                "hi",
+                ModelSettings(extra_args={"mock_response": "cached"}),
+                [],
+                None,
+                [],
+                ModelTracing.DISABLED,
+                previous_response_id=None,
+                conversation_id=None,
+                prompt=None,
+            )
+
+        live = asyncio.run(ask("record"))
+        replayed = asyncio.run(ask("replay"))
+        assert replayed.output == live.output
+        assert replayed.usage.output_tokens == live.usage.output_tokens
+
+
+class TestResponseCache:
+    def test_evicts_least_recently_used(self, tmp_path: Path):
+        cache = ResponseCache(tmp_path, max_bytes=350)
+        for n, key in enumerate(("a", "b", "c"), 1):
+            cache.put(key, "x" * 100)
+            os.utime(tmp_path / f"{key}.json", ns=(n, n))
+        cache.get("a")  # refreshes a, leaving b the oldest
+        cache.put("d", "x" * 100)
+
+        assert {p.stem for p in tmp_path.glob("*.json")} == {"a", "c", "d"}
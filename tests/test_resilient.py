@@ -0,0 +1,199 @@
+"""Tests for model retries and hedged fallback."""
+
+import asyncio
+
+import pytest
+from agents import Model, ModelSettings, ModelTracing
+
+from src import resilient
+from src.resilient import ResilientModel
+from src.stats import SessionStats
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class _FakeModel(Model):
+    """Streams ``events`` after ``delay`` seconds, raising ``errors`` first."""
+
+    def __init__(self, events=("a", "b"), delay=0.0, errors=(), fail_after=None):
+        self.events = list(events)
+        self.delay = delay
+        self.errors = list(errors)
+        self.fail_after = fail_after
+        self.calls = 0
+        self.cancelled = False
+
+    async def get_response(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.events
+
+    async def stream_response(self, *args, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.errors:
+                raise self.errors.pop(0)
+            for i, event in enumerate(self.events):
+                if i == self.fail_after:
+                    raise _StatusError(503)
+                yield event
+                await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+_ARGS = ("system", "hi", ModelSettings(), [], None, [], ModelTracing.DISABLED)
+_KWARGS = {"previous_response_id": None, "conversation_id": None, "prompt": None}
+
+
+def _stream(model: Model) -> list:
+    async def collect():
+        return [e async for e in model.stream_response(*_ARGS, **_KWARGS)]
+
+    return asyncio.run(collect())
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(resilient, "RETRY_BASE_DELAY", 0.0)
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    stats = SessionStats()
+    monkeypatch.setattr(resilient, "session_stats", stats)
+    return stats
+
+
+class TestRetries:
+    def test_retries_transient_errors(self, stats):
+        primary = _FakeModel(errors=[_StatusError(429), ConnectionError()])
+
+        assert _stream(ResilientModel(primary, retries=2)) == ["a", "b"]
+        assert primary.calls == 3
+        assert stats.retries == 2
+
+    def test_gives_up_after_retries(self):
+        primary = _FakeModel(errors=[_StatusError(503)] * 3)
+
+        with pytest.raises(_StatusError):
+            _stream(ResilientModel(primary, retries=1))
+        assert primary.calls == 2
+
+    def test_client_errors_are_not_retried(self):
+        primary = _FakeModel(errors=[_StatusError(400)])
+
+        with pytest.raises(_StatusError):
+            _stream(ResilientModel(primary, retries=3))
+        assert primary.calls == 1
+
+    def test_no_retry_once_output_started(self):
+        primary = _FakeModel(fail_after=1)
+
+        async def collect(seen: list):
+            async for event in ResilientModel(primary).stream_response(
+                *_ARGS, **_KWARGS
+            ):
+                seen.append(event)
+
+        seen: list = []
+        with pytest.raises(_StatusError):
+            asyncio.run(collect(seen))
+        assert seen == ["a"]
+        assert primary.calls == 1
+
+    def test_get_response_retries(self):
+        primary = _FakeModel(errors=[TimeoutError()])
+        model = ResilientModel(primary, retries=1)
+
+        response = asyncio.run(model.get_response(*_ARGS, **_KWARGS))
+        assert response == ["a", "b"]
+        assert primary.calls == 2
+
+
+class TestHedging:
+    def test_fallback_wins_when_primary_is_slow(self, stats):
+        primary = _FakeModel(events=["slow"], delay=5)
+        fallback = _FakeModel(events=["fast"])
+        model = ResilientModel(primary, fallback, hedge_after=0.05)
+
+        assert _stream(model) == ["fast"]
+        assert primary.cancelled
+        assert stats.resilience()["hedges won"] == 1
+
+    def test_primary_wins_after_hedge_started(self, stats):
+        primary = _FakeModel(events=["primary"], delay=0.1)
+        fallback = _FakeModel(events=["fallback"], delay=5)
+        model = ResilientModel(primary, fallback, hedge_after=0.02)
+
+        assert _stream(model) == ["primary"]
+        assert fallback.calls == 1
+        assert fallback.cancelled
+        assert stats.resilience()["hedges lost"] == 1
+
+    def test_no_hedge_when_primary_is_fast(self, stats):
+        fallback = _FakeModel()
+        model = ResilientModel(_FakeModel(), fallback, hedge_after=1)
+
+        assert _stream(model) == ["a", "b"]
+        assert fallback.calls == 0
+        assert not any(stats.resilience().values())
+
+    def test_failover_on_primary_error(self):
+        primary = _FakeModel(errors=[_StatusError(502)])
+        fallback = _FakeModel(events=["fallback"])
+        model = ResilientModel(primary, fallback, retries=0, hedge_after=60)
+
+        assert _stream(model) == ["fallback"]
+
+    def test_counted_session_wide_outside_turns(self, stats):
+        # A sub-agent's requests have no turn model call to be credited to
+        stats.start_turn()
+        stats.model_started()
+        retried = ResilientModel(_FakeModel(errors=[_StatusError(503)]), retries=1)
+        primary = _FakeModel(events=["slow"], delay=5)
+        hedged = ResilientModel(primary, _FakeModel(), hedge_after=0.05)
+
+        assert _stream(retried) == _stream(hedged) == ["a", "b"]
+        assert stats.resilience() == {"retries": 1, "hedges won": 1, "hedges lost": 0}
+        stats.end_turn()
+        assert "retries" not in stats.turns[0].to_dict()["model_calls"][0]
+
+
+class TestResilientModelConfig:
+    def test_wrapping(self):
+        from agents.extensions.models.litellm_model import LitellmModel
+
+        from src.config import Config
+        from src.resilient import resilient_model
+
+        base = Config(provider="openai", api_key="key", model="gpt-4o")
+        primary = LitellmModel(model="openai/gpt-4o", api_key="key")
+
+        assert resilient_model(primary, base, LitellmModel) is not primary
+        off = Config(provider="openai", api_key="key", model="gpt-4o", model_retries=0)
+        assert resilient_model(primary, off, LitellmModel) is primary
+
+        hedged = resilient_model(
+            primary,
+            Config(
+                provider="openai",
+                api_key="key",
+                model="gpt-4o",
+                fallback_provider="anthropic",
+                fallback_model="claude-haiku",
+                hedge_after_ms=1500,
+            ),
+            LitellmModel,
+        )
+        assert hedged.fallback.model == "anthropic/claude-haiku"
+        assert hedged.fallback.api_key == "key"
+        assert hedged.hedge_after == 1.5
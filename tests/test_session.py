@@ -0,0 +1,100 @@
+"""Tests for session persistence."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.session import (
+    BLOB_MIN_CHARS,
+    SessionLog,
+    list_sessions,
+    open_session,
+)
+
+
+def _turn(prompt: str, output: str = "ok") -> list[dict]:
+    return [
+        {"role": "user", "content": prompt},
+        {"type": "function_call", "call_id": prompt, "name": "read_tool"},
+        {"type": "function_call_output", "call_id": prompt, "output": output},
+    ]
+
+
+class TestSessionLog:
+    def test_appends_only_new_items(self, tmp_path: Path):
+        log = SessionLog(tmp_path)
+        items = _turn("first")
+        log.sync(items)
+        # A copied history (as the SDK returns) is still an extension
+        items = [dict(i) for i in items] + _turn("second")
+        log.sync(items)
+        log.sync(items)
+
+        lines = (log.path / "log.jsonl").read_text().splitlines()
+        assert len(lines) == 6
+        assert SessionLog(tmp_path, log.id).load() == items
+
+    def test_rewrite_appends_reset(self, tmp_path: Path):
+        log = SessionLog(tmp_path)
+        log.sync(_turn("first") + _turn("second"))
+        compacted = [{"role": "user", "content": "summary"}, *_turn("second")]
+        log.sync(compacted)
+
+        meta = json.loads((log.path / "meta.json").read_text())
+        assert meta["offset"] > 0
+        assert meta["title"] == "first"
+        assert SessionLog(tmp_path, log.id).load() == compacted
+
+    def test_resumed_log_keeps_appending(self, tmp_path: Path):
+        log = SessionLog(tmp_path)
+        log.sync(_turn("first"))
+
+        resumed = SessionLog(tmp_path, log.id)
+        items = resumed.load() + _turn("second")
+        resumed.sync(items)
+
+        assert b"$reset" not in (log.path / "log.jsonl").read_bytes()
+        assert SessionLog(tmp_path, log.id).load() == items
+
+    def test_large_outputs_stored_as_blobs(self, tmp_path: Path):
+        big = "x" * BLOB_MIN_CHARS
+        log = SessionLog(tmp_path)
+        items = _turn("first", output=big)
+        log.sync(items)
+
+        assert big not in (log.path / "log.jsonl").read_text()
+        assert len(list((log.path / "blobs").iterdir())) == 1
+        assert SessionLog(tmp_path, log.id).load() == items
+
+    def test_torn_final_line_ignored(self, tmp_path: Path):
+        log = SessionLog(tmp_path)
+        items = _turn("first")
+        log.sync(items)
+        with (log.path / "log.jsonl").open("a") as f:
+            f.write('{"role": "us')
+
+        assert SessionLog(tmp_path, log.id).load() == items
+
+
+class TestOpenSession:
+    def test_latest_and_prefix(self, tmp_path: Path):
+        old = SessionLog(tmp_path, "20260101-000000-aaaa")
+        old.sync(_turn("old"))
+        new = SessionLog(tmp_path, "20260102-000000-bbbb")
+        new.sync(_turn("new"))
+
+        assert [s.title for s in list_sessions(tmp_path)] == ["new", "old"]
+        assert open_session(tmp_path).id == new.id
+        assert open_session(tmp_path, "20260101").id == old.id
+
+    def test_errors(self, tmp_path: Path):
+        with pytest.raises(ValueError, match="No saved sessions"):
+            open_session(tmp_path)
+
+        SessionLog(tmp_path, "2026-a").sync(_turn("a"))
+        SessionLog(tmp_path, "2026-b").sync(_turn("b"))
+        with pytest.raises(ValueError, match="ambiguous"):
+            open_session(tmp_path, "2026")
+        with pytest.raises(ValueError, match="No saved session matching"):
+            open_session(tmp_path, "1999")
@@ -0,0 +1,50 @@
+"""Startup regression tests — the prompt must not wait on heavy imports."""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that must only load in the background after the prompt appears
+HEAVY_MODULES = ("litellm", "agents", "openai")
+
+# Generous ceiling for importing the prompt path in a fresh interpreter
+MAX_PROMPT_PATH_SECONDS = 2.0
+
+_PROMPT_PATH = "import main, src.config, src.tui"
+
+
+def _run(code: str) -> str:
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return proc.stdout.strip()
+
+
+class TestStartup:
+    def test_prompt_path_skips_heavy_imports(self):
+        loaded = _run(
+            f"import sys; {_PROMPT_PATH}; "
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert loaded == ""
+
+    def test_prompt_path_import_time(self):
+        started = time.perf_counter()
+        _run(_PROMPT_PATH)
+        assert time.perf_counter() - started < MAX_PROMPT_PATH_SECONDS
+
+    def test_build_agent_in_background(self):
+        import main
+        from src.config import Config
+
+        agent = main._build_agent(
+            Config(provider="openrouter", api_key="test", model="test-model")
+        )
+        assert agent.name == "they"
@@ -0,0 +1,85 @@
+"""Tests for session statistics."""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from agents import Usage
+from agents.stream_events import RawResponsesStreamEvent
+from openai.types.responses import ResponseTextDeltaEvent
+
+from src.stats import SessionStats, percentile
+
+
+def _delta(text: str) -> RawResponsesStreamEvent:
+    return RawResponsesStreamEvent(
+        data=ResponseTextDeltaEvent.model_construct(
+            type="response.output_text.delta", delta=text
+        )
+    )
+
+
+def _response(input_tokens: int, output_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        usage=Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+    )
+
+
+class TestSessionStats:
+    def test_records_model_and_tool_calls(self):
+        stats = SessionStats()
+        stats.start_turn()
+        stats.model_started()
+        stats.on_stream_event(_delta("hello "))
+        stats.on_stream_event(_delta("world"))
+        stats.model_ended(_response(100, 10))
+        stats.tool_started("call_1", "bash_tool")
+        stats.tool_ended("call_1", "x" * 42)
+        stats.end_turn()
+
+        turn = stats.turns[0]
+        call = turn.model_calls[0]
+        assert call.ttft is not None
+        assert call.text_chars == 11
+        assert (call.input_tokens, call.output_tokens) == (100, 10)
+        assert turn.tool_calls[0].name == "bash_tool"
+        assert turn.tool_calls[0].output_chars == 42
+
+        samples = stats.summary()
+        assert len(samples["time to first token (s)"]) == 1
+        assert samples["bash_tool output chars"] == [42]
+
+    def test_events_outside_turn_ignored(self):
+        stats = SessionStats()
+        stats.on_stream_event(_delta("stray"))
+        stats.tool_ended("nope", "")
+        stats.end_turn()
+        assert stats.turns == []
+
+    def test_jsonl_sink(self, tmp_path: Path):
+        sink = tmp_path / "stats.jsonl"
+        stats = SessionStats(sink)
+        for _ in range(2):
+            stats.start_turn()
+            stats.model_started()
+            stats.model_ended(_response(5, 1))
+            stats.end_turn()
+
+        lines = sink.read_text().splitlines()
+        assert len(lines) == 2
+        record = json.loads(lines[0])
+        assert record["model_calls"][0]["input_tokens"] == 5
+        assert "duration" in record
+
+
+class TestPercentile:
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([3.0], 95) == 3.0
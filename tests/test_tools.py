@@ -1,6 +1,10 @@
-"""Tests for the 4 agent tools."""
+"""Tests for the agent tools."""
 
+import asyncio
 import json
+import os
+import re
+import time
 from pathlib import Path
 
 import pytest
@@ -100,6 +104,127 @@ class TestReadTool:
         assert "line4" in result
         assert "line5" not in result
 
+    async def test_read_no_trailing_newline(self, tmp_path: Path):
+        from src.tools.read import read_tool
+
+        f = tmp_path / "tail.txt"
+        f.write_text("a\nb\nc")
+
+        result = await read_tool.on_invoke_tool(
+            None, _args(file_path=str(f), offset=3, limit=5)
+        )
+
+        assert "lines 3-3 of 3" in result
+        assert result.endswith("\tc")
+
+    async def test_read_range_across_blocks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        from src.tools import lineindex
+        from src.tools.cache import file_cache
+        from src.tools.read import read_tool
+
+        monkeypatch.setattr(lineindex, "BLOCK_SIZE", 16)
+        monkeypatch.setattr(file_cache, "max_entry_bytes", 0)
+        lineindex._load_index.cache_clear()
+
+        f = tmp_path / "big.txt"
+        f.write_text("".join(f"row {i}\n" for i in range(1, 501)))
+
+        result = await read_tool.on_invoke_tool(
+            None, _args(file_path=str(f), offset=250, limit=3)
+        )
+
+        assert "lines 250-252 of 500" in result
+        assert result.splitlines()[1:] == [
+            "   250\trow 250",
+            "   251\trow 251",
+            "   252\trow 252",
+        ]
+
+    @pytest.mark.parametrize("block_size", [3, 4, 5, 16])
+    def test_index_splits_like_cached_text(self, tmp_path: Path, block_size: int):
+        from src.tools.cache import FileCache
+        from src.tools.lineindex import LineIndex, split_lines
+
+        f = tmp_path / "mixed.txt"
+        f.write_bytes(b"a\r\nbb\rccc\n\r\r\ndd\r\n\neee\rf")
+        expected = split_lines(FileCache().read_text(f))
+        assert expected == ["a", "bb", "ccc", "", "", "dd", "", "eee", "f"]
+
+        index = LineIndex(str(f), f.stat().st_size, block_size)
+        assert index.total == len(expected)
+        for start in range(len(expected)):
+            for end in range(start, len(expected) + 1):
+                assert index.read_lines(start, end) == expected[start:end]
+
+    async def test_read_index_invalidated_on_change(self, tmp_path: Path):
+        from src.tools.read import read_tool
+
+        f = tmp_path / "grow.txt"
+        f.write_text("one\n")
+        await read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+
+        f.write_text("one\ntwo\n")
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        result = await read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+
+        assert "of 2" in result
+        assert "two" in result
+
+    async def test_read_pages_by_token_budget(self, tmp_path: Path, monkeypatch):
+        from src.tools import read
+        from src.tools.pages import more_tool
+
+        monkeypatch.setattr(read, "READ_TOKEN_BUDGET", 50)
+        f = tmp_path / "long.txt"
+        f.write_text("".join(f"line {i}\n" for i in range(1, 101)))
+
+        result = await read.read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+        assert result.startswith("[long.txt] lines 1-13 of 100\n")
+        assert "offset=14" in result
+
+        seen = [result]
+        while m := re.search(r'more_tool\(handle="(\w+)"\)', seen[-1]):
+            seen.append(await more_tool.on_invoke_tool(None, _args(handle=m[1])))
+        numbers = [
+            int(line.split("\t")[0])
+            for page in seen
+            for line in page.splitlines()
+            if "\t" in line
+        ]
+        assert numbers == list(range(1, 101))
+
+        limited = await read.read_tool.on_invoke_tool(
+            None, _args(file_path=str(f), offset=90, limit=5)
+        )
+        assert "more_tool" not in limited
+
+    async def test_read_pages_through_long_line(self, tmp_path: Path, monkeypatch):
+        from src.tools import read
+        from src.tools.pages import more_tool
+
+        monkeypatch.setattr(read, "READ_TOKEN_BUDGET", 50)
+        f = tmp_path / "min.js"
+        long_line = "".join(f"{i:04}," for i in range(100))
+        f.write_text(f"{long_line}\nnext\n")
+
+        result = await read.read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+        assert result.startswith("[min.js] line 1 of 2, characters 1-193 of 500\n")
+        assert "offset=2" in result
+
+        pieces = []
+        page = result
+        while "line continues" in page:
+            pieces.append(page.splitlines()[1].split("\t", 1)[1])
+            handle = re.search(r'more_tool\(handle="(\w+)"\)', page)[1]
+            page = await more_tool.on_invoke_tool(None, _args(handle=handle))
+        assert page.startswith("[min.js] lines 1-2 of 2, line 1 from character 387\n")
+        pieces.append(page.splitlines()[1].split("\t", 1)[1])
+        assert "".join(pieces) == long_line
+        assert page.endswith("     2\tnext")
+
     async def test_read_nonexistent(self):
         from src.tools.read import read_tool
 
@@ -110,6 +235,58 @@ class TestReadTool:
         assert "Error" in result
 
 
+# -- Cache -----------------------------------------------------------------
+
+
+class TestFileCache:
+    async def test_read_edit_read_hits(self, tmp_path: Path):
+        from src.tools.cache import file_cache
+        from src.tools.edit import edit_tool
+        from src.tools.read import read_tool
+
+        f = tmp_path / "code.py"
+        f.write_text("foo = 1\n")
+
+        await read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+        await edit_tool.on_invoke_tool(
+            None, _args(file_path=str(f), old_text="foo = 1", new_text="foo = 2")
+        )
+        result = await read_tool.on_invoke_tool(None, _args(file_path=str(f)))
+
+        assert "foo = 2" in result
+        stats = file_cache.stats()
+        assert (stats.misses, stats.hits) == (1, 2)
+
+    def test_external_change_invalidates(self, tmp_path: Path):
+        from src.tools.cache import FileCache
+
+        cache = FileCache()
+        f = tmp_path / "a.txt"
+        f.write_text("old")
+        assert cache.read_text(f) == "old"
+
+        f.write_text("new!")
+        st = f.stat()
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        assert cache.read_text(f) == "new!"
+        assert cache.stats().misses == 2
+
+    def test_evicts_over_budget(self, tmp_path: Path):
+        from src.tools.cache import FileCache
+
+        cache = FileCache(max_bytes=10, max_entry_bytes=10)
+        for name in ("a", "b", "c"):
+            f = tmp_path / name
+            f.write_text("x" * 4)
+            cache.read_text(f)
+
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.entries == 2
+        assert stats.bytes == 8
+
+
 # -- Write -----------------------------------------------------------------
 
 
@@ -156,10 +333,558 @@ class TestEditTool:
         assert "Error" in result
         assert "not found" in result
 
+    async def test_edit_crlf_file(self, tmp_path: Path):
+        from src.tools.edit import edit_tool
+
+        f = tmp_path / "win.txt"
+        f.write_bytes(b"alpha\r\nbeta\r\n")
+
+        result = await edit_tool.on_invoke_tool(
+            None,
+            _args(file_path=str(f), old_text="alpha\nbeta", new_text="one\ntwo"),
+        )
+
+        assert "Replaced" in result
+        assert f.read_bytes() == b"one\r\ntwo\r\n"
+
+
+class TestMultiEditTool:
+    async def test_applies_across_files(self, tmp_path: Path):
+        from src.tools.edit import multi_edit_tool
+
+        a = tmp_path / "a.py"
+        b = tmp_path / "b.py"
+        a.write_text("x = 1\ny = x\n")
+        b.write_text("import a\n")
+
+        result = await multi_edit_tool.on_invoke_tool(
+            None,
+            _args(
+                edits=[
+                    {
+                        "file_path": str(a),
+                        "old_text": "x",
+                        "new_text": "z",
+                        "replace_all": True,
+                    },
+                    {
+                        "file_path": str(a),
+                        "old_text": "z = 1",
+                        "new_text": "z = 2",
+                        "replace_all": False,
+                    },
+                    {
+                        "file_path": str(b),
+                        "old_text": "import a",
+                        "new_text": "import a as m",
+                        "replace_all": False,
+                    },
+                ]
+            ),
+        )
+
+        assert "Applied 3 edits" in result
+        assert a.read_text() == "z = 2\ny = z\n"
+        assert b.read_text() == "import a as m\n"
+
+    async def test_failure_changes_nothing(self, tmp_path: Path):
+        from src.tools.edit import multi_edit_tool
+
+        a = tmp_path / "a.py"
+        b = tmp_path / "b.py"
+        a.write_text("foo\n")
+        b.write_text("bar\n")
+
+        result = await multi_edit_tool.on_invoke_tool(
+            None,
+            _args(
+                edits=[
+                    {
+                        "file_path": str(a),
+                        "old_text": "foo",
+                        "new_text": "FOO",
+                        "replace_all": False,
+                    },
+                    {
+                        "file_path": str(b),
+                        "old_text": "missing",
+                        "new_text": "x",
+                        "replace_all": False,
+                    },
+                ]
+            ),
+        )
+
+        assert "edit 2" in result
+        assert "No files were changed" in result
+        assert a.read_text() == "foo\n"
+        assert b.read_text() == "bar\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.py", "b.py"]
+
+    async def test_failed_replace_rolls_back(self, tmp_path: Path, monkeypatch):
+        from src.tools import cache
+        from src.tools.edit import multi_edit_tool
+
+        files = [tmp_path / name for name in ("a.py", "b.py", "c.py")]
+        for f in files:
+            f.write_text("old\n")
+        replace = os.replace
+        calls = 0
+
+        def flaky_replace(src, dst):
+            nonlocal calls
+            calls += 1
+            if calls == 3:
+                raise OSError("disk full")
+            replace(src, dst)
+
+        monkeypatch.setattr(cache.os, "replace", flaky_replace)
+        edits = [
+            {"file_path": str(f), "old_text": "old", "new_text": "new"} for f in files
+        ]
+        result = await multi_edit_tool.on_invoke_tool(None, _args(edits=edits))
+
+        assert result == "Error: writing failed: disk full. No files were changed."
+        assert [f.read_text() for f in files] == ["old\n"] * 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.py", "b.py", "c.py"]
+
+        # A file that cannot be restored either is reported as changed
+        def fail_after_first(src, dst):
+            nonlocal calls
+            calls += 1
+            if calls > 1:
+                raise OSError("disk full")
+            replace(src, dst)
+
+        calls = 0
+        monkeypatch.setattr(cache.os, "replace", fail_after_first)
+        result = await multi_edit_tool.on_invoke_tool(None, _args(edits=edits))
+
+        assert result.endswith(f"Only these files were changed: {files[0]}")
+        assert [f.read_text() for f in files] == ["new\n", "old\n", "old\n"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.py", "b.py", "c.py"]
+
+    async def test_preserves_mode(self, tmp_path: Path):
+        from src.tools.edit import multi_edit_tool
+
+        script = tmp_path / "run.sh"
+        script.write_text("echo hi\n")
+        script.chmod(0o755)
+
+        await multi_edit_tool.on_invoke_tool(
+            None,
+            _args(
+                edits=[
+                    {
+                        "file_path": str(script),
+                        "old_text": "hi",
+                        "new_text": "yo",
+                        "replace_all": False,
+                    },
+                ]
+            ),
+        )
+
+        assert script.read_text() == "echo yo\n"
+        assert script.stat().st_mode & 0o777 == 0o755
+
+    async def test_crlf_files_keep_newlines(self, tmp_path: Path):
+        from src.tools.edit import multi_edit_tool
+
+        win = tmp_path / "win.txt"
+        unix = tmp_path / "unix.txt"
+        win.write_bytes(b"alpha\r\nbeta\r\n")
+        unix.write_bytes(b"alpha\nbeta\n")
+
+        result = await multi_edit_tool.on_invoke_tool(
+            None,
+            _args(
+                edits=[
+                    {
+                        "file_path": str(path),
+                        "old_text": "alpha\nbeta",
+                        "new_text": "alpha\ngamma\nbeta",
+                        "replace_all": False,
+                    }
+                    for path in (win, unix)
+                ]
+            ),
+        )
+
+        assert "Applied 2 edits" in result
+        assert win.read_bytes() == b"alpha\r\ngamma\r\nbeta\r\n"
+        assert unix.read_bytes() == b"alpha\ngamma\nbeta\n"
+
+
+# -- Concurrency -----------------------------------------------------------
+
+
+class TestConcurrency:
+    async def test_same_file_edits_are_ordered(self, tmp_path: Path):
+        from src.tools.edit import edit_tool
+
+        f = tmp_path / "counter.txt"
+        f.write_text("v0\n")
+
+        results = await asyncio.gather(
+            *(
+                edit_tool.on_invoke_tool(
+                    None,
+                    _args(file_path=str(f), old_text=f"v{i}", new_text=f"v{i + 1}"),
+                )
+                for i in range(5)
+            )
+        )
+
+        assert all("Replaced" in r for r in results)
+        assert f.read_text() == "v5\n"
+
+    async def test_file_tools_do_not_block_loop(self, tmp_path: Path):
+        from src.tools import concurrency
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await concurrency.run_file_tool(time.sleep, [], 0.2)
+        task.cancel()
+
+        assert ticks >= 5
+
+    async def test_concurrency_limit(self):
+        from src.tools import concurrency
+
+        concurrency.set_tool_concurrency(2)
+        try:
+            running = peak = 0
+
+            async def call():
+                nonlocal running, peak
+                async with concurrency.tool_slot():
+                    running += 1
+                    peak = max(peak, running)
+                    await asyncio.sleep(0.01)
+                    running -= 1
+
+            await asyncio.gather(*(call() for _ in range(6)))
+        finally:
+            concurrency.set_tool_concurrency(concurrency.DEFAULT_TOOL_CONCURRENCY)
+
+        assert peak == 2
+
+
+# -- Grep ------------------------------------------------------------------
+
+
+def _tree(root: Path, files: dict[str, bytes | str]) -> None:
+    for name, content in files.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, str):
+            content = content.encode()
+        path.write_bytes(content)
+
+
+class TestGrepTool:
+    async def _grep(self, **kwargs: object) -> str:
+        from src.tools.grep import grep_tool
+
+        return await grep_tool.on_invoke_tool(None, _args(**kwargs))
+
+    async def test_skips_ignored_binary_and_sensitive(self, tmp_path: Path):
+        _tree(
+            tmp_path,
+            {
+                ".gitignore": "build/\n*.log\n!keep.log\n",
+                "src/app.py": "import os\nNEEDLE = 1\n",
+                "keep.log": "NEEDLE kept\n",
+                "debug.log": "NEEDLE ignored\n",
+                "build/out.py": "NEEDLE\n",
+                "node_modules/pkg/index.js": "NEEDLE\n",
+                "blob.bin": b"\0\0NEEDLE",
+                ".env": "NEEDLE=secret\n",
+            },
+        )
+
+        result = await self._grep(pattern="NEEDLE", path=str(tmp_path))
+
+        assert f"{tmp_path}/src/app.py:2:NEEDLE = 1" in result
+        assert f"{tmp_path}/keep.log:1:NEEDLE kept" in result
+        for skipped in ("debug.log", "build", "node_modules", "blob.bin", ".env"):
+            assert skipped not in result
+        assert "[2 matches in 2 files]" in result
+
+    async def test_context_glob_and_case(self, tmp_path: Path):
+        _tree(
+            tmp_path,
+            {
+                "a.py": "one\ntwo\nTarget\nfour\nfive\nsix\nseven\ntarget\n",
+                "a.txt": "target\n",
+            },
+        )
+
+        result = await self._grep(
+            pattern="target",
+            path=str(tmp_path),
+            glob="*.py",
+            ignore_case=True,
+            context=1,
+        )
+
+        lines = result.splitlines()
+        assert lines[:4] == [
+            f"{tmp_path}/a.py-2-two",
+            f"{tmp_path}/a.py:3:Target",
+            f"{tmp_path}/a.py-4-four",
+            "--",
+        ]
+        assert lines[4:6] == [f"{tmp_path}/a.py-7-seven", f"{tmp_path}/a.py:8:target"]
+        assert "a.txt" not in result
+
+    async def test_unicode_patterns(self, tmp_path: Path):
+        _tree(tmp_path, {"fr.txt": "café au lait\nÉCOLE\nx–y\n"})
+
+        async def lines(**kwargs: object) -> list[str]:
+            result = await self._grep(path=str(tmp_path / "fr.txt"), **kwargs)
+            return result.splitlines()[:-1]
+
+        assert await lines(pattern=r"\bcafé\b") == [f"{tmp_path}/fr.txt:1:café au lait"]
+        assert await lines(pattern=r"^\w+$") == [f"{tmp_path}/fr.txt:2:ÉCOLE"]
+        assert await lines(pattern="école", ignore_case=True) == [
+            f"{tmp_path}/fr.txt:2:ÉCOLE"
+        ]
+        # One character, not one byte of its UTF-8 encoding
+        assert await lines(pattern="x[–é]y") == [f"{tmp_path}/fr.txt:3:x–y"]
+
+    async def test_result_cap(self, tmp_path: Path):
+        _tree(tmp_path, {f"f{i:03}.txt": "hit\n" * 10 for i in range(50)})
+
+        result = await self._grep(pattern="hit", path=str(tmp_path), max_results=25)
+
+        assert result.count(":hit") == 25
+        assert "showing the first 25 matches" in result
+
+    async def test_errors(self, tmp_path: Path):
+        assert "invalid pattern" in await self._grep(pattern="(", path=str(tmp_path))
+        assert "not found" in await self._grep(pattern="x", path=str(tmp_path / "nope"))
+        assert await self._grep(pattern="x", path=str(tmp_path)) == "No matches found."
+
+
+class TestIgnoreRules:
+    def test_gitignore_semantics(self, tmp_path: Path):
+        from src.tools.ignore import walk_files
+
+        _tree(
+            tmp_path,
+            {
+                ".gitignore": "/top.txt\ndocs/**/*.tmp\n[ab].txt\nsub/\n",
+                "top.txt": "",
+                "nested/top.txt": "",
+                "docs/x/y/z.tmp": "",
+                "docs/z.tmp": "",
+                "docs/z.txt": "",
+                "a.txt": "",
+                "c.txt": "",
+                "deep/sub/file": "",
+                "deep/.gitignore": "*.py\n",
+                "deep/mod.py": "",
+                "mod.py": "",
+            },
+        )
+
+        found = {os.path.relpath(p, tmp_path) for p in walk_files(str(tmp_path))} - {
+            ".gitignore",
+            "deep/.gitignore",
+        }
+        assert found == {"nested/top.txt", "docs/z.txt", "c.txt", "mod.py"}
+
+    def test_parent_gitignore_applies_inside_repo(self, tmp_path: Path):
+        from src.tools.ignore import walk_files
+
+        (tmp_path / ".git").mkdir()
+        _tree(tmp_path, {".gitignore": "*.gen\n", "pkg/a.gen": "", "pkg/a.py": ""})
+
+        found = [os.path.basename(p) for p in walk_files(str(tmp_path / "pkg"))]
+        assert found == ["a.py"]
+
+
+class TestGlobTool:
+    async def _glob(self, **kwargs: object) -> str:
+        from src.tools.glob import glob_tool
+
+        return await glob_tool.on_invoke_tool(None, _args(**kwargs))
+
+    async def test_newest_first_and_ignored(self, tmp_path: Path, monkeypatch):
+        _tree(
+            tmp_path,
+            {
+                ".gitignore": "dist/\n",
+                "old.py": "",
+                "src/new.py": "",
+                "src/notes.md": "",
+                "dist/bundle.py": "",
+                "node_modules/x/index.py": "",
+                "secrets.pem": "",
+            },
+        )
+        os.utime(tmp_path / "old.py", (1, 1))
+        os.utime(tmp_path / "src" / "notes.md", (2, 2))
+        monkeypatch.chdir(tmp_path)
+
+        assert await self._glob(pattern="**/*.py") == "src/new.py\nold.py\n[2 files]"
+        assert await self._glob(pattern="*.py") == "old.py\n[1 files]"
+        assert await self._glob(pattern="*", path="src") == (
+            "src/new.py\nsrc/notes.md\n[2 files]"
+        )
+        listed = await self._glob()
+        assert "secrets.pem" not in listed
+        assert "[4 files]" in listed
+
+    async def test_cap_and_errors(self, tmp_path: Path, monkeypatch):
+        _tree(tmp_path, {f"f{i}.txt": "" for i in range(30)})
+        monkeypatch.chdir(tmp_path)
+
+        result = await self._glob(max_results=5)
+        assert len(result.splitlines()) == 6
+        assert "5 most recently modified of 30 files" in result
+        assert await self._glob(pattern="*.rs") == "No files found."
+        assert "not a directory" in await self._glob(path="f1.txt")
+
+    async def test_outside_workspace(self, tmp_path: Path, monkeypatch):
+        _tree(tmp_path, {"work/a.py": "", "other/b.py": ""})
+        monkeypatch.chdir(tmp_path / "work")
+
+        result = await self._glob(path=str(tmp_path / "other"))
+        assert result == f"{tmp_path}/other/b.py\n[1 files]"
+
+
+class TestFileIndex:
+    def test_incremental_refresh(self, tmp_path: Path, monkeypatch):
+        from src.tools import index
+        from src.tools.index import FileIndex
+
+        _tree(tmp_path, {"a/one.py": "", "b/two.py": "", "b/c/three.py": ""})
+        scanned: list[str] = []
+        scan_dir = index.scan_dir
+
+        def counting_scan(directory, *args):
+            scanned.append(os.path.relpath(directory, tmp_path))
+            return scan_dir(directory, *args)
+
+        monkeypatch.setattr(index, "scan_dir", counting_scan)
+        idx = FileIndex(str(tmp_path))
+
+        assert len(idx.files()) == 3
+        assert sorted(scanned) == [".", "a", "b", "b/c"]
+
+        scanned.clear()
+        assert len(idx.files()) == 3
+        assert scanned == []
+
+        (tmp_path / "a" / "four.py").write_text("")
+        (tmp_path / "b" / "c" / "three.py").unlink()
+        files = {os.path.relpath(f, tmp_path) for f in idx.files()}
+        assert files == {"a/one.py", "a/four.py", "b/two.py"}
+        assert sorted(scanned) == ["a", "b/c"]
+
+        # A new .gitignore relists its directory and everything below it
+        scanned.clear()
+        (tmp_path / "b" / ".gitignore").write_text("two.py\n")
+        files = {os.path.relpath(f, tmp_path) for f in idx.files()}
+        assert files == {"a/one.py", "a/four.py", "b/.gitignore"}
+        assert sorted(scanned) == ["b", "b/c"]
+
+        # Relisting a directory with a .gitignore leaves unchanged ones below
+        scanned.clear()
+        (tmp_path / "b" / "five.py").write_text("")
+        (tmp_path / "top.py").write_text("")
+        assert len(idx.files()) == 5
+        assert sorted(scanned) == [".", "b"]
+        assert idx.files(str(tmp_path / "a")) is not None
+        assert idx.files(str(tmp_path.parent)) is None
+
+
+class TestPages:
+    async def test_page_text_round_trip(self):
+        from src.tools.pages import more_tool, page_text
+
+        text = "".join(f"row {i:04}\n" for i in range(2000))
+        pages = [page_text(text, 100)]
+        while m := re.search(r'more_tool\(handle="(\w+)"\)', pages[-1]):
+            assert len(pages[-1]) < 100 * 4 + 200
+            pages.append(await more_tool.on_invoke_tool(None, _args(handle=m[1])))
+
+        rows = [
+            line
+            for page in pages
+            for line in page.splitlines()
+            if line.startswith("row")
+        ]
+        assert rows == text.splitlines()
+        assert page_text("short", 100) == "short"
+
+    async def test_elide_middle_keeps_head_and_tail(self):
+        from src.tools.pages import elide_middle, more_tool
+
+        text = "".join(f"{i}\n" for i in range(10_000))
+        result = elide_middle(text, 100)
+
+        assert result.startswith("0\n1\n")
+        assert result.endswith("9998\n9999\n")
+        handle = re.search(r'more_tool\(handle="(\w+)"\)', result)[1]
+        page = await more_tool.on_invoke_tool(None, _args(handle=handle))
+        head_last = int(result.split("\n... [")[0].rsplit("\n", 1)[1])
+        assert page.startswith(f"{head_last + 1}\n")
+
+    async def test_unknown_and_evicted_handles(self, monkeypatch):
+        from src.tools import pages
+
+        monkeypatch.setattr(pages, "MAX_HANDLES", 2)
+        handles = [pages.continuation(str, [], i) for i in range(3)]
+
+        result = await pages.more_tool.on_invoke_tool(None, _args(handle=handles[0]))
+        assert result.startswith("Error: unknown or expired handle")
+        assert (
+            await pages.more_tool.on_invoke_tool(None, _args(handle=handles[2])) == "2"
+        )
+
 
 # -- Bash ------------------------------------------------------------------
 
 
+async def _wait_gone(pid: int, timeout: float = 2.0) -> bool:
+    """Wait until ``pid`` has exited (a zombie counts); False on timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            stat = Path(f"/proc/{pid}/stat").read_text()
+        except FileNotFoundError:
+            return True
+        if stat.rsplit(")", 1)[1].split()[0] in ("Z", "X"):
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+async def _background_pid(pidfile: Path) -> int:
+    while not (text := pidfile.read_text().strip() if pidfile.exists() else ""):
+        await asyncio.sleep(0.01)
+    return int(text)
+
+
+@pytest.fixture
+def bash_limits():
+    from src.tools import bash
+
+    yield bash.set_bash_limits
+    bash.set_bash_limits(bash.BashLimits())
+
+
 class TestBashTool:
     async def test_bash_echo(self):
         from src.tools.bash import bash_tool
@@ -175,8 +900,391 @@ class TestBashTool:
         )
         assert "timed out" in result
 
+    async def test_timeout_kills_background_children(self, tmp_path: Path):
+        from src.tools.bash import bash_tool
+
+        pidfile = tmp_path / "pid"
+        result = await bash_tool.on_invoke_tool(
+            None, _args(command=f"sleep 30 & echo $! > {pidfile}; wait", timeout=1)
+        )
+
+        assert "timed out" in result
+        assert await _wait_gone(int(pidfile.read_text()))
+
+    async def test_cancel_kills_process_group(self, tmp_path: Path):
+        from src.tools.bash import bash_tool
+
+        pidfile = tmp_path / "pid"
+        task = asyncio.create_task(
+            bash_tool.on_invoke_tool(
+                None, _args(command=f"sleep 30 & echo $! > {pidfile}; wait")
+            )
+        )
+        pid = await _background_pid(pidfile)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await _wait_gone(pid)
+
+    async def test_rlimits_applied(self, bash_limits):
+        import sys
+
+        from src.tools.bash import BashLimits, bash_tool
+
+        limits = BashLimits(cpu_seconds=300, memory_mb=4096, max_processes=4096)
+        bash_limits(limits)
+        script = (
+            "import resource as r; "
+            "print([r.getrlimit(x) for x in (r.RLIMIT_CPU, r.RLIMIT_AS, r.RLIMIT_NPROC)])"
+        )
+        result = await bash_tool.on_invoke_tool(
+            None, _args(command=f"{sys.executable} -c '{script}'")
+        )
+
+        assert result == str([values for _, values in limits.rlimits()]) + "\n"
+
+    async def test_cpu_limit(self, bash_limits):
+        from src.tools.bash import BashLimits, bash_tool
+
+        bash_limits(BashLimits(cpu_seconds=1))
+        result = await bash_tool.on_invoke_tool(
+            None, _args(command="while :; do :; done", timeout=30)
+        )
+
+        assert "[killed by SIGXCPU: CPU time limit reached]" in result
+        # CPU time is sampled, so the limit can show as just under a second
+        assert re.search(r"\[\d+\.\d\ds wall, \d\.\d\ds CPU\]", result)
+
+    async def test_memory_limit(self, bash_limits):
+        import sys
+
+        from src.tools.bash import BashLimits, bash_tool
+
+        bash_limits(BashLimits(memory_mb=256))
+        result = await bash_tool.on_invoke_tool(
+            None, _args(command=f"{sys.executable} -c 'bytearray(1 << 30)'")
+        )
+
+        assert "MemoryError" in result
+        assert "[exit code: 1]" in result
+
+    async def test_output_limit_stops_command(self, bash_limits):
+        from src.tools.bash import BashLimits, bash_tool
+
+        bash_limits(BashLimits(max_output_mb=1))
+        started = time.monotonic()
+        result = await bash_tool.on_invoke_tool(None, _args(command="yes"))
+
+        assert time.monotonic() - started < 10
+        assert "[stopped: output exceeded the 1 MB limit]" in result
+        assert "[killed by SIGKILL]" in result
+
+    async def test_usage_reported_for_slow_commands(self, monkeypatch):
+        from src.tools import bash
+        from src.tools.bash import bash_tool
+
+        quick = await bash_tool.on_invoke_tool(None, _args(command="echo hi"))
+        monkeypatch.setattr(bash, "USAGE_REPORT_SECONDS", 0)
+        slow = await bash_tool.on_invoke_tool(None, _args(command="echo hi"))
+
+        assert quick == "hi\n"
+        assert re.fullmatch(r"hi\n\n\[\d+\.\d\ds wall, \d+\.\d\ds CPU\]", slow)
+
+    async def test_usage_has_no_inherited_memory_figure(self, monkeypatch):
+        from src.tools import bash
+        from src.tools.bash import bash_tool
+
+        # ru_maxrss of a trivial command would include this allocation
+        ballast = b"x" * (100 << 20)
+        monkeypatch.setattr(bash, "USAGE_REPORT_SECONDS", 0)
+        result = await bash_tool.on_invoke_tool(None, _args(command="true"))
+        del ballast
+
+        assert re.fullmatch(
+            r"\(no output\)\n\[\d+\.\d\ds wall, \d+\.\d\ds CPU\]", result
+        )
+        assert "MB" not in result
+
     async def test_bash_stderr(self):
         from src.tools.bash import bash_tool
 
         result = await bash_tool.on_invoke_tool(None, _args(command="echo err >&2"))
         assert "err" in result
+
+    async def test_bash_large_output_bounded(self):
+        from src.tokens import estimate_tokens
+        from src.tools.bash import BASH_TOKEN_BUDGET, bash_tool
+        from src.tools.pages import more_tool
+
+        result = await bash_tool.on_invoke_tool(None, _args(command="seq 1 1000000"))
+
+        assert estimate_tokens(result) < BASH_TOKEN_BUDGET + 100
+        assert result.startswith("1\n2\n3\n")
+        body, note = result.rsplit("\n", 1)
+        assert body.rstrip().endswith("1000000")
+        assert re.fullmatch(
+            r"\[stdout: \d+ bytes not kept; 6888896 bytes, 1000000 lines total\]", note
+        )
+        handle = re.search(r'more_tool\(handle="(\w+)"\)', result)[1]
+
+        # The middle pages end where the capture itself dropped bytes
+        page = await more_tool.on_invoke_tool(None, _args(handle=handle))
+        first = int(result.split("\n... [")[0].rsplit("\n", 1)[1])
+        assert page.startswith(f"{first + 1}\n{first + 2}\n")
+        while "bytes elided" not in page:
+            handle = re.search(r'more_tool\(handle="(\w+)"\)', page)[1]
+            page = await more_tool.on_invoke_tool(None, _args(handle=handle))
+        assert "1000000 lines total" in page
+
+    def test_capture_keeps_head_and_tail(self):
+        from src.tools.bash import _BoundedCapture
+
+        capture = _BoundedCapture(limit=8)
+        for chunk in (b"abc", b"defgh", b"ijkl\n"):
+            capture.feed(chunk)
+
+        assert bytes(capture.head) == b"abcd"
+        assert bytes(capture.tail) == b"jkl\n"
+        assert capture.elided == 5
+        assert capture.total_lines == 1
+
+
+class TestShellSession:
+    async def test_cwd_and_env_persist(self, tmp_path: Path):
+        from src.tools.shell import ShellSession
+
+        session = ShellSession()
+        try:
+            await session.run(f"cd {tmp_path} && export THEY_VAR=kept")
+            result = await session.run('pwd; echo "$THEY_VAR"')
+        finally:
+            await session.close()
+
+        assert result.splitlines() == [str(tmp_path), "kept"]
+
+    async def test_exit_codes_and_stderr(self):
+        from src.tools.shell import ShellSession
+
+        session = ShellSession()
+        try:
+            result = await session.run("echo out; echo err >&2; false")
+            ok = await session.run("true")
+        finally:
+            await session.close()
+
+        assert result == "out\n\n[stderr]\nerr\n\n[exit code: 1]"
+        assert ok == "(no output)"
+
+    async def test_restarts_after_exit(self):
+        from src.tools.shell import ShellSession
+
+        session = ShellSession()
+        try:
+            await session.run("export THEY_VAR=gone")
+            died = await session.run("exit 7")
+            result = await session.run('echo "[$THEY_VAR]"')
+        finally:
+            await session.close()
+
+        assert "shell exited with code 7" in died
+        assert result == "[]\n"
+
+    async def test_timeout_restarts_shell(self):
+        from src.tools.shell import ShellSession
+
+        session = ShellSession()
+        try:
+            result = await session.run("sleep 10", timeout=1)
+            after = await session.run("echo alive")
+        finally:
+            await session.close()
+
+        assert "timed out" in result
+        assert after == "alive\n"
+
+    async def test_limits_and_usage(self, bash_limits, monkeypatch):
+        from src.tools import shell
+        from src.tools.bash import BashLimits
+        from src.tools.shell import ShellSession
+
+        bash_limits(BashLimits(cpu_seconds=1, memory_mb=4096))
+        monkeypatch.setattr(shell, "USAGE_REPORT_SECONDS", 0)
+        session = ShellSession()
+        try:
+            result = await session.run("ulimit -t; ulimit -v")
+        finally:
+            await session.close()
+
+        # CPU time would add up over the session, so only memory is limited
+        assert re.fullmatch(
+            r"unlimited\n4194304\n\n\[\d+\.\d\ds wall, \d+\.\d\ds CPU\]", result
+        )
+
+    async def test_output_limit_restarts_shell(self, bash_limits):
+        from src.tools.bash import BashLimits
+        from src.tools.shell import ShellSession
+
+        bash_limits(BashLimits(max_output_mb=1))
+        session = ShellSession()
+        try:
+            result = await session.run("yes")
+            after = await session.run("echo alive")
+        finally:
+            await session.close()
+
+        assert "[stopped: output exceeded the 1 MB limit]" in result
+        assert "shell restarted" in result
+        assert after == "alive\n"
+
+    async def test_cancel_kills_command_and_restarts_shell(self, tmp_path: Path):
+        from src.tools.shell import ShellSession
+
+        session = ShellSession()
+        pidfile = tmp_path / "pid"
+        try:
+            task = asyncio.create_task(
+                session.run(f"sleep 30 & echo $! > {pidfile}; wait")
+            )
+            pid = await _background_pid(pidfile)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            after = await session.run("echo alive")
+        finally:
+            await session.close()
+
+        assert await _wait_gone(pid)
+        assert after == "alive\n"
+
+
+# -- Sub-agents ------------------------------------------------------------
+
+
+def _echo_model(delay: float = 0.0):
+    """A model answering ``done: <task>``; it fails on tasks mentioning "fail".
+
+    A task ``say <text>`` is answered with ``<text>`` verbatim.
+    """
+    from agents import Model, ModelResponse, Usage
+    from openai.types.responses import ResponseOutputMessage, ResponseOutputText
+
+    class EchoModel(Model):
+        def __init__(self):
+            self.running = self.peak = 0
+            self.tool_names: list[list[str]] = []
+
+        async def get_response(
+            self, system_instructions, input, model_settings, tools, *args, **kw
+        ):
+            self.tool_names.append(sorted(t.name for t in tools))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.running -= 1
+            task = input if isinstance(input, str) else input[-1]["content"]
+            if "fail" in task:
+                msg = "boom"
+                raise RuntimeError(msg)
+            answer = task.removeprefix("say ") if task.startswith("say ") else None
+            text = ResponseOutputText(
+                type="output_text", text=answer or f"done: {task}", annotations=[]
+            )
+            message = ResponseOutputMessage(
+                id="msg",
+                type="message",
+                role="assistant",
+                status="completed",
+                content=[text],
+            )
+            usage = Usage(requests=1, input_tokens=10, output_tokens=3, total_tokens=13)
+            return ModelResponse(output=[message], usage=usage, response_id=None)
+
+        async def stream_response(self, *args, **kwargs):
+            # Sub-agents run with Runner.run and never stream
+            return
+            yield
+
+    return EchoModel()
+
+
+async def _spawn(model, **kwargs):
+    from agents import Agent
+    from agents.tool_context import ToolContext
+
+    from src.tools.subagents import subagents_tool
+
+    args = _args(**kwargs)
+    ctx = ToolContext(
+        context=None,
+        tool_name="subagents_tool",
+        tool_call_id="call",
+        tool_arguments=args,
+        agent=Agent(name="they", model=model) if model else None,
+    )
+    return ctx, await subagents_tool.on_invoke_tool(ctx, args)
+
+
+class TestSubagentsTool:
+    async def test_runs_tasks_concurrently_under_cap(self):
+        from src.tools import subagents
+
+        model = _echo_model(delay=0.05)
+        subagents.set_subagent_concurrency(2)
+        try:
+            ctx, result = await _spawn(model, tasks=[f"task {i}" for i in range(5)])
+        finally:
+            subagents.set_subagent_concurrency(subagents.DEFAULT_SUBAGENT_CONCURRENCY)
+
+        assert model.peak == 2
+        assert result.startswith("[5 sub-agents in ")
+        for i in range(5):
+            assert f"## {i + 1}. task {i}\ndone: task {i}" in result
+        assert ctx.usage.requests == 5
+        assert ctx.usage.output_tokens == 15
+
+    async def test_tool_subsets(self):
+        model = _echo_model()
+
+        await _spawn(model, tasks=["a"])
+        await _spawn(model, tasks=["b"], tools=["bash_tool", "read_tool"])
+
+        assert model.tool_names == [
+            ["glob_tool", "grep_tool", "more_tool", "read_tool"],
+            ["bash_tool", "read_tool"],
+        ]
+
+    async def test_no_nested_fan_out(self):
+        model = _echo_model()
+
+        _, result = await _spawn(model, tasks=["a"], tools=["subagents_tool"])
+
+        assert result.startswith("Error: unknown tools: subagents_tool")
+        assert not model.tool_names
+
+    async def test_failures_are_reported_per_task(self):
+        _, result = await _spawn(_echo_model(), tasks=["ok", "please fail"])
+
+        assert ", 1 failed]" in result
+        assert "done: ok" in result
+        assert "## 2. please fail\nError: RuntimeError: boom" in result
+
+    async def test_answer_quoting_an_error_is_not_a_failure(self):
+        _, result = await _spawn(_echo_model(), tasks=["say Error: none found"])
+
+        assert result.startswith("[1 sub-agents in ")
+        assert "failed" not in result
+        assert "\nError: none found" in result
+
+    async def test_rejects_bad_calls(self):
+        from src.tools.subagents import MAX_SUBAGENT_TASKS
+
+        _, empty = await _spawn(_echo_model(), tasks=["  "])
+        _, many = await _spawn(_echo_model(), tasks=["t"] * (MAX_SUBAGENT_TASKS + 1))
+        _, orphan = await _spawn(None, tasks=["t"])
+
+        assert empty == "Error: no tasks given"
+        assert many.startswith(f"Error: at most {MAX_SUBAGENT_TASKS} tasks")
+        assert orphan.startswith("Error:")
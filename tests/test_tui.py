@@ -0,0 +1,188 @@
+"""Tests for TUI rendering helpers."""
+
+import asyncio
+import io
+import time
+
+import pytest
+from rich.console import Console
+
+from src.tui import console as console_module
+
+
+@pytest.fixture
+def output(monkeypatch: pytest.MonkeyPatch) -> io.StringIO:
+    buf = io.StringIO()
+    monkeypatch.setattr(console_module, "console", Console(file=buf))
+    return buf
+
+
+class TestDeltaBuffer:
+    async def test_coalesces_within_frame(self, output: io.StringIO):
+        deltas = console_module._DeltaBuffer(fps=1)
+        for part in ("Hel", "lo", " [bold]wor", "ld"):
+            deltas.write(part)
+
+        # First delta shows immediately; the rest wait for the next frame
+        assert output.getvalue() == "Hel"
+        deltas.flush()
+        assert output.getvalue() == "Hello [bold]world"
+
+    async def test_newline_flushes(self, output: io.StringIO):
+        deltas = console_module._DeltaBuffer(fps=1)
+        deltas.write("first")
+        deltas.write(" line\n")
+        assert output.getvalue() == "first line\n"
+
+    async def test_timer_flushes_paused_stream(self, output: io.StringIO):
+        deltas = console_module._DeltaBuffer(fps=20)
+        deltas.write("head ")
+        deltas.write("tail")
+        assert output.getvalue() == "head "
+        await asyncio.sleep(0.2)
+        assert output.getvalue() == "head tail"
+
+
+class TestStreamingMarkdown:
+    def _renderer(self, monkeypatch: pytest.MonkeyPatch):
+        from src.tui.markdown import StreamingMarkdown
+
+        renderer = StreamingMarkdown(Console(file=io.StringIO(), width=60))
+        committed: list[str] = []
+        monkeypatch.setattr(renderer, "_ensure_live", lambda: None)
+        monkeypatch.setattr(
+            renderer.console,
+            "print",
+            lambda *a, **k: committed.append(a[0].markup if a else ""),
+        )
+        return renderer, committed
+
+    def test_commits_finished_blocks_only(self, monkeypatch: pytest.MonkeyPatch):
+        renderer, committed = self._renderer(monkeypatch)
+        for ch in "# Title\nSome *text*\nmore\n\nNext para\n":
+            renderer.write(ch)
+
+        assert committed == ["# Title", "", "Some *text*\nmore"]
+        renderer.flush()
+        assert committed[-1] == "Next para"
+
+    def test_code_fence_stays_open_across_blank_lines(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        renderer, committed = self._renderer(monkeypatch)
+        renderer.write("```py\nx = 1\n\ny = 2\n")
+        assert committed == []
+
+        renderer.write("```\nafter")
+        assert committed == ["```py\nx = 1\n\ny = 2\n```"]
+
+    def test_indented_continuation_keeps_list_open(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        renderer, committed = self._renderer(monkeypatch)
+        renderer.write("- item\n\n  more of item\n- next\n")
+        assert committed == []
+        renderer.flush()
+        assert committed == ["- item\n\n  more of item\n- next"]
+
+    def test_loose_list_renders_like_one_shot(self, monkeypatch: pytest.MonkeyPatch):
+        from rich.markdown import Markdown
+
+        from src.tui.markdown import StreamingMarkdown
+
+        text = "Steps:\n\n- one\n\n- two\n\n1. three\n\n2. four\n\nDone.\n"
+        streamed = Console(file=io.StringIO(), width=60)
+        renderer = StreamingMarkdown(streamed)
+        monkeypatch.setattr(renderer, "_ensure_live", lambda: None)
+        for ch in text:
+            renderer.write(ch)
+        renderer.flush()
+
+        one_shot = Console(file=io.StringIO(), width=60)
+        one_shot.print(Markdown(text))
+        assert streamed.file.getvalue() == one_shot.file.getvalue()
+
+
+def _esc_when(ready):
+    """Stand-in for the Esc monitor: a double Esc as soon as ``ready()``."""
+
+    class Esc:
+        def __init__(self, on_interrupt):
+            self.on_interrupt = on_interrupt
+            self.interrupted = False
+
+        async def _watch(self) -> None:
+            while not ready():
+                await asyncio.sleep(0.01)
+            self.interrupted = True
+            self.on_interrupt()
+
+        async def __aenter__(self):
+            self._task = asyncio.create_task(self._watch())
+            return self
+
+        async def __aexit__(self, *exc) -> None:
+            self._task.cancel()
+
+    return Esc
+
+
+class TestInterruptedTurn:
+    async def _run(self, monkeypatch, script: dict, ready) -> tuple[list, int]:
+        from benchmarks.mock_server import MockServer
+        from src import connections
+        from src.agent import create_agent
+        from src.config import Config
+        from src.tui import turn
+
+        monkeypatch.setattr(turn, "_EscMonitor", _esc_when(ready))
+        monkeypatch.setattr(turn, "console", Console(file=io.StringIO()))
+        with MockServer(script) as server:
+            cfg = Config(
+                provider="openai",
+                api_key="k",
+                model="mock",
+                base_url=server.base_url,
+                model_retries=0,
+            )
+            history = [{"role": "user", "content": "hi"}]
+            try:
+                history = await turn.run_turn(create_agent(cfg), history, cfg)
+            finally:
+                await connections.close()
+            for _ in range(100):
+                if server.aborted:
+                    break
+                await asyncio.sleep(0.02)
+            return history, server.aborted
+
+    async def test_running_tool_is_cancelled(self, monkeypatch, output, tmp_path):
+        from src.tui.turn import INTERRUPTED_OUTPUT
+
+        started = tmp_path / "started"
+        command = f"touch {started}; sleep 30"
+        call = {"name": "bash_tool", "arguments": {"command": command}}
+        script = {"responses": [{"tool_calls": [call]}, {"text": "done"}]}
+        began = time.monotonic()
+        history, _ = await self._run(monkeypatch, script, started.exists)
+
+        assert time.monotonic() - began < 10
+        assert [item.get("type") for item in history[1:]] == [
+            "function_call",
+            "function_call_output",
+        ]
+        assert history[1]["name"] == "bash_tool"
+        assert history[2]["call_id"] == history[1]["call_id"]
+        assert history[2]["output"] == INTERRUPTED_OUTPUT
+
+    async def test_stream_is_closed_and_partial_text_kept(self, monkeypatch, output):
+        text = "word " * 200
+        script = {"tokens_per_sec": 20, "responses": [{"text": text}]}
+        history, aborted = await self._run(
+            monkeypatch, script, lambda: "word word" in output.getvalue()
+        )
+
+        assert aborted == 1
+        assert history[-1]["role"] == "assistant"
+        assert history[-1]["content"].startswith("word word")
+        assert len(history[-1]["content"]) < len(text)